@@ -0,0 +1,96 @@
+"""
+Cold-start benchmark: time from launching uvicorn to the first healthy
+response from /api/health, and to the end of the background warm-up.
+
+Each run starts a fresh server process on a throwaway SQLite database and
+fails (exit code 1) when the median time to first healthy response is over
+--target seconds.
+
+    cd backend && python -m benchmarks.bench_cold_start --runs 5 --target 3
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from typing import Optional, Tuple
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _get_health(port: int) -> Optional[dict]:
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/api/health", timeout=1) as response:
+            return json.loads(response.read())
+    except OSError:
+        return None
+
+
+def cold_start(timeout: float) -> Tuple[float, Optional[float]]:
+    """Seconds to the first healthy response and to warm-up completion (None if it did not finish)."""
+    port = _free_port()
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, DATABASE_URL=f"sqlite:///{tmp}/bench.db", LLM_CACHE_PATH=f"{tmp}/llm_cache.db")
+        env.setdefault("OPENAI_API_KEY", "bench")
+        started = time.perf_counter()
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            healthy = warm = None
+            while time.perf_counter() - started < timeout:
+                health = _get_health(port)
+                elapsed = time.perf_counter() - started
+                if health is not None:
+                    healthy = healthy or elapsed
+                    if health["warm_up"]["ready"]:
+                        warm = elapsed
+                        break
+                time.sleep(0.02)
+            if healthy is None:
+                raise RuntimeError(f"server did not become healthy within {timeout:g}s")
+            return healthy, warm
+        finally:
+            server.terminate()
+            server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--target", type=float, default=3.0, help="max median seconds to first healthy response")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    healthy_times, warm_times = [], []
+    print(f"{'run':>4} {'healthy s':>10} {'warm s':>8}")
+    for run in range(1, args.runs + 1):
+        healthy, warm = cold_start(args.timeout)
+        healthy_times.append(healthy)
+        if warm is not None:
+            warm_times.append(warm)
+        print(f"{run:>4} {healthy:>10.2f} {warm if warm is not None else float('nan'):>8.2f}")
+
+    median = statistics.median(healthy_times)
+    print(f"median time to first healthy response: {median:.2f}s (target {args.target:g}s)")
+    if warm_times:
+        print(f"median time to warm: {statistics.median(warm_times):.2f}s")
+    if median > args.target:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Benchmark for services.pdf_service.highlight_keywords.
+
+Compares the single-pass highlighter against the previous per-keyword regex
+loop (kept below as the reference implementation), checks that both produce
+identical output, and reports timings for large resumes with 100+ keywords.
+
+    cd backend && python -m benchmarks.bench_highlight
+"""
+
+import argparse
+import random
+import re
+import time
+from typing import List
+
+from services.pdf_service import highlight_keywords
+
+
+def reference_highlight_keywords(html: str, keywords: List[str]) -> str:
+    """The original O(keywords x document) implementation."""
+    if not keywords:
+        return html
+
+    keywords = sorted(set(keywords), key=len, reverse=True)
+
+    for keyword in keywords:
+        if not keyword or len(keyword) < 2:
+            continue
+
+        escaped_keyword = re.escape(keyword)
+        pattern = re.compile(r'(?<![<\w])(' + escaped_keyword + r')(?![>\w])', re.IGNORECASE)
+
+        parts = re.split(r'(<strong[^>]*>.*?</strong>)', html, flags=re.IGNORECASE | re.DOTALL)
+
+        result_parts = []
+        for i, part in enumerate(parts):
+            if i % 2 == 1 or '<strong' in part.lower():
+                result_parts.append(part)
+            else:
+                modified = pattern.sub(r'<strong style="font-weight: 700; color: #000;">\1</strong>', part)
+                result_parts.append(modified)
+
+        html = ''.join(result_parts)
+
+    return html
+
+
+VOCABULARY = [
+    "Python", "python", "FastAPI", "React", "React Native", "Native", "AWS", "Docker",
+    "Kubernetes", "Machine Learning", "Learning", "Machine", "Gen AI", "AI", "SQL",
+    "PostgreSQL", "C++", ".NET", "Node.js", "CI/CD", "Terraform", "data", "Data Science",
+    "microservices", "REST", "APIs", "TensorFlow", "PyTorch", "Go", "Rust", "color",
+    "team", "lead", "design", "systems", "distributed systems", "performance",
+]
+
+
+def make_keywords(rng: random.Random, count: int) -> List[str]:
+    words = list(VOCABULARY)
+    while len(words) < count:
+        words.append(f"{rng.choice(VOCABULARY)} {rng.choice(['Cloud', 'Platform', 'Ops', 'Tools', 'API'])}{len(words)}")
+    rng.shuffle(words)
+    return words[:count]
+
+
+def make_resume(rng: random.Random, paragraphs: int) -> str:
+    chunks = ['<html><body><h1 style="font-size: 26pt; color: #000;">Jane Doe</h1>']
+    for i in range(paragraphs):
+        words = []
+        for _ in range(rng.randint(15, 40)):
+            word = rng.choice(VOCABULARY + ["built", "with", "and", "the", "scalable", "x", "in"])
+            r = rng.random()
+            if r < 0.05:
+                word = f"<strong>{word}</strong>"
+            elif r < 0.08:
+                word = f"<em>{word}</em>"
+            elif r < 0.10:
+                word = word.upper()
+            elif r < 0.12:
+                word = word + rng.choice([",", ".", "-", "/", "_x", "s"])
+            words.append(word)
+        tag = rng.choice(["p", "li", "h3"])
+        chunks.append(f'<{tag} style="color: #000;">' + " ".join(words) + f"</{tag}>")
+        if i % 10 == 0:
+            chunks.append('<h2 style="border-bottom: 2px solid #000;">EXPERIENCE</h2>')
+    chunks.append("</body></html>")
+    return "\n".join(chunks)
+
+
+def timed(fn, *args, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fuzz", type=int, default=300, help="random documents checked for identical output")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    for _ in range(args.fuzz):
+        html = make_resume(rng, rng.randint(1, 8))
+        keywords = make_keywords(rng, rng.randint(1, 40))
+        expected = reference_highlight_keywords(html, keywords)
+        actual = highlight_keywords(html, keywords)
+        assert actual == expected, f"output mismatch for keywords {keywords}"
+    print(f"identical output on {args.fuzz} random documents")
+
+    print(f"{'paragraphs':>10} {'keywords':>8} {'bytes':>8} {'reference ms':>13} {'single-pass ms':>15} {'speedup':>8}")
+    for paragraphs, n_keywords in [(20, 20), (100, 100), (300, 150), (1000, 200)]:
+        html = make_resume(rng, paragraphs)
+        keywords = make_keywords(rng, n_keywords)
+        assert highlight_keywords(html, keywords) == reference_highlight_keywords(html, keywords)
+        ref = timed(reference_highlight_keywords, html, keywords, repeat=args.repeat)
+        new = timed(highlight_keywords, html, keywords, repeat=args.repeat)
+        print(f"{paragraphs:>10} {n_keywords:>8} {len(html):>8} {ref * 1000:>13.2f} {new * 1000:>15.2f} {ref / new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Microbenchmarks for the CPU-bound helpers on the request path:
+highlight_keywords, generate_preview_html, html_to_pdf, parse_resume and
+extract_email_from_text, each on small, medium and large synthetic inputs.
+
+Each case is timed with timeit (auto-ranged loop, best and median of
+--repeat rounds, per call) and the results can be saved as JSON and
+compared between runs with benchmarks.results.
+
+    cd backend && python -m benchmarks.bench_micro --output benchmarks/results/micro.json
+"""
+
+import argparse
+import io
+import random
+import statistics
+import timeit
+from typing import Callable, Dict, List, Tuple
+
+from benchmarks.bench_highlight import make_keywords, make_resume
+from benchmarks.fixtures import make_docx, make_job_description, make_pdf, make_resume_text
+from benchmarks.results import write_results
+from services.pdf_service import generate_preview_html, highlight_keywords, html_to_pdf
+from services.resume_parser import extract_email_from_text, parse_resume
+
+Case = Tuple[str, Callable[[], object]]
+
+
+def build_cases(rng: random.Random, only: List[str]) -> List[Case]:
+    cases: List[Case] = []
+    html_sizes = {"small": (20, 15), "medium": (100, 40), "large": (400, 120)}
+
+    for size, (paragraphs, n_keywords) in html_sizes.items():
+        html, keywords = make_resume(rng, paragraphs), make_keywords(rng, n_keywords)
+        cases.append((f"highlight_keywords[{size}]", lambda html=html, keywords=keywords: highlight_keywords(html, keywords)))
+        cases.append((f"generate_preview_html[{size}]", lambda html=html, keywords=keywords: generate_preview_html(html, keywords)))
+
+    for size in ("small", "medium"):
+        paragraphs, n_keywords = html_sizes[size]
+        preview = generate_preview_html(make_resume(rng, paragraphs), make_keywords(rng, n_keywords))
+        cases.append((f"html_to_pdf[{size}]", lambda preview=preview: html_to_pdf(preview)))
+
+    for pages in (1, 4, 16):
+        data = make_pdf(rng, pages)
+        cases.append((f"parse_resume[pdf,{pages}p]", lambda data=data: parse_resume(io.BytesIO(data), "pdf")))
+    for size, sections in (("small", 3), ("large", 12)):
+        data = make_docx(rng, sections=sections, bullets=8, table_rows=sections * 2)
+        cases.append((f"parse_resume[docx,{size}]", lambda data=data: parse_resume(io.BytesIO(data), "docx")))
+
+    for size in ("small", "medium", "large"):
+        text = make_job_description(rng, size)
+        cases.append((f"extract_email_from_text[jd,{size}]", lambda text=text: extract_email_from_text(text)))
+    text = make_resume_text(rng, sections=12, bullets=12)
+    cases.append(("extract_email_from_text[resume,large]", lambda text=text: extract_email_from_text(text)))
+
+    if only:
+        cases = [case for case in cases if any(case[0].startswith(prefix) for prefix in only)]
+    return cases
+
+
+def measure(fn: Callable[[], object], repeat: int) -> Dict:
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    rounds = [seconds / number for seconds in timer.repeat(repeat=repeat, number=number)]
+    return {
+        "best_ms": min(rounds) * 1000,
+        "median_ms": statistics.median(rounds) * 1000,
+        "loops": number,
+        "rounds": repeat,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", nargs="*", default=[], help="run only cases starting with these names")
+    parser.add_argument("--output", help="write results as JSON to this path")
+    args = parser.parse_args()
+
+    results: Dict[str, Dict] = {}
+    print(f"{'case':<44} {'best ms':>10} {'median ms':>10} {'loops':>7}")
+    for name, fn in build_cases(random.Random(42), args.only):
+        try:
+            fn()
+        except Exception as e:
+            # e.g. WeasyPrint's native libraries are missing on this machine
+            results[name] = {"skipped": str(e)[:200]}
+            print(f"{name:<44} skipped: {str(e)[:60]}")
+            continue
+        results[name] = measure(fn, args.repeat)
+        r = results[name]
+        print(f"{name:<44} {r['best_ms']:>10.3f} {r['median_ms']:>10.3f} {r['loops']:>7}")
+
+    if args.output:
+        write_results(args.output, "micro", results, {"repeat": args.repeat})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark for services.resume_parser.extract_text_from_pdf.
+
+Generates synthetic text PDFs with many pages, checks that parallel
+page-range extraction returns exactly the serial text, and compares timings.
+The worker pool is started (and its spawn cost reported) before timing.
+
+    cd backend && python -m benchmarks.bench_pdf_extract
+"""
+
+import argparse
+import io
+import random
+import time
+
+from benchmarks.fixtures import make_pdf
+from services import resume_parser
+from services.resume_parser import extract_text_from_pdf
+
+
+def timed(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=resume_parser.PDF_PARSE_WORKERS)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    # Parallel mode is forced for every size below so both paths can be compared
+    resume_parser.PDF_PARALLEL_MIN_PAGES = 2
+    resume_parser.PDF_PARSE_WORKERS = args.workers
+
+    start = time.perf_counter()
+    warm = make_pdf(rng, args.workers * 2)
+    extract_text_from_pdf(io.BytesIO(warm), workers=args.workers)
+    print(f"pool start-up with {args.workers} workers: {(time.perf_counter() - start) * 1000:.0f} ms (paid once)")
+
+    print(f"{'pages':>6} {'bytes':>9} {'serial ms':>10} {'parallel ms':>12} {'speedup':>8}")
+    for pages in [2, 4, 8, 16, 30, 60]:
+        data = make_pdf(rng, pages)
+        serial_text = extract_text_from_pdf(io.BytesIO(data), workers=1)
+        parallel_text = extract_text_from_pdf(io.BytesIO(data), workers=args.workers)
+        assert serial_text == parallel_text, f"parallel output differs for {pages} pages"
+        serial = timed(lambda: extract_text_from_pdf(io.BytesIO(data), workers=1), args.repeat)
+        parallel = timed(lambda: extract_text_from_pdf(io.BytesIO(data), workers=args.workers), args.repeat)
+        print(f"{pages:>6} {len(data):>9} {serial * 1000:>10.1f} {parallel * 1000:>12.1f} {serial / parallel:>7.2f}x")
+
+    resume_parser.shutdown_parse_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Search benchmark: latency of /api/applications/search queries against the
+full-text index as the applications table grows.
+
+Applications with synthetic job descriptions are inserted through the ORM
+(so the index is maintained the same way as in the app) into a throwaway
+database, and at each --rows size every query is timed --repeat times.
+
+    cd backend && python -m benchmarks.bench_search --rows 1000 5000 20000
+    DATABASE_URL=postgresql://... python -m benchmarks.bench_search --keep-database
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from typing import Dict, List
+
+from benchmarks.fixtures import SKILLS, make_job_description
+from benchmarks.results import summarize, write_results
+
+QUERIES = ["kubernetes", "python aws", "machine learning", "kafka spark airflow", "terra", "company 42"]
+COMPANIES = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark", "Wayne", "Cyberdyne"]
+
+
+async def fill(AsyncSessionLocal, Application, rng: random.Random, count: int, start: int) -> None:
+    batch = 500
+    for offset in range(0, count, batch):
+        async with AsyncSessionLocal() as db:
+            db.add_all([
+                Application(
+                    company=f"{rng.choice(COMPANIES)} Company {start + offset + i}",
+                    job_title=f"{rng.choice(SKILLS)} Engineer",
+                    job_description=make_job_description(rng, rng.choice(["small", "medium"]), with_email=False),
+                    tailored_resume="",
+                )
+                for i in range(min(batch, count - offset))
+            ])
+            await db.commit()
+
+
+async def run(sizes: List[int], repeat: int, limit: int) -> Dict[str, Dict]:
+    from database.db import AsyncSessionLocal, close_db, init_db
+    from database.models import Application
+    from database.search import search_applications
+
+    await init_db()
+    rng = random.Random(42)
+    results: Dict[str, Dict] = {}
+    rows = 0
+    print(f"{'scenario':<36} {'matches':>8} {'p50 ms':>8} {'p95 ms':>8}")
+    for size in sorted(sizes):
+        await fill(AsyncSessionLocal, Application, rng, size - rows, rows)
+        rows = size
+        async with AsyncSessionLocal() as db:
+            for query in QUERIES:
+                latencies = []
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    found = await search_applications(db, query, limit)
+                    latencies.append(time.perf_counter() - started)
+                if found is None:
+                    raise SystemExit("This database has no search index")
+                name = f"search[{size},{query}]"
+                results[name] = summarize(latencies)
+                print(f"{name:<36} {len(found):>8} {results[name]['p50_ms']:>8.2f} {results[name]['p95_ms']:>8.2f}")
+    await close_db()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--keep-database", action="store_true",
+                        help="use DATABASE_URL as is instead of a temporary SQLite file")
+    parser.add_argument("--output", help="write results as JSON to this path")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        if not args.keep_database:
+            # Must be set before database.db is imported
+            os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(directory, 'search.db')}"
+        results = asyncio.run(run(args.rows, args.repeat, args.limit))
+
+    if args.output:
+        write_results(args.output, "search", results, {"rows": args.rows, "repeat": args.repeat, "limit": args.limit})
+
+
+if __name__ == "__main__":
+    main()
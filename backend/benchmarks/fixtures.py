@@ -0,0 +1,137 @@
+"""
+Synthetic inputs for the benchmarks: resume text, PDF and DOCX files and
+job descriptions of several sizes. Everything is generated from a seeded
+random.Random, so runs are reproducible and need no files or network.
+"""
+
+import io
+import random
+from typing import Dict, List, Tuple
+
+WORDS = [
+    "designed", "built", "scalable", "Python", "services", "Kubernetes", "latency", "reduced",
+    "team", "data", "pipelines", "research", "published", "thesis", "experiment", "results",
+    "analysis", "cloud", "AWS", "led", "mentored", "students", "course", "grant", "model",
+]
+SKILLS = [
+    "Python", "FastAPI", "React", "TypeScript", "AWS", "Docker", "Kubernetes", "PostgreSQL",
+    "Machine Learning", "PyTorch", "TensorFlow", "SQL", "Terraform", "CI/CD", "Go", "Rust",
+    "Node.js", "GraphQL", "Kafka", "Spark", "Airflow", "Redis", "Linux", "REST APIs",
+]
+SECTIONS = ["Experience", "Education", "Projects", "Skills", "Publications"]
+
+# Paragraphs per job description section
+JD_SIZES = {"small": 1, "medium": 4, "large": 12}
+
+
+def _sentence(rng: random.Random, low: int = 8, high: int = 18) -> str:
+    words = [rng.choice(WORDS + SKILLS) for _ in range(rng.randint(low, high))]
+    return " ".join(words).capitalize() + "."
+
+
+def make_resume_text(rng: random.Random, sections: int = 4, bullets: int = 6) -> str:
+    """Plain-text resume with a contact line and `sections` sections of bullets."""
+    lines = ["Jane Doe", f"jane.doe{rng.randint(1, 9999)}@example.com | +1 555 0100 | Berlin"]
+    for i in range(sections):
+        lines.append("")
+        lines.append(SECTIONS[i % len(SECTIONS)].upper())
+        lines.extend(f"- {_sentence(rng)}" for _ in range(bullets))
+    return "\n".join(lines)
+
+
+def _pdf_string(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(rng: random.Random, pages: int, lines_per_page: int = 45) -> bytes:
+    """A minimal PDF whose pages each carry `lines_per_page` lines of Helvetica text."""
+    objects: List[Tuple[int, bytes]] = []
+    page_ids = []
+    # 1: catalog, 2: pages, 3: font; page and content objects follow
+    next_id = 4
+    for _ in range(pages):
+        lines = [" ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 12))) for _ in range(lines_per_page)]
+        ops = ["BT", "/F1 10 Tf", "12 TL", "50 760 Td"]
+        ops += [f"({_pdf_string(line)}) Tj T*" for line in lines]
+        ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1")
+        page_id, content_id = next_id, next_id + 1
+        next_id += 2
+        page_ids.append(page_id)
+        objects.append((page_id, (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>"
+        ).encode()))
+        objects.append((content_id, b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream"))
+
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+    objects = [
+        (1, b"<< /Type /Catalog /Pages 2 0 R >>"),
+        (2, f"<< /Type /Pages /Kids [{kids}] /Count {pages} >>".encode()),
+        (3, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"),
+    ] + objects
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = {}
+    for obj_id, body in objects:
+        offsets[obj_id] = out.tell()
+        out.write(b"%d 0 obj\n" % obj_id + body + b"\nendobj\n")
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for obj_id in range(1, len(objects) + 1):
+        out.write(b"%010d 00000 n \n" % offsets[obj_id])
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+def make_docx(rng: random.Random, sections: int = 4, bullets: int = 6, table_rows: int = 4) -> bytes:
+    """A resume DOCX with headings, bullet paragraphs and a skills table."""
+    from docx import Document
+
+    doc = Document()
+    for line in make_resume_text(rng, sections, bullets).splitlines():
+        if line.startswith("- "):
+            doc.add_paragraph(line[2:], style="List Bullet")
+        elif line.isupper():
+            doc.add_heading(line.title(), level=2)
+        elif line:
+            doc.add_paragraph(line)
+    if table_rows:
+        table = doc.add_table(rows=table_rows, cols=3)
+        for row in table.rows:
+            row.cells[0].text = rng.choice(SKILLS)
+            row.cells[1].text = f"{rng.randint(1, 10)} years"
+            row.cells[2].text = rng.choice(["Expert", "Advanced", "Intermediate"])
+    out = io.BytesIO()
+    doc.save(out)
+    return out.getvalue()
+
+
+def make_job_description(rng: random.Random, size: str = "medium", with_email: bool = True) -> str:
+    """A job posting with the usual sections (including boilerplate the prompt builder drops)."""
+    paragraphs = JD_SIZES[size]
+    skills = rng.sample(SKILLS, 8)
+    parts = [
+        f"Senior {rng.choice(['Backend', 'Data', 'Platform', 'ML'])} Engineer at Acme {rng.randint(1, 10 ** 6)}",
+        "About us",
+        " ".join(_sentence(rng) for _ in range(3)),
+        "Responsibilities",
+    ]
+    parts += ["- " + _sentence(rng) for _ in range(paragraphs * 3)]
+    parts.append("Requirements")
+    parts += [f"- {rng.randint(2, 8)}+ years with {skill}" for skill in skills]
+    parts += [" ".join(_sentence(rng) for _ in range(4)) for _ in range(paragraphs)]
+    parts.append("Benefits")
+    parts.append(" ".join(_sentence(rng) for _ in range(3)))
+    parts.append(
+        "Acme is an equal opportunity employer. All qualified applicants will receive "
+        "consideration for employment without regard to race, color, religion or sex."
+    )
+    if with_email:
+        parts.append(f"Send your application to jobs{rng.randint(1, 999)}@acme.example")
+    return "\n".join(parts)
+
+
+def job_description_corpus(rng: random.Random, count_per_size: int = 10) -> Dict[str, List[str]]:
+    return {size: [make_job_description(rng, size) for _ in range(count_per_size)] for size in JD_SIZES}
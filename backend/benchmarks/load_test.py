@@ -0,0 +1,318 @@
+"""
+Offline load test of every API endpoint.
+
+Starts the OpenAI stub (benchmarks.stub_openai) and the app under uvicorn
+on a throwaway SQLite database, uploads a resume, then runs each scenario
+with --requests requests at --concurrency and reports throughput and
+p50/p95/p99 latency. Inputs are unique per request unless the scenario
+name says "cached"/"dedup", so LLM and PDF caches are only hit on purpose.
+
+    cd backend && python -m benchmarks.load_test --requests 40 --concurrency 8 \\
+        --output benchmarks/results/load.json
+    python -m benchmarks.results old.json benchmarks/results/load.json
+
+Pass --base-url to test an already running server instead (it must be
+pointed at the stub or a real API key itself).
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Awaitable, Callable, Dict, List, Tuple
+
+import httpx
+
+from benchmarks.fixtures import make_docx, make_job_description, make_pdf
+from benchmarks.results import summarize, write_results
+
+DOCX = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+# A request returns (ok, extra timings in seconds)
+Request = Callable[[httpx.AsyncClient, int], Awaitable[Tuple[bool, Dict[str, float]]]]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _wait_until_up(url: str, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(url)).status_code < 500:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.05)
+    raise RuntimeError(f"{url} did not come up within {timeout:g}s")
+
+
+class Scenarios:
+    """
+    The request for each scenario. Inputs are generated up front so only
+    the server is timed; ids shared between scenarios are collected here.
+    """
+
+    def __init__(self, seed: int, jd_size: str, requests: int):
+        self.rng = random.Random(seed)
+        self.job_ids: List[int] = []
+        self.application_ids: List[int] = []
+        self.fixed_jd = make_job_description(self.rng, jd_size)
+        self.fixed_docx = make_docx(self.rng)
+        self.fixed_html = "<h1>Jane Doe</h1><h2>Experience</h2><p>Python and Kubernetes on AWS</p>"
+        self.docx_files = [make_docx(self.rng) for _ in range(requests)]
+        self.pdf_files = [make_pdf(self.rng, 2) for _ in range(requests)]
+        # Separate descriptions per scenario so none of them hits the LLM cache
+        self.jds = [make_job_description(self.rng, jd_size) for _ in range(requests * 6)]
+        self.requests = requests
+
+    def _jd(self, scenario: int, i: int) -> str:
+        return self.jds[scenario * self.requests + i]
+
+    def all(self) -> List[Tuple[str, Request]]:
+        return [
+            ("GET /", self.root),
+            ("GET /api/health", self.health),
+            ("POST /api/upload-resume [docx]", self.upload_docx),
+            ("POST /api/upload-resume [pdf]", self.upload_pdf),
+            ("POST /api/upload-resume [dedup]", self.upload_dedup),
+            ("POST /api/tailor", self.tailor),
+            ("POST /api/tailor [cached]", self.tailor_cached),
+            ("POST /api/tailor/stream", self.tailor_stream),
+            ("POST /api/tailor/batch [3 jobs]", self.tailor_batch),
+            ("POST /api/email-draft", self.email_draft),
+            ("POST /api/generate-pdf", self.generate_pdf),
+            ("POST /api/generate-pdf [cached]", self.generate_pdf_cached),
+            ("POST /api/jobs", self.submit_job),
+            ("GET /api/jobs/{job_id}", self.job_status),
+            ("GET /api/applications", self.list_applications),
+            ("GET /api/cache/stats", self.cache_stats),
+            ("GET /metrics", self.metrics),
+            ("DELETE /api/applications/{app_id}", self.delete_application),
+        ]
+
+    async def root(self, client, i):
+        return (await client.get("/")).status_code == 200, {}
+
+    async def health(self, client, i):
+        return (await client.get("/api/health")).status_code == 200, {}
+
+    async def metrics(self, client, i):
+        return (await client.get("/metrics")).status_code == 200, {}
+
+    async def cache_stats(self, client, i):
+        return (await client.get("/api/cache/stats")).status_code == 200, {}
+
+    async def _upload(self, client, name: str, data: bytes, content_type: str):
+        response = await client.post("/api/upload-resume", files={"file": (name, data, content_type)})
+        return response.status_code == 200, {}
+
+    async def upload_docx(self, client, i):
+        return await self._upload(client, "resume.docx", self.docx_files[i], DOCX)
+
+    async def upload_pdf(self, client, i):
+        return await self._upload(client, "resume.pdf", self.pdf_files[i], "application/pdf")
+
+    async def upload_dedup(self, client, i):
+        return await self._upload(client, "resume.docx", self.fixed_docx, DOCX)
+
+    async def tailor(self, client, i):
+        response = await client.post("/api/tailor", json={"job_description": self._jd(0, i)})
+        return response.status_code == 200, {}
+
+    async def tailor_cached(self, client, i):
+        response = await client.post("/api/tailor", json={"job_description": self.fixed_jd})
+        return response.status_code == 200, {}
+
+    async def tailor_stream(self, client, i):
+        started = time.perf_counter()
+        extra: Dict[str, float] = {}
+        ok = False
+        async with client.stream("POST", "/api/tailor/stream", json={"job_description": self._jd(1, i)}) as response:
+            if response.status_code != 200:
+                return False, {}
+            async for line in response.aiter_lines():
+                if not line.startswith("event: "):
+                    continue
+                event = line[len("event: "):]
+                extra.setdefault("first_event", time.perf_counter() - started)
+                if event == "html":
+                    extra.setdefault("first_html", time.perf_counter() - started)
+                elif event == "done":
+                    ok = True
+                elif event == "error":
+                    return False, extra
+        return ok, extra
+
+    async def tailor_batch(self, client, i):
+        jobs = [{"job_description": self._jd(2 + k, i)} for k in range(3)]
+        async with client.stream("POST", "/api/tailor/batch", json={"jobs": jobs}) as response:
+            body = "".join([chunk async for chunk in response.aiter_text()])
+        done = [line for line in body.splitlines() if line.startswith("data: ") and '"succeeded"' in line]
+        return response.status_code == 200 and bool(done) and json.loads(done[0][6:])["failed"] == 0, {}
+
+    async def email_draft(self, client, i):
+        response = await client.post("/api/email-draft", json={
+            "job_title": f"Engineer {i}", "company": f"Acme {i}", "recipient_email": "jobs@acme.example"
+        })
+        return response.status_code == 200, {}
+
+    async def generate_pdf(self, client, i):
+        html = f"{self.fixed_html}<p>Request {i} {self.rng.random()}</p>"
+        response = await client.post("/api/generate-pdf", json={"html": html, "keywords": ["Python", "AWS"]})
+        return response.status_code == 200, {}
+
+    async def generate_pdf_cached(self, client, i):
+        response = await client.post("/api/generate-pdf", json={"html": self.fixed_html, "keywords": ["Python"]})
+        return response.status_code == 200, {}
+
+    async def submit_job(self, client, i):
+        response = await client.post("/api/jobs", json={"job_description": self._jd(5, i)})
+        if response.status_code == 202:
+            self.job_ids.append(response.json()["job_id"])
+        return response.status_code == 202, {}
+
+    async def job_status(self, client, i):
+        if not self.job_ids:
+            return False, {}
+        response = await client.get(f"/api/jobs/{self.job_ids[i % len(self.job_ids)]}")
+        return response.status_code == 200, {}
+
+    async def list_applications(self, client, i):
+        response = await client.get("/api/applications", params={"limit": 50})
+        if response.status_code == 200 and not self.application_ids:
+            self.application_ids = [application["id"] for application in response.json()]
+        return response.status_code == 200, {}
+
+    async def delete_application(self, client, i):
+        if not self.application_ids:
+            return False, {}
+        app_id = self.application_ids.pop()
+        return (await client.delete(f"/api/applications/{app_id}")).status_code == 200, {}
+
+
+async def run_scenario(client: httpx.AsyncClient, request: Request, requests: int, concurrency: int) -> Dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    extras: Dict[str, List[float]] = {}
+    errors = 0
+
+    async def one(i: int):
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                ok, extra = await request(client, i)
+            except httpx.HTTPError:
+                ok, extra = False, {}
+            elapsed = time.perf_counter() - started
+        if not ok:
+            errors += 1
+            return
+        latencies.append(elapsed)
+        for name, seconds in extra.items():
+            extras.setdefault(name, []).append(seconds)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    summary = summarize(latencies, errors, time.perf_counter() - started)
+    for name, samples in extras.items():
+        extra_summary = summarize(samples)
+        summary[f"{name}_p50_ms"] = extra_summary["p50_ms"]
+        summary[f"{name}_p95_ms"] = extra_summary["p95_ms"]
+    return summary
+
+
+async def run(args, base_url: str) -> Dict[str, Dict]:
+    scenarios = Scenarios(args.seed, args.jd_size, args.requests)
+    selected = [(name, request) for name, request in scenarios.all()
+                if not args.only or any(word in name for word in args.only)]
+    results: Dict[str, Dict] = {}
+    limits = httpx.Limits(max_connections=args.concurrency * 2)
+    async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+        # Most endpoints need a resume
+        await scenarios.upload_dedup(client, -1)
+        print(f"{'scenario':<38} {'ok':>5} {'err':>4} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+        for name, request in selected:
+            summary = await run_scenario(client, request, args.requests, args.concurrency)
+            results[name] = summary
+            ok = summary["requests"] - summary["errors"]
+            print(f"{name:<38} {ok:>5} {summary['errors']:>4} {summary.get('throughput_rps', 0):>8.1f} "
+                  f"{summary['p50_ms']:>9.1f} {summary['p95_ms']:>9.1f} {summary['p99_ms']:>9.1f}")
+    return results
+
+
+def _start_servers(args, tmp: str) -> Tuple[List[subprocess.Popen], str, str]:
+    stub_port, app_port = _free_port(), _free_port()
+    stub = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.stub_openai", "--port", str(stub_port),
+         "--latency", str(args.latency), "--jitter", str(args.jitter), "--error-rate", str(args.error_rate)],
+        stdout=subprocess.DEVNULL,
+    )
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{tmp}/load.db",
+        LLM_CACHE_PATH=f"{tmp}/llm_cache.db",
+        OPENAI_BASE_URL=f"http://127.0.0.1:{stub_port}/v1",
+        OPENAI_API_KEY="stub",
+        LOG_TRACE_IDS="false",
+    )
+    app = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(app_port), "--log-level", "warning"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=open(os.path.join(tmp, "app.log"), "w"),
+    )
+    return [stub, app], f"http://127.0.0.1:{stub_port}/v1/stats", f"http://127.0.0.1:{app_port}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=40, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.3, help="stub OpenAI latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.1)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of stub calls failing with 429/5xx")
+    parser.add_argument("--jd-size", choices=["small", "medium", "large"], default="medium")
+    parser.add_argument("--only", nargs="*", default=[], help="run scenarios whose name contains one of these")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--base-url", help="test this running server instead of starting one")
+    parser.add_argument("--output", help="write results as JSON to this path")
+    args = parser.parse_args()
+
+    settings = {key: value for key, value in vars(args).items() if key not in ("output", "base_url")}
+    if args.base_url:
+        results = asyncio.run(run(args, args.base_url))
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            processes, stub_url, base_url = _start_servers(args, tmp)
+            try:
+                asyncio.run(_wait_until_up(stub_url))
+                asyncio.run(_wait_until_up(f"{base_url}/api/health"))
+                results = asyncio.run(run(args, base_url))
+            finally:
+                for process in processes:
+                    process.terminate()
+                    process.wait()
+                with open(os.path.join(tmp, "app.log")) as log:
+                    errors = [line for line in log if "ERROR" in line]
+                if errors:
+                    print(f"{len(errors)} error lines in the app log, e.g.: {errors[0].strip()[:160]}")
+
+    if args.output:
+        write_results(args.output, "load", results, settings)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Benchmark result files: latency summaries, JSON output with the run's
+environment, and a comparison of two runs.
+
+    cd backend && python -m benchmarks.results baseline.json candidate.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence
+
+
+def percentile(sorted_samples: Sequence[float], fraction: float) -> float:
+    """Nearest-rank percentile of already sorted samples."""
+    if not sorted_samples:
+        return 0.0
+    index = max(0, min(len(sorted_samples) - 1, int(round(fraction * len(sorted_samples))) - 1))
+    return sorted_samples[index]
+
+
+def summarize(latencies: List[float], errors: int = 0, wall_seconds: Optional[float] = None) -> Dict:
+    """Count, throughput and latency percentiles (milliseconds) of one scenario."""
+    ordered = sorted(latencies)
+    summary = {
+        "requests": len(ordered) + errors,
+        "errors": errors,
+        "mean_ms": sum(ordered) / len(ordered) * 1000 if ordered else 0.0,
+        "p50_ms": percentile(ordered, 0.50) * 1000,
+        "p95_ms": percentile(ordered, 0.95) * 1000,
+        "p99_ms": percentile(ordered, 0.99) * 1000,
+        "max_ms": ordered[-1] * 1000 if ordered else 0.0,
+    }
+    if wall_seconds:
+        summary["throughput_rps"] = len(ordered) / wall_seconds
+    return summary
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_results(path: str, suite: str, results: Dict, settings: Optional[Dict] = None) -> None:
+    """Write results with enough context (revision, machine, settings) to compare runs later."""
+    document = {
+        "suite": suite,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "settings": settings or {},
+        "results": results,
+    }
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(document, f, indent=2, sort_keys=True)
+    print(f"results written to {path}")
+
+
+def compare(baseline: Dict, candidate: Dict, metric: str) -> List[str]:
+    """One line per scenario present in both runs: baseline, candidate and relative change."""
+    lines = [f"{'scenario':<44} {'baseline':>10} {'candidate':>10} {'change':>8}"]
+    for name, before in sorted(baseline["results"].items()):
+        after = candidate["results"].get(name)
+        if after is None or metric not in before or metric not in after:
+            continue
+        change = (after[metric] - before[metric]) / before[metric] * 100 if before[metric] else 0.0
+        lines.append(f"{name:<44} {before[metric]:>10.2f} {after[metric]:>10.2f} {change:>+7.1f}%")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--metric", help="defaults to p95_ms for load tests and best_ms for microbenchmarks")
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.candidate) as f:
+        candidate = json.load(f)
+    if baseline["suite"] != candidate["suite"]:
+        sys.exit(f"cannot compare a {baseline['suite']} run with a {candidate['suite']} run")
+    metric = args.metric or ("best_ms" if baseline["suite"] == "micro" else "p95_ms")
+    print(f"{metric}: {baseline.get('git_revision')} -> {candidate.get('git_revision')}")
+    print("\n".join(compare(baseline, candidate, metric)))
+
+
+if __name__ == "__main__":
+    main()
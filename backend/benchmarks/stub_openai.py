@@ -0,0 +1,187 @@
+"""
+Local stand-in for the OpenAI chat-completions API, so the service can be
+load-tested offline and without spending tokens.
+
+Replies are canned per kind of call (keywords, tailored resume or
+section, job title and company, email draft), picked from the
+response_format schema name or, without structured outputs, from the
+prompt. Streaming, usage reporting and the
+x-ratelimit-* headers behave like the real API. Latency, jitter, stream
+chunking and an error rate are configurable.
+
+    cd backend && python -m benchmarks.stub_openai --port 8765 --latency 0.3
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 OPENAI_API_KEY=stub uvicorn main:app
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import Dict, List
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+KEYWORDS = ["Python", "FastAPI", "Kubernetes", "AWS", "PostgreSQL", "Docker", "CI/CD", "Machine Learning"]
+
+TAILORED_HTML = (
+    "<html><body>"
+    "<h1>Jane Doe</h1>"
+    "<p>jane.doe@example.com | +1 555 0100 | Berlin</p>"
+    "<h2>Summary</h2>"
+    "<p>Backend engineer with 8 years of Python, FastAPI and Kubernetes experience on AWS.</p>"
+    "<h2>Experience</h2>"
+    + "".join(
+        f'<div class="job-entry"><div class="job-header"><span class="job-title">Senior Engineer, Company {i}</span>'
+        f'<span class="date">201{i} - 202{i}</span></div><ul>'
+        + "".join(
+            f"<li>Built Python services on Kubernetes and AWS, cutting p95 latency by {10 * j}% "
+            f"for PostgreSQL-backed APIs used by {j} million users.</li>"
+            for j in range(1, 6)
+        )
+        + "</ul></div>"
+        for i in range(1, 5)
+    )
+    + "<h2>Skills</h2><p>Python, FastAPI, Docker, Kubernetes, AWS, PostgreSQL, CI/CD</p>"
+    "</body></html>"
+)
+
+SECTION_HTML = (
+    '<div class="job-entry"><h3>Senior Engineer, Company 1</h3><ul>'
+    + "".join(f"<li>Built Python services on Kubernetes and AWS for {j} million users.</li>" for j in range(1, 6))
+    + "</ul></div>"
+)
+
+
+class StubSettings:
+    def __init__(self, latency: float = 0.3, jitter: float = 0.1, chunk_chars: int = 24,
+                 chunk_delay: float = 0.005, error_rate: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.chunk_chars = chunk_chars
+        self.chunk_delay = chunk_delay
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.requests = 0
+
+
+def _reply_kind(body: Dict) -> str:
+    schema_name = ((body.get("response_format") or {}).get("json_schema") or {}).get("name", "")
+    if schema_name:
+        return {
+            "KeywordsReply": "keywords",
+            "EmailDraftReply": "email",
+            "TailoredSectionReply": "section",
+            "JobMetaReply": "job_meta",
+        }.get(schema_name, "tailor")
+    prompt = json.dumps(body.get("messages", []))
+    if "keyword extraction" in prompt:
+        return "keywords"
+    if "application email" in prompt:
+        return "email"
+    if "ONE section of a resume" in prompt:
+        return "section"
+    if "job title and the company" in prompt:
+        return "job_meta"
+    return "tailor"
+
+
+def _reply_content(kind: str) -> str:
+    if kind == "keywords":
+        return json.dumps({"keywords": KEYWORDS})
+    if kind == "email":
+        return json.dumps({"subject": "Application for the Senior Engineer role",
+                           "body": "Dear hiring team,\n\nPlease find my resume attached.\n\nBest regards,\nJane"})
+    if kind == "section":
+        return json.dumps({"html_content": SECTION_HTML})
+    if kind == "job_meta":
+        return json.dumps({"job_title": "Senior Engineer", "company": "Acme"})
+    return json.dumps({"job_title": "Senior Engineer", "company": "Acme", "html_content": TAILORED_HTML})
+
+
+def _usage(messages: List[Dict], content: str) -> Dict:
+    prompt_tokens = sum(len(str(message.get("content", ""))) for message in messages) // 4 + 1
+    completion_tokens = len(content) // 4 + 1
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+        "prompt_tokens_details": {"cached_tokens": 0},
+    }
+
+
+_RATE_LIMIT_HEADERS = {
+    "x-ratelimit-limit-requests": "10000",
+    "x-ratelimit-remaining-requests": "9999",
+    "x-ratelimit-reset-requests": "6ms",
+    "x-ratelimit-limit-tokens": "10000000",
+    "x-ratelimit-remaining-tokens": "9990000",
+    "x-ratelimit-reset-tokens": "1ms",
+}
+
+
+def create_app(settings: StubSettings) -> FastAPI:
+    app = FastAPI(title="OpenAI stub")
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        settings.requests += 1
+        await asyncio.sleep(max(0.0, settings.latency + settings.rng.uniform(-settings.jitter, settings.jitter)))
+        if settings.error_rate and settings.rng.random() < settings.error_rate:
+            status = settings.rng.choice([429, 500, 503])
+            return JSONResponse({"error": {"message": "stub error", "type": "server_error"}},
+                                status_code=status, headers={"retry-after": "0.1"})
+
+        content = _reply_content(_reply_kind(body))
+        usage = _usage(body.get("messages", []), content)
+        base = {"id": f"chatcmpl-stub{settings.requests}", "created": int(time.time()), "model": body.get("model")}
+
+        if not body.get("stream"):
+            return JSONResponse({
+                **base,
+                "object": "chat.completion",
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+                "usage": usage,
+            }, headers=_RATE_LIMIT_HEADERS)
+
+        async def chunks():
+            for start in range(0, len(content), settings.chunk_chars):
+                delta = {"content": content[start:start + settings.chunk_chars]}
+                chunk = {**base, "object": "chat.completion.chunk",
+                         "choices": [{"index": 0, "delta": delta, "finish_reason": None}]}
+                yield f"data: {json.dumps(chunk)}\n\n"
+                if settings.chunk_delay:
+                    await asyncio.sleep(settings.chunk_delay)
+            if (body.get("stream_options") or {}).get("include_usage"):
+                yield f"data: {json.dumps({**base, 'object': 'chat.completion.chunk', 'choices': [], 'usage': usage})}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(chunks(), media_type="text/event-stream", headers=_RATE_LIMIT_HEADERS)
+
+    @app.get("/v1/stats")
+    async def stats():
+        return {"requests": settings.requests}
+
+    return app
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.3, help="seconds before each reply starts")
+    parser.add_argument("--jitter", type=float, default=0.1, help="uniform +/- seconds added to the latency")
+    parser.add_argument("--chunk-chars", type=int, default=24, help="characters per streamed chunk")
+    parser.add_argument("--chunk-delay", type=float, default=0.005, help="seconds between streamed chunks")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of calls answered with 429/5xx")
+    args = parser.parse_args()
+
+    settings = StubSettings(args.latency, args.jitter, args.chunk_chars, args.chunk_delay, args.error_rate)
+    uvicorn.run(create_app(settings), host="127.0.0.1", port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,16 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import LargeBinary, event, func, inspect, make_url, select, text, type_coerce
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from .models import Base
+from .search import create_search_index
+from .types import CompressedText, decompress_text
+import logging
 import os
+import ssl
+from typing import Tuple
 from dotenv import load_dotenv
 
 load_dotenv()
+logger = logging.getLogger(__name__)
 
 # Get DB URL, default to SQLite for local testing
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./resume_tailor.db")
@@ -12,18 +18,153 @@ DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./resume_tailor.db")
 if DATABASE_URL and DATABASE_URL.startswith("postgres://"):
     DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
 
-engine = create_engine(
-    DATABASE_URL, 
-    connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {}
-)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    
-def init_db():
-    Base.metadata.create_all(bind=engine)
-
-def get_db():
-    db = SessionLocal()
-    try:
+def asyncpg_url(url: str) -> Tuple[str, dict]:
+    """
+    Map a libpq-style PostgreSQL URL to asyncpg and its connect_args.
+    SQLAlchemy passes URL query parameters straight to asyncpg.connect(),
+    which rejects libpq's sslmode/sslrootcert, so they become `ssl`.
+    """
+    parsed = make_url(url).set(drivername="postgresql+asyncpg")
+    sslmode = parsed.query.get("sslmode")
+    sslrootcert = parsed.query.get("sslrootcert")
+    parsed = parsed.difference_update_query(["sslmode", "sslrootcert"])
+    connect_args = {}
+    if sslmode == "disable":
+        connect_args["ssl"] = False
+    elif sslmode in ("verify-ca", "verify-full") and sslrootcert:
+        context = ssl.create_default_context(cafile=sslrootcert)
+        context.check_hostname = sslmode == "verify-full"
+        connect_args["ssl"] = context
+    elif sslmode:
+        # asyncpg understands the remaining modes by name (allow, prefer, require, verify-*)
+        connect_args["ssl"] = sslmode
+    return parsed.render_as_string(hide_password=False), connect_args
+
+# Plain URLs are mapped to their async drivers (asyncpg / aiosqlite)
+ASYNC_DATABASE_URL = DATABASE_URL
+DB_CONNECT_ARGS: dict = {}
+if ASYNC_DATABASE_URL.startswith("postgresql://"):
+    ASYNC_DATABASE_URL, DB_CONNECT_ARGS = asyncpg_url(ASYNC_DATABASE_URL)
+elif ASYNC_DATABASE_URL.startswith("sqlite://"):
+    ASYNC_DATABASE_URL = ASYNC_DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://", 1)
+
+IS_SQLITE = ASYNC_DATABASE_URL.startswith("sqlite")
+
+# Opt-in production settings for SQLite: WAL lets readers run alongside the
+# writer, and busy_timeout makes a second writer wait instead of failing
+SQLITE_TUNED = IS_SQLITE and os.getenv("SQLITE_TUNED", "false").lower() == "true"
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+# Negative values are KiB, as in PRAGMA cache_size
+SQLITE_CACHE_SIZE = int(os.getenv("SQLITE_CACHE_SIZE", "-65536"))
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+
+# Connection pool tuning
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+
+engine_options = {
+    "pool_pre_ping": DB_POOL_PRE_PING,
+    "pool_recycle": DB_POOL_RECYCLE,
+    "connect_args": DB_CONNECT_ARGS,
+}
+if not IS_SQLITE:
+    engine_options.update(
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+    )
+
+engine = create_async_engine(ASYNC_DATABASE_URL, **engine_options)
+
+if SQLITE_TUNED:
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute(f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+        cursor.execute(f"PRAGMA cache_size={SQLITE_CACHE_SIZE}")
+        cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.close()
+
+# expire_on_commit=False: attributes stay readable after commit without an implicit (sync) reload
+AsyncSessionLocal = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+def _add_missing_columns(conn):
+    """
+    create_all only creates missing tables, so columns added to existing
+    models later are added here (they must be nullable or have a default).
+    """
+    inspector = inspect(conn)
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            column_type = column.type.compile(dialect=conn.dialect)
+            conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+        for index in table.indexes:
+            index.create(bind=conn, checkfirst=True)
+
+def _compress_legacy_rows(conn, batch_size: int = 500):
+    """
+    Compress values written before a column became CompressedText.
+    On PostgreSQL the old TEXT column is first converted to BYTEA.
+    """
+    inspector = inspect(conn)
+    for table in Base.metadata.sorted_tables:
+        columns = [column for column in table.columns if isinstance(column.type, CompressedText)]
+        if not columns:
+            continue
+        existing = {column["name"]: column["type"] for column in inspector.get_columns(table.name)}
+        for column in columns:
+            if conn.dialect.name == "postgresql" and not isinstance(existing[column.name], LargeBinary):
+                conn.execute(text(
+                    f"ALTER TABLE {table.name} ALTER COLUMN {column.name} "
+                    f"TYPE BYTEA USING convert_to({column.name}, 'UTF8')"
+                ))
+
+            raw = type_coerce(column, LargeBinary)
+            if conn.dialect.name == "sqlite":
+                legacy = func.typeof(column) == "text"
+            else:
+                legacy = func.substr(raw, 1, 1) != CompressedText.FORMAT
+            converted, last_id = 0, None
+            while True:
+                query = select(table.c.id, raw).where(legacy).order_by(table.c.id).limit(batch_size)
+                if last_id is not None:
+                    query = query.where(table.c.id > last_id)
+                rows = conn.execute(query).all()
+                if not rows:
+                    break
+                for row_id, value in rows:
+                    conn.execute(
+                        table.update().where(table.c.id == row_id).values({column.name: decompress_text(value)})
+                    )
+                converted += len(rows)
+                last_id = rows[-1][0]
+            if converted:
+                logger.info(
+                    f"Compressed {converted} {table.name}.{column.name} values "
+                    "(VACUUM the database to reclaim the space)"
+                )
+
+async def init_db():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_add_missing_columns)
+        await conn.run_sync(_compress_legacy_rows)
+        await conn.run_sync(create_search_index)
+
+async def close_db():
+    await engine.dispose()
+
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
\ No newline at end of file
@@ -1,6 +1,8 @@
 # File: backend/database/models.py
-from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import deferred
+from .types import CompressedText
 from datetime import datetime
 
 Base = declarative_base()
@@ -11,11 +13,36 @@ class Application(Base):
     id = Column(Integer, primary_key=True, index=True)
     company = Column(String(255), nullable=False)
     job_title = Column(String(255), nullable=False)
-    job_description = Column(Text, nullable=False)
-    tailored_resume = Column(Text, nullable=False)
+    # Large columns are stored compressed and only loaded (and decompressed)
+    # when accessed, keeping list queries light
+    job_description = deferred(Column(CompressedText, nullable=False))
+    tailored_resume = deferred(Column(CompressedText, nullable=False))
     status = Column(String(50), default="Ready")
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # Keyset pagination on (created_at, id), optionally filtered by status or company
+    __table_args__ = (
+        Index("ix_applications_created_at_id", "created_at", "id"),
+        Index("ix_applications_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_applications_company_created_at_id", "company", "created_at", "id"),
+    )
+
+class TailorJob(Base):
+    """Queue entry for background tailoring; its Application row tracks the same status."""
+    __tablename__ = "tailor_jobs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    application_id = Column(Integer, ForeignKey("applications.id", ondelete="CASCADE"), nullable=False, index=True)
+    resume_id = Column(Integer, ForeignKey("user_resumes.id"), nullable=False)
+    status = Column(String(50), default="Pending", index=True)  # Pending, Running, Ready, Failed
+    attempts = Column(Integer, default=0)
+    error = Column(Text)
+    result = Column(Text)  # JSON: keywords, email_detected
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+    run_after = Column(DateTime)  # a retried job is not claimed before this time
 
 class UserResume(Base):
     __tablename__ = "user_resumes"
@@ -24,4 +51,12 @@ class UserResume(Base):
     original_content = Column(Text, nullable=False)
     file_type = Column(String(10), nullable=False)  # pdf, docx, html
     uploaded_at = Column(DateTime, default=datetime.utcnow)
-    
+    # Derived artifacts, so re-uploads skip parsing and prompts stay compact
+    content_hash = Column(String(64), index=True)  # SHA-256 of the uploaded file
+    normalized_content = Column(Text)  # whitespace-compacted text sent to the model
+    token_count = Column(Integer)  # tokens in normalized_content
+
+    @property
+    def prompt_content(self) -> str:
+        """Resume text to send to the model (rows from before normalization fall back to the raw text)."""
+        return self.normalized_content or self.original_content
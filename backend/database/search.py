@@ -0,0 +1,176 @@
+import logging
+import os
+import re
+from typing import List, Optional
+
+from dotenv import load_dotenv
+from sqlalchemy import Float, column, event, inspect, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import Application
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+# Text search configuration (PostgreSQL) used for stemming and stop words
+SEARCH_LANGUAGE = os.getenv("SEARCH_LANGUAGE", "english")
+# Longer queries are cut to this many terms
+SEARCH_MAX_TERMS = 16
+
+# The indexed columns are stored compressed, so the database cannot index
+# them itself: the plain text is written to a separate index whenever an
+# application is inserted or one of the columns changes.
+#
+# SQLite: an FTS5 table keyed by the application id, ranked with bm25.
+# PostgreSQL: a weighted tsvector per application with a GIN index, ranked
+# with ts_rank_cd.
+# Either way company and job title weigh more than the job description.
+_SQLITE_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS applications_fts "
+    "USING fts5(company, job_title, job_description, tokenize='porter unicode61')",
+    # Also catches bulk deletes that bypass the ORM
+    "CREATE TRIGGER IF NOT EXISTS applications_fts_delete AFTER DELETE ON applications BEGIN "
+    "DELETE FROM applications_fts WHERE rowid = old.id; END",
+]
+_POSTGRES_DDL = [
+    "CREATE TABLE IF NOT EXISTS application_search ("
+    "application_id INTEGER PRIMARY KEY REFERENCES applications(id) ON DELETE CASCADE, "
+    "document TSVECTOR NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS ix_application_search_document ON application_search USING GIN (document)",
+]
+_INDEXED_COLUMNS = ("company", "job_title", "job_description")
+
+# Whether the index exists in this database (set by create_search_index)
+search_available = False
+
+
+def _index_application(conn, app_id: int, company: str, job_title: str, job_description: str) -> None:
+    params = {"id": app_id, "company": company or "", "job_title": job_title or "",
+              "job_description": job_description or ""}
+    if conn.dialect.name == "sqlite":
+        conn.execute(text("DELETE FROM applications_fts WHERE rowid = :id"), params)
+        conn.execute(text(
+            "INSERT INTO applications_fts (rowid, company, job_title, job_description) "
+            "VALUES (:id, :company, :job_title, :job_description)"
+        ), params)
+    else:
+        conn.execute(text(
+            "INSERT INTO application_search (application_id, document) VALUES (:id, "
+            "setweight(to_tsvector(CAST(:language AS regconfig), :company), 'A') || "
+            "setweight(to_tsvector(CAST(:language AS regconfig), :job_title), 'A') || "
+            "setweight(to_tsvector(CAST(:language AS regconfig), :job_description), 'C')) "
+            "ON CONFLICT (application_id) DO UPDATE SET document = EXCLUDED.document"
+        ), {**params, "language": SEARCH_LANGUAGE})
+
+
+@event.listens_for(Application, "after_insert")
+def _index_inserted(mapper, connection, target):
+    if search_available:
+        _index_application(connection, target.id, target.company, target.job_title, target.job_description)
+
+
+@event.listens_for(Application, "after_update")
+def _index_updated(mapper, connection, target):
+    if not search_available:
+        return
+    state = inspect(target)
+    if not any(state.attrs[name].history.has_changes() for name in _INDEXED_COLUMNS):
+        return
+    # job_description is deferred, and usually not loaded when only the title changes
+    job_description = state.dict.get("job_description")
+    if job_description is None:
+        table = Application.__table__
+        job_description = connection.execute(
+            select(table.c.job_description).where(table.c.id == target.id)
+        ).scalar()
+    _index_application(connection, target.id, target.company, target.job_title, job_description)
+
+
+def _backfill_search_index(conn, batch_size: int = 500) -> None:
+    """Index applications written before the index existed (or while it was unavailable)."""
+    table = Application.__table__
+    if conn.dialect.name == "sqlite":
+        indexed = "SELECT rowid FROM applications_fts"
+    else:
+        indexed = "SELECT application_id FROM application_search"
+    missing = [row[0] for row in conn.execute(text(
+        f"SELECT id FROM applications WHERE id NOT IN ({indexed}) ORDER BY id"
+    ))]
+    for start in range(0, len(missing), batch_size):
+        rows = conn.execute(
+            select(table.c.id, table.c.company, table.c.job_title, table.c.job_description)
+            .where(table.c.id.in_(missing[start:start + batch_size]))
+        ).all()
+        for row in rows:
+            _index_application(conn, *row)
+    if missing:
+        logger.info(f"Added {len(missing)} applications to the search index")
+
+
+def create_search_index(conn) -> None:
+    """Create the dialect's search index if needed and fill in unindexed rows."""
+    global search_available
+    try:
+        for statement in _SQLITE_DDL if conn.dialect.name == "sqlite" else _POSTGRES_DDL:
+            conn.execute(text(statement))
+    except Exception as e:
+        # e.g. an SQLite build without FTS5
+        logger.warning(f"Search index unavailable: {str(e)}")
+        search_available = False
+        return
+    search_available = True
+    _backfill_search_index(conn)
+
+
+def _query_terms(query: str) -> List[str]:
+    return re.findall(r"\w+", query.casefold())[:SEARCH_MAX_TERMS]
+
+
+def _fts5_query(terms: List[str]) -> str:
+    # Quoted terms cannot be read as FTS5 operators; the last one is a
+    # prefix so results show up while the user is still typing
+    return " ".join(f'"{term}"' for term in terms) + "*"
+
+
+def _tsquery(terms: List[str]) -> str:
+    return " & ".join(terms) + ":*"
+
+
+async def search_applications(db: AsyncSession, query: str, limit: int, offset: int = 0) -> Optional[List]:
+    """
+    Applications matching all terms of `query`, best match first, as rows of
+    (id, company, job_title, status, created_at, score). Returns None when
+    the database has no search index.
+    """
+    if not search_available:
+        return None
+    terms = _query_terms(query)
+    if not terms:
+        return []
+
+    if db.bind.dialect.name == "sqlite":
+        # Rank and page inside FTS5, then join just the page
+        statement = text(
+            "SELECT a.id, a.company, a.job_title, a.status, a.created_at, m.score "
+            "FROM (SELECT rowid, -bm25(applications_fts, 4.0, 4.0, 1.0) AS score FROM applications_fts "
+            "WHERE applications_fts MATCH :query ORDER BY score DESC, rowid DESC LIMIT :limit OFFSET :offset) m "
+            "JOIN applications a ON a.id = m.rowid "
+            "ORDER BY m.score DESC, a.id DESC"
+        )
+        params = {"query": _fts5_query(terms)}
+    else:
+        statement = text(
+            "SELECT a.id, a.company, a.job_title, a.status, a.created_at, "
+            "ts_rank_cd(s.document, q.query) AS score "
+            "FROM application_search s JOIN applications a ON a.id = s.application_id, "
+            "to_tsquery(CAST(:language AS regconfig), :query) AS q(query) "
+            "WHERE s.document @@ q.query "
+            "ORDER BY score DESC, a.id DESC LIMIT :limit OFFSET :offset"
+        )
+        params = {"query": _tsquery(terms), "language": SEARCH_LANGUAGE}
+    table = Application.__table__
+    statement = statement.columns(
+        table.c.id, table.c.company, table.c.job_title, table.c.status, table.c.created_at, column("score", Float)
+    )
+    result = await db.execute(statement, {**params, "limit": limit, "offset": offset})
+    return result.all()
@@ -0,0 +1,74 @@
+import zlib
+from typing import Optional
+
+from sqlalchemy.types import LargeBinary, TypeDecorator
+
+# Stored values start with a format byte. Anything else is a row written
+# before compression was introduced (plain text, or its UTF-8 bytes).
+_ZLIB_V1 = b"\x01"
+
+# Preset dictionary for zlib: strings that recur across resumes and job
+# descriptions, so even short values compress well. zlib favours matches
+# near the end, hence the most frequent fragments (the inline styles the
+# tailoring prompt asks for) come last.
+# Never edit it: stored rows can only be decompressed with the exact same
+# bytes. Add a new format byte and dictionary instead.
+_ZDICT_V1 = "".join([
+    "About the job Job description Responsibilities Requirements Qualifications ",
+    "Preferred qualifications Nice to have What you'll do What we offer Benefits ",
+    "We are an equal opportunity employer and value diversity. All qualified applicants ",
+    "will receive consideration for employment without regard to race, color, religion, ",
+    "sex, sexual orientation, gender identity, national origin, disability or veteran status. ",
+    "years of experience with strong communication skills cross-functional teams ",
+    "Bachelor's degree in Computer Science or a related field ",
+    "Python JavaScript TypeScript React Node.js SQL AWS Docker Kubernetes ",
+    "PROFESSIONAL SUMMARY</h2>\n<p>EXPERIENCE</h2>\nEDUCATION</h2>\nSKILLS</h2>\nPROJECTS</h2>\n",
+    '<h1 style="font-size: 26pt; font-weight: 700; color: #000;">',
+    '<p style="text-align: center; font-size: 10pt;">',
+    '<div style="margin-bottom: 15px;">\n<div style="display: flex; justify-content: space-between;">\n',
+    '<h3 style="font-size: 12pt; font-weight: 700; color: #000;">',
+    '</h3>\n<span style="font-size: 10pt; color: #444; font-style: italic;">',
+    '</span>\n</div>\n<p style="font-weight: 600; color: #000;"><strong>',
+    "</strong> - </p>\n<ul>\n<li></li>\n</ul>\n</div>\n",
+    '<h2 style="font-size: 13pt; font-weight: 700; color: #000; border-bottom: 2px solid #000; margin-top: 20px;">',
+    "</strong></li>\n<li><strong>",
+]).encode("utf-8")
+
+COMPRESSION_LEVEL = 9
+
+
+def compress_text(value: str) -> bytes:
+    compressor = zlib.compressobj(COMPRESSION_LEVEL, zdict=_ZDICT_V1)
+    return _ZLIB_V1 + compressor.compress(value.encode("utf-8")) + compressor.flush()
+
+
+def decompress_text(value) -> str:
+    if isinstance(value, str):
+        return value
+    value = bytes(value)
+    if value[:1] == _ZLIB_V1:
+        decompressor = zlib.decompressobj(zdict=_ZDICT_V1)
+        return (decompressor.decompress(value[1:]) + decompressor.flush()).decode("utf-8")
+    return value.decode("utf-8")
+
+
+class CompressedText(TypeDecorator):
+    """
+    Text stored zlib-compressed (with a preset dictionary) in a binary column.
+    Python code reads and writes plain str; combine with deferred() so the
+    blob is only fetched and decompressed when the attribute is accessed.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+    FORMAT = _ZLIB_V1
+
+    def process_bind_param(self, value: Optional[str], dialect) -> Optional[bytes]:
+        if value is None:
+            return None
+        return compress_text(value)
+
+    def process_result_value(self, value, dialect) -> Optional[str]:
+        if value is None:
+            return None
+        return decompress_text(value)
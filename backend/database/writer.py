@@ -0,0 +1,116 @@
+import asyncio
+import logging
+import os
+from typing import List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+from .db import AsyncSessionLocal, SQLITE_TUNED
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+# Serialize inserts through one writer task (on by default in tuned SQLite mode)
+DB_WRITE_QUEUE = os.getenv("DB_WRITE_QUEUE", str(SQLITE_TUNED)).lower() == "true"
+DB_WRITE_BATCH_MAX = int(os.getenv("DB_WRITE_BATCH_MAX", "100"))
+
+
+class DatabaseWriter:
+    """
+    Single writer for new rows.
+
+    SQLite allows one writer at a time, so concurrent commits from request
+    handlers queue on the database lock and each pays for its own fsync.
+    Here all inserts go through one task: whatever queued up while the
+    previous commit was running is committed together in one transaction.
+    If a grouped commit fails, its entries are retried one by one so a
+    bad row only fails its own caller.
+    """
+
+    def __init__(self, enabled: bool, batch_max: int):
+        self.enabled = enabled
+        self.batch_max = max(batch_max, 1)
+        self.batches = 0
+        self.rows = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        if self.enabled and self._task is None:
+            self._queue = asyncio.Queue()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Commit everything still queued, then stop the writer."""
+        if self._task is None:
+            return
+        await self._queue.join()
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def add(self, *objects) -> None:
+        """Insert the given ORM objects; returns once they are committed."""
+        if self._task is None:
+            await self._commit(list(objects))
+            return
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((list(objects), future))
+        await future
+
+    async def _commit(self, objects: List) -> None:
+        async with AsyncSessionLocal() as db:
+            db.add_all(objects)
+            await db.commit()
+
+    async def _run(self) -> None:
+        while True:
+            batch: List[Tuple[List, asyncio.Future]] = [await self._queue.get()]
+            while len(batch) < self.batch_max and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                await self._write(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _write(self, batch: List[Tuple[List, asyncio.Future]]) -> None:
+        try:
+            await self._commit([obj for objects, _ in batch for obj in objects])
+        except Exception as e:
+            if len(batch) == 1:
+                self._resolve(batch[0][1], e)
+                return
+            logger.warning(f"Grouped commit of {len(batch)} writes failed, retrying individually: {str(e)}")
+            for objects, future in batch:
+                try:
+                    await self._commit(objects)
+                except Exception as e:
+                    self._resolve(future, e)
+                else:
+                    self._resolve(future)
+            return
+        self.batches += 1
+        self.rows += sum(len(objects) for objects, _ in batch)
+        for _, future in batch:
+            self._resolve(future)
+
+    @staticmethod
+    def _resolve(future: asyncio.Future, error: Optional[Exception] = None) -> None:
+        if future.done():
+            return
+        if error is None:
+            future.set_result(None)
+        else:
+            future.set_exception(error)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "batches": self.batches,
+            "rows": self.rows,
+        }
+
+
+db_writer = DatabaseWriter(DB_WRITE_QUEUE, DB_WRITE_BATCH_MAX)
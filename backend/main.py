@@ -1,43 +1,108 @@
 # main.py
 
-from fastapi import FastAPI, HTTPException, Depends, UploadFile, File
+from fastapi import FastAPI, HTTPException, Depends, UploadFile, File, Header, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse, Response
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only, undefer
+from typing import List, Optional
 import logging
+import base64
+import json
 import os
-import tempfile
 import asyncio
 from contextlib import asynccontextmanager
+from datetime import datetime
 from dotenv import load_dotenv
-from io import BytesIO
 
 from models.schemas import (
     JobDescriptionInput, 
+    BatchTailorRequest,
     TailoredResumeResponse,
+    JobSubmittedResponse,
+    JobStatusResponse,
     ApplicationCreate,
     ApplicationResponse,
+    ApplicationSearchResult,
     EmailDraftRequest,
     EmailDraftResponse
 )
-from database.db import get_db, init_db
-from database.models import Application, UserResume
-from services.resume_parser import parse_resume, extract_email_from_text
-from services.openai_service import tailor_resume_content, generate_email_draft, extract_keywords
-from services.pdf_service import html_to_pdf, generate_preview_html
+from database.db import get_db, init_db, close_db
+from database.writer import db_writer
+from database.search import search_applications
+from database.models import Application, UserResume, TailorJob
+from services.resume_parser import parse_resume, extract_email_from_text, normalize_resume_text, shutdown_parse_pool
+from services.tokens import count_tokens
+from services.uploads import UploadSizeLimit, UploadTooLarge, hash_upload
+from services.openai_service import (
+    stream_tailor_resume_content,
+    generate_email_draft,
+    get_client,
+    close_client,
+    openai_breaker
+)
+from services.pdf_service import generate_preview_html
+from services.pdf_pool import pdf_pool, PDFPoolSaturated, PDFRenderTimeout
+from services.pdf_cache import pdf_cache, pdf_cache_key
+from services.llm_cache import llm_cache
+from services.tailor_service import tailor_for_job
+from services.section_tailor import TAILOR_MODE, stream_tailor_sections
+from services.resilience import CircuitOpenError
+from services.job_queue import tailor_queue
+from services.keyword_extractor import extract_job_keywords, keyword_extractor
+from services.startup import BackgroundWarmUp, WARMUP_BACKGROUND, import_modules, profile_imports
+from services.metrics import RequestMetrics, install_trace_logging, registry, stage, timed
+from services.rate_limiter import openai_limiter
 
 load_dotenv()
 logging.basicConfig(level=logging.INFO)
+install_trace_logging()
 logger = logging.getLogger(__name__)
 
+TAILOR_BATCH_CONCURRENCY = int(os.getenv("TAILOR_BATCH_CONCURRENCY", "5"))
+TAILOR_BATCH_MAX_JOBS = int(os.getenv("TAILOR_BATCH_MAX_JOBS", "100"))
+
+async def _warm_pdf_pool():
+    await pdf_pool.warm_up()
+    logger.info(f"PDF render pool ready ({pdf_pool.workers} workers)")
+
+
+async def _warm_openai():
+    await asyncio.to_thread(import_modules, ["httpx", "openai"])
+    get_client()
+
+
+warmup = BackgroundWarmUp()
+warmup.add("openai", _warm_openai)
+warmup.add("parsers", lambda: asyncio.to_thread(import_modules, ["PyPDF2", "docx"]))
+warmup.add("tokenizer", lambda: asyncio.to_thread(count_tokens, "warm up"))
+warmup.add("keyword_corpus", keyword_extractor.load_corpus)
+warmup.add("pdf_pool", _warm_pdf_pool)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
-    init_db()
+    await init_db()
     logger.info("Database initialized")
+    await db_writer.start()
+    await tailor_queue.start()
+    # Everything else is only needed by the first request that uses it
+    if WARMUP_BACKGROUND:
+        warmup.start()
+    else:
+        await warmup.run()
     yield
-    # Shutdown (if any cleanup is needed in future)
+    # Shutdown
+    await warmup.stop()
+    await tailor_queue.stop()
+    await db_writer.stop()
+    await close_client()
+    pdf_pool.shutdown()
+    shutdown_parse_pool()
+    await close_db()
 
 
 app = FastAPI(title="Resume Tailor Pro API", version="1.0.0", lifespan=lifespan)
@@ -49,13 +114,18 @@ origins = [
     "http://localhost:3000",  # Your React app's URL
     # Add any other origins if needed
 ]
+# Added before CORS so that CORS wraps (and adds headers to) its 413s
+app.add_middleware(UploadSizeLimit, paths=["/api/upload-resume"])
 app.add_middleware(
     CORSMiddleware,
     allow_origins=os.getenv("CORS_ORIGINS", "*").split(","),
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor", "X-Next-Offset", "X-Request-ID"],
 )
+# Outermost, so its timings and in-flight counts cover every other layer
+app.add_middleware(RequestMetrics)
 
 # (Database initialization handled by lifespan handler)
 
@@ -67,10 +137,19 @@ async def root():
         "status": "running"
     }
 
+@app.get("/api/health")
+async def health():
+    """Liveness: answers as soon as the app serves; warm_up shows what is still loading."""
+    return {"status": "ok", "warm_up": warmup.stats()}
+
+async def _latest_resume(db: AsyncSession) -> Optional[UserResume]:
+    result = await db.execute(select(UserResume).order_by(UserResume.id.desc()).limit(1))
+    return result.scalars().first()
+
 @app.post("/api/upload-resume")
 async def upload_resume(
     file: UploadFile = File(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Upload and parse user's base resume"""
     try:
@@ -78,27 +157,62 @@ async def upload_resume(
         if file_type not in ["pdf", "docx"]:
             raise HTTPException(400, "Only PDF and DOCX files are supported")
         
-        # Use system temp directory (cross-platform)
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = os.path.join(temp_dir, file.filename)
-            with open(temp_path, "wb") as f:
-                f.write(await file.read())
-            
-            content = parse_resume(temp_path, file_type)
-            
-            resume = UserResume(
-                original_content=content,
-                file_type=file_type
-            )
-            db.add(resume)
-            db.commit()
+        # The upload is already spooled to a temp file; hash it in chunks
+        # and parse straight from it rather than loading it into memory
+        with stage("upload", "hash"):
+            content_hash, _ = await hash_upload(file)
+        
+        with stage("upload", "db_query"):
+            latest = await _latest_resume(db)
+        if latest and latest.content_hash == content_hash:
+            # Same file as the current resume: nothing to do
+            resume, deduplicated = latest, True
+        else:
+            with stage("upload", "db_query"):
+                previous = (await db.execute(
+                    select(UserResume).where(UserResume.content_hash == content_hash).limit(1)
+                )).scalars().first()
+            if previous:
+                # Seen before: reuse the parsed artifacts, but make it the latest resume
+                resume = UserResume(
+                    original_content=previous.original_content,
+                    file_type=previous.file_type,
+                    content_hash=content_hash,
+                    normalized_content=previous.normalized_content,
+                    token_count=previous.token_count
+                )
+                deduplicated = True
+            else:
+                # Parsing is CPU-bound, keep it off the event loop
+                with stage("upload", f"parse_{file_type}"):
+                    content = await run_in_threadpool(parse_resume, file.file, file_type)
+                
+                with stage("upload", "normalize"):
+                    normalized = normalize_resume_text(content)
+                    token_count = count_tokens(normalized)
+                resume = UserResume(
+                    original_content=content,
+                    file_type=file_type,
+                    content_hash=content_hash,
+                    normalized_content=normalized,
+                    token_count=token_count
+                )
+                deduplicated = False
+            with stage("upload", "commit"):
+                await db_writer.add(resume)
         
         return {
             "message": "Resume uploaded successfully",
             "resume_id": resume.id,
-            "preview": content[:500] + "..."
+            "preview": resume.original_content[:500] + "...",
+            "deduplicated": deduplicated,
+            "token_count": resume.token_count
         }
     
+    except HTTPException:
+        raise
+    except UploadTooLarge as e:
+        raise HTTPException(413, str(e))
     except Exception as e:
         logger.error(f"Upload error: {str(e)}")
         raise HTTPException(500, str(e))
@@ -106,72 +220,273 @@ async def upload_resume(
 @app.post("/api/tailor", response_model=TailoredResumeResponse)
 async def tailor_resume(
     job_input: JobDescriptionInput,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Tailor resume based on job description"""
     try:
-        user_resume = db.query(UserResume).order_by(UserResume.id.desc()).first()
+        with stage("tailor", "db_query"):
+            user_resume = await _latest_resume(db)
         if not user_resume:
             raise HTTPException(400, "Please upload your resume first")
         
-        # Extract email from JD
-        email_detected = extract_email_from_text(job_input.job_description)
-        
-        # Extract keywords for highlighting
-        logger.info("Extracting keywords from job description...")
-        keywords = extract_keywords(job_input.job_description)
-        logger.info(f"Extracted keywords: {keywords}")
-        
-        # Tailor resume using OpenAI
-        logger.info("Tailoring resume with AI...")
-        result = tailor_resume_content(
-            user_resume.original_content,
+        payload, application = await tailor_for_job(
+            user_resume.prompt_content,
             job_input.job_description
         )
+        with stage("tailor", "commit"):
+            await db_writer.add(application)
         
-        # Generate preview HTML (with keywords highlighted)
-        preview_html = generate_preview_html(result["html_content"], keywords)
-        
-        # Save application with keywords
-        application = Application(
-            company=result["company"],
-            job_title=result["job_title"],
-            job_description=job_input.job_description,
-            tailored_resume=result["html_content"],
-            status="Ready"
-        )
-        db.add(application)
-        db.commit()
-        
-        return {
-            "job_title": result["job_title"],
-            "company": result["company"],
-            "html_content": preview_html,
-            "email_detected": email_detected,
-            "keywords": keywords 
-        }
+        return payload
     
+    except CircuitOpenError as e:
+        raise HTTPException(503, str(e), headers={"Retry-After": f"{e.retry_after:.0f}"})
     except Exception as e:
         logger.error(f"Tailor error: {str(e)}")
         raise HTTPException(500, str(e))
 
+def _sse(event: str, data: dict) -> str:
+    """Format one Server-Sent Events message"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@app.post("/api/tailor/stream")
+async def tailor_resume_stream(
+    job_input: JobDescriptionInput,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Streaming variant of /api/tailor (Server-Sent Events).
+    Emits `field` events for job_title/company, `html` events with raw
+    html_content fragments as they are generated, and a final `done` event
+    carrying the same payload /api/tailor returns (or an `error` event).
+    """
+    with stage("tailor_stream", "db_query"):
+        user_resume = await _latest_resume(db)
+    if not user_resume:
+        raise HTTPException(400, "Please upload your resume first")
+
+    email_detected = extract_email_from_text(job_input.job_description)
+
+    async def event_stream():
+        keywords_task = asyncio.create_task(
+            timed("tailor_stream", "keywords", extract_job_keywords(job_input.job_description))
+        )
+        try:
+            result = None
+            if TAILOR_MODE == "sections":
+                events = stream_tailor_sections(
+                    user_resume.prompt_content,
+                    job_input.job_description,
+                    keywords_task
+                )
+            else:
+                events = stream_tailor_resume_content(
+                    user_resume.prompt_content,
+                    job_input.job_description
+                )
+            with stage("tailor_stream", "llm_tailor"):
+                async for event in events:
+                    if event["type"] == "field":
+                        yield _sse("field", {"name": event["name"], "value": event["value"]})
+                    elif event["type"] == "html":
+                        yield _sse("html", {"chunk": event["chunk"]})
+                    else:
+                        result = event["result"]
+
+            keywords = await keywords_task
+            with stage("tailor_stream", "highlight"):
+                preview_html = generate_preview_html(result["html_content"], keywords)
+
+            application = Application(
+                company=result["company"],
+                job_title=result["job_title"],
+                job_description=job_input.job_description,
+                tailored_resume=result["html_content"],
+                status="Ready"
+            )
+            with stage("tailor_stream", "commit"):
+                await db_writer.add(application)
+
+            yield _sse("done", {
+                "job_title": result["job_title"],
+                "company": result["company"],
+                "html_content": preview_html,
+                "email_detected": email_detected,
+                "keywords": keywords
+            })
+
+        except Exception as e:
+            logger.error(f"Tailor stream error: {str(e)}")
+            yield _sse("error", {"detail": str(e)})
+        finally:
+            keywords_task.cancel()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against our ETag"""
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or any(tag.removeprefix("W/") == etag for tag in tags)
+
+@app.post("/api/tailor/batch")
+async def tailor_resume_batch(
+    batch: BatchTailorRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Tailor the latest resume against several job descriptions (Server-Sent Events).
+    Jobs run concurrently, at most TAILOR_BATCH_CONCURRENCY at a time, on top
+    of the shared adaptive OpenAI rate limiter. A `result` or `error` event is
+    emitted per job as it completes (tagged with its index in the request);
+    all successful applications are then inserted in one transaction and a
+    final `done` event reports their ids.
+    """
+    if not batch.jobs:
+        raise HTTPException(400, "No job descriptions provided")
+    if len(batch.jobs) > TAILOR_BATCH_MAX_JOBS:
+        raise HTTPException(400, f"At most {TAILOR_BATCH_MAX_JOBS} job descriptions per batch")
+
+    user_resume = await _latest_resume(db)
+    if not user_resume:
+        raise HTTPException(400, "Please upload your resume first")
+    original_content = user_resume.prompt_content
+    semaphore = asyncio.Semaphore(TAILOR_BATCH_CONCURRENCY)
+
+    async def run_job(index: int, job_input: JobDescriptionInput):
+        async with semaphore:
+            try:
+                payload, application = await tailor_for_job(original_content, job_input.job_description)
+                return index, payload, application, None
+            except Exception as e:
+                logger.error(f"Batch tailor error (job {index}): {str(e)}")
+                return index, None, None, str(e)
+
+    async def event_stream():
+        tasks = [asyncio.create_task(run_job(i, job)) for i, job in enumerate(batch.jobs)]
+        applications = []
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                index, payload, application, error = await next_done
+                if error is not None:
+                    yield _sse("error", {"index": index, "detail": error})
+                    continue
+                applications.append(application)
+                yield _sse("result", {"index": index, **payload})
+
+            application_ids = []
+            if applications:
+                await db_writer.add(*applications)
+                application_ids = [application.id for application in applications]
+
+            yield _sse("done", {
+                "succeeded": len(applications),
+                "failed": len(tasks) - len(applications),
+                "application_ids": application_ids
+            })
+
+        except Exception as e:
+            logger.error(f"Batch tailor error: {str(e)}")
+            yield _sse("error", {"detail": str(e)})
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.post("/api/jobs", response_model=JobSubmittedResponse, status_code=202)
+async def submit_tailor_job(
+    job_input: JobDescriptionInput,
+    db: AsyncSession = Depends(get_db)
+):
+    """Queue a background tailoring job; poll GET /api/jobs/{job_id} for the result"""
+    user_resume = (await db.execute(
+        select(UserResume.id).order_by(UserResume.id.desc()).limit(1)
+    )).first()
+    if not user_resume:
+        raise HTTPException(400, "Please upload your resume first")
+
+    job = await tailor_queue.submit(db, user_resume.id, job_input.job_description)
+    return {"job_id": job.id, "application_id": job.application_id, "status": job.status}
+
+@app.get("/api/jobs/{job_id}", response_model=JobStatusResponse)
+async def get_tailor_job(job_id: int, db: AsyncSession = Depends(get_db)):
+    """Status of a background tailoring job, with the tailored resume once Ready"""
+    job = await db.get(TailorJob, job_id)
+    if not job:
+        raise HTTPException(404, "Job not found")
+
+    result = None
+    if job.status == "Ready":
+        application = await db.get(
+            Application, job.application_id, options=[undefer(Application.tailored_resume)]
+        )
+        if application:
+            extras = json.loads(job.result or "{}")
+            keywords = extras.get("keywords") or []
+            result = {
+                "job_title": application.job_title,
+                "company": application.company,
+                "html_content": generate_preview_html(application.tailored_resume, keywords),
+                "email_detected": extras.get("email_detected"),
+                "keywords": keywords
+            }
+
+    return {
+        "job_id": job.id,
+        "application_id": job.application_id,
+        "status": job.status,
+        "attempts": job.attempts,
+        "error": job.error,
+        "result": result
+    }
+
 @app.post("/api/generate-pdf")
-async def generate_pdf_endpoint(request: dict):
-    """Generate PDF from HTML with keyword highlighting"""
+async def generate_pdf_endpoint(
+    request: dict,
+    if_none_match: Optional[str] = Header(None)
+):
+    """
+    Generate PDF from HTML with keyword highlighting.
+    Rendered PDFs are cached by a digest of the HTML and keywords, which is
+    also returned as the ETag; a matching If-None-Match gets a 304.
+    """
     try:
         html_content = request.get("html")
         keywords = request.get("keywords", [])
         
+        cache_key = pdf_cache_key(html_content, keywords)
+        etag = f'"{cache_key}"'
+        headers = {
+            "ETag": etag,
+            "Cache-Control": "private, no-cache",
+            "Content-Disposition": "attachment; filename=resume.pdf"
+        }
+        if _etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+
         logger.info(f"Generating PDF with {len(keywords)} keywords to highlight")
         
-        pdf_bytes = html_to_pdf(html_content, keywords)
-        
-        return StreamingResponse(
-            BytesIO(pdf_bytes),
-            media_type="application/pdf",
-            headers={"Content-Disposition": "attachment; filename=resume.pdf"}
+        pdf_bytes = await pdf_cache.get_or_render(
+            cache_key,
+            lambda: timed("pdf", "render", pdf_pool.render(html_content, keywords))
         )
+        
+        return Response(content=pdf_bytes, media_type="application/pdf", headers=headers)
     
+    except PDFPoolSaturated as e:
+        raise HTTPException(503, str(e), headers={"Retry-After": "1"})
+    except PDFRenderTimeout as e:
+        logger.error(f"PDF error: {str(e)}")
+        raise HTTPException(504, str(e))
     except Exception as e:
         logger.error(f"PDF error: {str(e)}")
         raise HTTPException(500, str(e))
@@ -180,34 +495,147 @@ async def generate_pdf_endpoint(request: dict):
 async def create_email_draft(request: EmailDraftRequest):
     """Generate email draft"""
     try:
-        draft = generate_email_draft(
-            request.job_title,
-            request.company,
-            request.recipient_email
-        )
+        with stage("email", "llm_email"):
+            draft = await generate_email_draft(
+                request.job_title,
+                request.company,
+                request.recipient_email
+            )
         return draft
     
+    except CircuitOpenError as e:
+        raise HTTPException(503, str(e), headers={"Retry-After": f"{e.retry_after:.0f}"})
     except Exception as e:
         logger.error(f"Email draft error: {str(e)}")
         raise HTTPException(500, str(e))
 
+@app.get("/api/cache/stats")
+async def get_cache_stats():
+    """LLM response and rendered-PDF cache counters"""
+    return {"llm": llm_cache.stats(), "pdf": pdf_cache.stats()}
+
+def _collect_service_stats():
+    """Cache, pool and queue counters already kept by the services, read at scrape time"""
+    caches = {"llm": llm_cache.stats(), "pdf": pdf_cache.stats()}
+    limiter = openai_limiter.stats()
+    yield ("resume_cache_hits_total", "Cache hits", "counter",
+           [({"cache": name}, stats["hits"]) for name, stats in caches.items()])
+    yield ("resume_cache_misses_total", "Cache misses", "counter",
+           [({"cache": name}, stats["misses"]) for name, stats in caches.items()])
+    yield ("resume_cache_entries", "Entries currently cached", "gauge", [
+        ({"cache": "llm"}, caches["llm"]["entries"]),
+        ({"cache": "pdf"}, caches["pdf"]["memory_entries"] + caches["pdf"]["disk_entries"]),
+    ])
+    yield ("resume_pdf_renders_in_flight", "PDF renders queued or running", "gauge",
+           [({}, pdf_pool.stats()["in_flight"])])
+    yield ("resume_openai_limiter_active", "OpenAI requests holding a limiter slot", "gauge",
+           [({}, limiter["active"])])
+    yield ("resume_openai_limiter_waiting", "OpenAI requests waiting for a limiter slot", "gauge",
+           [({}, limiter["waiting"])])
+    yield ("resume_openai_circuit_open", "1 while the OpenAI circuit breaker is not closed", "gauge",
+           [({}, int(openai_breaker.state != "closed"))])
+    yield ("resume_db_write_queue_depth", "Rows waiting for the group-commit writer", "gauge",
+           [({}, db_writer.stats()["queued"])])
+
+registry.add_collector(_collect_service_stats)
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus text exposition of request, stage, OpenAI and cache metrics"""
+    return Response(registry.render(), media_type="text/plain; version=0.0.4")
+
+def _encode_cursor(created_at: datetime, app_id: int) -> str:
+    raw = json.dumps([created_at.isoformat(), app_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def _decode_cursor(cursor: str):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, app_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(app_id)
+    except (ValueError, TypeError):
+        raise HTTPException(400, "Invalid cursor")
+
 @app.get("/api/applications", response_model=List[ApplicationResponse])
-async def get_applications(db: Session = Depends(get_db)):
-    """Get all applications"""
-    applications = db.query(Application).order_by(Application.created_at.desc()).all()
+async def get_applications(
+    response: Response,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    company: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get applications, newest first, one page at a time.
+    Pass the X-Next-Cursor response header back as `cursor` for the next
+    page; the header is absent on the last page.
+    """
+    query = select(Application).options(load_only(
+        Application.id,
+        Application.company,
+        Application.job_title,
+        Application.status,
+        Application.created_at
+    ))
+    if status:
+        query = query.where(Application.status == status)
+    if company:
+        query = query.where(Application.company == company)
+    if cursor:
+        created_at, app_id = _decode_cursor(cursor)
+        query = query.where(tuple_(Application.created_at, Application.id) < tuple_(created_at, app_id))
+
+    query = query.order_by(Application.created_at.desc(), Application.id.desc()).limit(limit + 1)
+    applications = (await db.execute(query)).scalars().all()
+    if len(applications) > limit:
+        applications = applications[:limit]
+        last = applications[-1]
+        response.headers["X-Next-Cursor"] = _encode_cursor(last.created_at, last.id)
     return applications
 
+@app.get("/api/applications/search", response_model=List[ApplicationSearchResult])
+async def search_applications_endpoint(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=10000),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Full-text search over company, job title and job description, best
+    match first. The last word matches as a prefix. Pass the X-Next-Offset
+    response header back as `offset` for the next page; the header is
+    absent on the last page.
+    """
+    with stage("search", "query"):
+        rows = await search_applications(db, q, limit + 1, offset)
+    if rows is None:
+        raise HTTPException(503, "Search is not available on this database")
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Offset"] = str(offset + limit)
+    return [row._mapping for row in rows]
+
 @app.delete("/api/applications/{app_id}")
-async def delete_application(app_id: int, db: Session = Depends(get_db)):
+async def delete_application(app_id: int, db: AsyncSession = Depends(get_db)):
     """Delete an application"""
-    app = db.query(Application).filter(Application.id == app_id).first()
+    app = await db.get(Application, app_id)
     if not app:
         raise HTTPException(404, "Application not found")
     
-    db.delete(app)
-    db.commit()
+    await db.delete(app)
+    await db.commit()
     return {"message": "Application deleted"}
 
 if __name__ == "__main__":
+    import argparse
+    import sys
     import uvicorn
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--profile-imports", action="store_true", help="report import time of this module and exit")
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+    if args.profile_imports:
+        sys.exit(profile_imports("main", args.top))
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
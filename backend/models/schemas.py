@@ -7,6 +7,9 @@ class JobDescriptionInput(BaseModel):
     job_description: str
     job_url: Optional[str] = None
 
+class BatchTailorRequest(BaseModel):
+    jobs: List[JobDescriptionInput]
+
 class TailoredResumeResponse(BaseModel):
     job_title: str
     company: str
@@ -14,6 +17,19 @@ class TailoredResumeResponse(BaseModel):
     email_detected: Optional[str] = None
     keywords: Optional[List[str]] = None 
     
+class JobSubmittedResponse(BaseModel):
+    job_id: int
+    application_id: int
+    status: str
+
+class JobStatusResponse(BaseModel):
+    job_id: int
+    application_id: int
+    status: str
+    attempts: int
+    error: Optional[str] = None
+    result: Optional[TailoredResumeResponse] = None
+    
 class ApplicationCreate(BaseModel):
     company: str
     job_title: str
@@ -31,6 +47,9 @@ class ApplicationResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class ApplicationSearchResult(ApplicationResponse):
+    score: float  # relevance, higher is better
+
 class EmailDraftRequest(BaseModel):
     job_title: str
     company: str
@@ -39,4 +58,40 @@ class EmailDraftRequest(BaseModel):
 class EmailDraftResponse(BaseModel):
     subject: str
     body: str
-    recipient_email: Optional[str] = None
\ No newline at end of file
+    recipient_email: Optional[str] = None
+
+# Replies expected from the model (sent as JSON-schema structured outputs)
+
+class KeywordsReply(BaseModel):
+    keywords: List[str]
+
+    class Config:
+        extra = "forbid"
+
+class TailoredResumeReply(BaseModel):
+    job_title: str
+    company: str
+    html_content: str
+
+    class Config:
+        extra = "forbid"
+
+class TailoredSectionReply(BaseModel):
+    html_content: str
+
+    class Config:
+        extra = "forbid"
+
+class JobMetaReply(BaseModel):
+    job_title: str
+    company: str
+
+    class Config:
+        extra = "forbid"
+
+class EmailDraftReply(BaseModel):
+    subject: str
+    body: str
+
+    class Config:
+        extra = "forbid"
@@ -0,0 +1,257 @@
+# backend/services/job_queue.py
+
+import asyncio
+import json
+import logging
+import os
+import random
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from dotenv import load_dotenv
+from sqlalchemy import or_, and_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
+
+from database.db import AsyncSessionLocal
+from database.models import Application, TailorJob, UserResume
+from services.resilience import CircuitOpenError
+from services.tailor_service import tailor_for_job
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+TAILOR_WORKERS = int(os.getenv("TAILOR_WORKERS", "4"))
+TAILOR_POLL_INTERVAL = float(os.getenv("TAILOR_POLL_INTERVAL", "1.0"))
+# A Running job whose worker has been silent this long is picked up again
+TAILOR_JOB_LEASE_SECONDS = int(os.getenv("TAILOR_JOB_LEASE_SECONDS", "300"))
+TAILOR_JOB_MAX_ATTEMPTS = int(os.getenv("TAILOR_JOB_MAX_ATTEMPTS", "3"))
+# Failed jobs wait base * 2^(attempt - 1) seconds (with jitter, at most cap) before the next attempt
+TAILOR_JOB_RETRY_BASE = float(os.getenv("TAILOR_JOB_RETRY_BASE", "5"))
+TAILOR_JOB_RETRY_CAP = float(os.getenv("TAILOR_JOB_RETRY_CAP", "300"))
+
+
+class TailorJobQueue:
+    """
+    Background tailoring backed by the tailor_jobs table.
+
+    Jobs are claimed with a conditional UPDATE, so several app processes can
+    share the same table. Submitting wakes local workers immediately; jobs
+    from other processes are found by polling.
+    """
+
+    def __init__(self, workers: int, poll_interval: float, lease_seconds: int, max_attempts: int,
+                 retry_base: float, retry_cap: float):
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.retry_cap = retry_cap
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+
+    async def submit(self, db: AsyncSession, resume_id: int, job_description: str) -> TailorJob:
+        """Create a Pending application and its queue entry."""
+        application = Application(
+            company="",
+            job_title="",
+            job_description=job_description,
+            tailored_resume="",
+            status="Pending"
+        )
+        db.add(application)
+        await db.flush()
+        job = TailorJob(application_id=application.id, resume_id=resume_id, status="Pending")
+        db.add(job)
+        await db.commit()
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return job
+
+    async def start(self) -> None:
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _worker(self) -> None:
+        while True:
+            try:
+                job_id = await self._claim()
+            except Exception as e:
+                # e.g. "database is locked"; the worker must outlive it
+                logger.error(f"Claiming a tailor job failed: {str(e)}")
+                await asyncio.sleep(self.poll_interval)
+                continue
+            if job_id is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            try:
+                await self._run(job_id)
+            except asyncio.CancelledError:
+                await self._requeue(job_id)
+                raise
+            except Exception as e:
+                logger.error(f"Tailor job {job_id} crashed: {str(e)}")
+
+    async def _claim(self) -> Optional[int]:
+        """Atomically move the oldest runnable job to Running; returns its id."""
+        async with AsyncSessionLocal() as db:
+            now = datetime.utcnow()
+            expired = and_(
+                TailorJob.status == "Running",
+                TailorJob.started_at < now - timedelta(seconds=self.lease_seconds)
+            )
+            await self._fail_expired(db, expired, now)
+            runnable = or_(
+                and_(
+                    TailorJob.status == "Pending",
+                    or_(TailorJob.run_after.is_(None), TailorJob.run_after <= now)
+                ),
+                and_(expired, TailorJob.attempts < self.max_attempts)
+            )
+            while True:
+                job = (await db.execute(
+                    select(TailorJob.id, TailorJob.application_id, TailorJob.started_at)
+                    .where(runnable).order_by(TailorJob.id).limit(1)
+                )).first()
+                if job is None:
+                    return None
+                # Compare-and-set on started_at so two workers never claim the same job
+                same_lease = TailorJob.started_at.is_(None) if job.started_at is None \
+                    else TailorJob.started_at == job.started_at
+                claimed = (await db.execute(
+                    update(TailorJob)
+                    .where(TailorJob.id == job.id, runnable, same_lease)
+                    .values(status="Running", started_at=now, attempts=TailorJob.attempts + 1)
+                )).rowcount
+                if not claimed:
+                    await db.rollback()
+                    continue
+                await db.execute(
+                    update(Application).where(Application.id == job.application_id).values(status="Running")
+                )
+                await db.commit()
+                return job.id
+
+    async def _fail_expired(self, db: AsyncSession, expired, now: datetime) -> None:
+        """Fail jobs whose lease ran out on their last attempt, so a job that keeps crashing its worker stops."""
+        jobs = (await db.execute(
+            select(TailorJob.id, TailorJob.application_id)
+            .where(expired, TailorJob.attempts >= self.max_attempts)
+        )).all()
+        for job in jobs:
+            failed = (await db.execute(
+                update(TailorJob)
+                .where(TailorJob.id == job.id, expired)
+                .values(status="Failed", error="The job's worker stopped responding", finished_at=now)
+            )).rowcount
+            if failed:
+                logger.error(f"Tailor job {job.id} failed: out of attempts after its lease expired")
+                await db.execute(
+                    update(Application).where(Application.id == job.application_id).values(status="Failed")
+                )
+        if jobs:
+            await db.commit()
+
+    async def _run(self, job_id: int) -> None:
+        async with AsyncSessionLocal() as db:
+            job = await db.get(TailorJob, job_id)
+            if job is None:
+                return
+            application = await db.get(
+                Application, job.application_id, options=[undefer(Application.job_description)]
+            )
+            resume = await db.get(UserResume, job.resume_id)
+            if application is None or resume is None:
+                job.status = "Failed"
+                job.error = "Application or resume no longer exists"
+                job.finished_at = datetime.utcnow()
+                await db.commit()
+                return
+            original_content = resume.prompt_content
+            job_description = application.job_description
+
+        try:
+            payload, tailored = await tailor_for_job(original_content, job_description)
+        except CircuitOpenError as e:
+            # Nothing was attempted, so this does not use up one of the job's attempts
+            logger.warning(f"Tailor job {job_id} postponed: {str(e)}")
+            await self._finish_failed(job_id, str(e), counted=False, retry_after=e.retry_after)
+            return
+        except Exception as e:
+            logger.error(f"Tailor job {job_id} failed: {str(e)}")
+            await self._finish_failed(job_id, str(e))
+            return
+
+        async with AsyncSessionLocal() as db:
+            job = await db.get(TailorJob, job_id)
+            if job is None:
+                # Deleted along with its application while it was running
+                return
+            application = await db.get(Application, job.application_id)
+            if application is not None:
+                application.company = tailored.company
+                application.job_title = tailored.job_title
+                application.tailored_resume = tailored.tailored_resume
+                application.status = "Ready"
+            job.status = "Ready"
+            job.error = None
+            job.result = json.dumps({
+                "keywords": payload["keywords"],
+                "email_detected": payload["email_detected"]
+            })
+            job.finished_at = datetime.utcnow()
+            await db.commit()
+
+    def _retry_delay(self, attempts: int) -> float:
+        delay = min(self.retry_cap, self.retry_base * 2 ** max(attempts - 1, 0))
+        return delay * random.uniform(0.5, 1.0)
+
+    async def _finish_failed(self, job_id: int, error: str, counted: bool = True, retry_after: float = 0.0) -> None:
+        """Put a failed job back with a backoff delay, or fail it for good once out of attempts."""
+        async with AsyncSessionLocal() as db:
+            job = await db.get(TailorJob, job_id)
+            if job is None:
+                return
+            if not counted:
+                job.attempts -= 1
+            retry = job.attempts < self.max_attempts
+            job.status = "Pending" if retry else "Failed"
+            job.error = error
+            if retry:
+                delay = max(retry_after, self._retry_delay(job.attempts))
+                job.run_after = datetime.utcnow() + timedelta(seconds=delay)
+            else:
+                job.finished_at = datetime.utcnow()
+            await db.execute(
+                update(Application).where(Application.id == job.application_id).values(status=job.status)
+            )
+            await db.commit()
+
+    async def _requeue(self, job_id: int) -> None:
+        """Hand a job interrupted by shutdown back to the queue."""
+        async with AsyncSessionLocal() as db:
+            job = await db.get(TailorJob, job_id)
+            if job is not None and job.status == "Running":
+                job.status = "Pending"
+                job.attempts -= 1
+                await db.execute(
+                    update(Application).where(Application.id == job.application_id).values(status="Pending")
+                )
+                await db.commit()
+
+
+tailor_queue = TailorJobQueue(
+    TAILOR_WORKERS, TAILOR_POLL_INTERVAL, TAILOR_JOB_LEASE_SECONDS, TAILOR_JOB_MAX_ATTEMPTS,
+    TAILOR_JOB_RETRY_BASE, TAILOR_JOB_RETRY_CAP
+)
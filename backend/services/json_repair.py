@@ -0,0 +1,99 @@
+# backend/services/json_repair.py
+
+import json
+import re
+from typing import Dict, Type
+
+from pydantic import BaseModel, ValidationError
+
+_FENCE = re.compile(r"```(?:json)?", re.IGNORECASE)
+_CLOSERS = {"{": "}", "[": "]"}
+
+
+def _extract_json_span(text: str) -> str:
+    """The first balanced {...} or [...] in text (or everything from its opening bracket)."""
+    start = next((i for i, ch in enumerate(text) if ch in _CLOSERS), None)
+    if start is None:
+        return text
+    stack = []
+    in_string = escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in _CLOSERS:
+            stack.append(_CLOSERS[ch])
+        elif stack and ch == stack[-1]:
+            stack.pop()
+            if not stack:
+                return text[start:i + 1]
+    return text[start:]
+
+
+def _drop_trailing_commas(text: str) -> str:
+    """Remove commas directly before a closing bracket, outside of strings."""
+    out = []
+    in_string = escaped = False
+    for i, ch in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == ",":
+            rest = text[i + 1:].lstrip()
+            if rest[:1] in ("}", "]"):
+                continue
+        out.append(ch)
+    return "".join(out)
+
+
+def _loads(content: str):
+    text = _FENCE.sub("", content).strip()
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        pass
+    # Prose around the JSON, raw newlines inside strings (common in HTML
+    # values) and trailing commas are the usual ways replies go wrong
+    text = _drop_trailing_commas(_extract_json_span(text))
+    try:
+        return json.loads(text, strict=False)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"reply is not valid JSON ({e.msg} at character {e.pos})")
+
+
+def parse_model_reply(content: str, model: Type[BaseModel]) -> Dict:
+    """
+    Parse a model reply into the fields of `model`, repairing common JSON
+    mistakes. Raises ValueError with a short description of what is wrong.
+    """
+    if not content or not content.strip():
+        raise ValueError("reply is empty")
+    data = _loads(content)
+    fields = list(model.model_fields)
+    # Single-field replies sometimes come back as the bare value
+    if len(fields) == 1 and not isinstance(data, dict):
+        data = {fields[0]: data}
+    if isinstance(data, dict):
+        # Extra keys are harmless; only the expected fields are kept
+        data = {key: value for key, value in data.items() if key in fields}
+    try:
+        return model.model_validate(data).model_dump()
+    except ValidationError as e:
+        problems = "; ".join(
+            f"{'.'.join(str(part) for part in error['loc']) or 'reply'}: {error['msg']}"
+            for error in e.errors()
+        )
+        raise ValueError(f"reply does not match the expected fields ({problems})")
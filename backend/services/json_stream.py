@@ -0,0 +1,134 @@
+# backend/services/json_stream.py
+
+from typing import Dict, List, Optional, Tuple
+
+_SIMPLE_ESCAPES = {'"': '"', '\\': '\\', '/': '/', 'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t'}
+
+
+class StreamingJSONObjectParser:
+    """
+    Incremental parser for a flat JSON object of string values, as returned
+    by the tailoring prompt. Text can be fed in arbitrary chunks (escape
+    sequences may be split across them); anything before the opening brace,
+    such as a markdown fence, is skipped.
+
+    `feed` returns (key, fragment, complete) events: string values are
+    reported piecewise as they are decoded, with `complete=True` on the
+    event that closes the value.
+    """
+
+    def __init__(self):
+        self.values: Dict[str, object] = {}
+        self.done = False
+        self._state = "seek_object"
+        self._key: List[str] = []
+        self._current_key: Optional[str] = None
+        self._value: List[str] = []
+        self._escape: Optional[str] = None
+        self._high_surrogate: Optional[int] = None
+        self._scalar: List[str] = []
+
+    def feed(self, chunk: str) -> List[Tuple[str, str, bool]]:
+        events: List[Tuple[str, str, bool]] = []
+        fragment: List[str] = []
+
+        for ch in chunk:
+            state = self._state
+            if state == "seek_object":
+                if ch == "{":
+                    self._state = "seek_key"
+            elif state == "seek_key":
+                if ch == '"':
+                    self._key = []
+                    self._state = "in_key"
+                elif ch == "}":
+                    self._state = "done"
+                    self.done = True
+            elif state == "in_key":
+                if self._escape is not None:
+                    self._key.append(_SIMPLE_ESCAPES.get(ch, ch))
+                    self._escape = None
+                elif ch == "\\":
+                    self._escape = ""
+                elif ch == '"':
+                    self._current_key = "".join(self._key)
+                    self._state = "seek_colon"
+                else:
+                    self._key.append(ch)
+            elif state == "seek_colon":
+                if ch == ":":
+                    self._state = "seek_value"
+            elif state == "seek_value":
+                if ch == '"':
+                    self._value = []
+                    fragment = []
+                    self._state = "in_string"
+                elif not ch.isspace():
+                    self._scalar = [ch]
+                    self._state = "in_scalar"
+            elif state == "in_string":
+                if self._escape is not None:
+                    decoded = self._decode_escape(ch)
+                    if decoded:
+                        self._value.append(decoded)
+                        fragment.append(decoded)
+                elif ch == "\\":
+                    self._escape = ""
+                elif ch == '"':
+                    value = "".join(self._value)
+                    self.values[self._current_key] = value
+                    events.append((self._current_key, "".join(fragment), True))
+                    fragment = []
+                    self._state = "seek_key"
+                else:
+                    self._value.append(ch)
+                    fragment.append(ch)
+            elif state == "in_scalar":
+                if ch in ",}":
+                    self.values[self._current_key] = _parse_scalar("".join(self._scalar).strip())
+                    self._state = "seek_key"
+                    if ch == "}":
+                        self._state = "done"
+                        self.done = True
+                else:
+                    self._scalar.append(ch)
+
+        if self._state == "in_string" and fragment:
+            events.append((self._current_key, "".join(fragment), False))
+        return events
+
+    def _decode_escape(self, ch: str) -> str:
+        """Consume one character of an escape sequence; returns decoded text once complete."""
+        if self._escape == "":
+            if ch != "u":
+                self._escape = None
+                return _SIMPLE_ESCAPES.get(ch, ch)
+            self._escape = "u"
+            return ""
+
+        self._escape += ch
+        if len(self._escape) < 5:
+            return ""
+
+        code = int(self._escape[1:], 16)
+        self._escape = None
+        if 0xD800 <= code <= 0xDBFF:
+            self._high_surrogate = code
+            return ""
+        if 0xDC00 <= code <= 0xDFFF and self._high_surrogate is not None:
+            code = 0x10000 + (self._high_surrogate - 0xD800) * 0x400 + (code - 0xDC00)
+        self._high_surrogate = None
+        return chr(code)
+
+
+def _parse_scalar(text: str):
+    if text == "true":
+        return True
+    if text == "false":
+        return False
+    if text == "null":
+        return None
+    try:
+        return float(text) if any(c in text for c in ".eE") else int(text)
+    except ValueError:
+        return text
@@ -0,0 +1,256 @@
+# backend/services/keyword_extractor.py
+
+import hashlib
+import logging
+import math
+import os
+import re
+from collections import Counter, OrderedDict
+from typing import Dict, Iterable, List, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy import event, inspect, select
+
+from database.db import AsyncSessionLocal
+from database.models import Application
+from services.openai_service import extract_keywords as extract_keywords_llm
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+# local: lexicon + TF-IDF only; llm: model only (local on failure);
+# local-first: local, calling the model only when too few terms are found
+KEYWORD_EXTRACTION_MODE = os.getenv("KEYWORD_EXTRACTION_MODE", "local-first")
+KEYWORD_MAX_TERMS = int(os.getenv("KEYWORD_MAX_TERMS", "20"))
+KEYWORD_LOCAL_MIN_TERMS = int(os.getenv("KEYWORD_LOCAL_MIN_TERMS", "8"))
+KEYWORD_CORPUS_MAX_DOCS = int(os.getenv("KEYWORD_CORPUS_MAX_DOCS", "2000"))
+
+# Canonical spelling, optionally followed by "|"-separated aliases
+SKILLS_LEXICON = [
+    # Languages
+    "Python", "Java", "JavaScript|JS", "TypeScript|TS", "C++|CPP", "C#|C Sharp", "Go|Golang",
+    "Rust", "Ruby", "PHP", "Scala", "Kotlin", "Swift", "Objective-C", "R", "MATLAB", "Perl",
+    "Haskell", "Elixir", "Erlang", "Clojure", "Dart", "Lua", "Julia", "Bash", "Shell Scripting",
+    "PowerShell", "SQL", "PL/SQL", "T-SQL", "HTML", "CSS", "Sass", "GraphQL", "Solidity",
+    # Frameworks and libraries
+    "React|React.js|ReactJS", "Angular|AngularJS", "Vue|Vue.js", "Next.js", "Nuxt", "Svelte",
+    "Redux", "Node.js|Node|NodeJS", "Express|Express.js", "NestJS", "Django", "Flask", "FastAPI",
+    "Spring|Spring Boot", "Hibernate", "Ruby on Rails|Rails", "Laravel", ".NET|ASP.NET|.NET Core",
+    "Tailwind CSS|Tailwind", "Bootstrap", "jQuery", "React Native", "Flutter", "SwiftUI",
+    "Jetpack Compose", "Celery", "gRPC", "REST|RESTful|REST APIs|RESTful APIs", "Microservices",
+    "Pandas", "NumPy", "SciPy", "scikit-learn|sklearn", "TensorFlow", "PyTorch", "Keras",
+    "Hugging Face|HuggingFace", "LangChain", "LlamaIndex", "OpenCV", "XGBoost", "spaCy", "NLTK",
+    "Spark|Apache Spark|PySpark", "Hadoop", "Kafka|Apache Kafka", "Airflow|Apache Airflow",
+    "Flink", "dbt", "Beam", "RabbitMQ", "Jest", "Cypress", "Playwright", "Selenium", "pytest",
+    "JUnit", "Storybook", "Webpack", "Vite",
+    # Data stores
+    "PostgreSQL|Postgres", "MySQL", "SQLite", "MongoDB", "Redis", "Elasticsearch",
+    "OpenSearch", "Cassandra", "DynamoDB", "Snowflake", "BigQuery", "Redshift", "Databricks",
+    "Oracle", "SQL Server", "Neo4j", "ClickHouse", "Pinecone", "Vector Databases",
+    # Cloud and infrastructure
+    "AWS|Amazon Web Services", "Azure|Microsoft Azure", "GCP|Google Cloud|Google Cloud Platform",
+    "Docker", "Kubernetes|K8s", "Terraform", "Ansible", "Helm", "Jenkins", "GitHub Actions",
+    "GitLab CI", "CircleCI", "CI/CD", "Linux", "Unix", "Nginx", "Serverless", "Lambda|AWS Lambda",
+    "EC2", "S3", "ECS", "EKS", "CloudFormation", "Prometheus", "Grafana", "Datadog", "Splunk",
+    "New Relic", "OpenTelemetry", "Git", "Infrastructure as Code|IaC", "Cloud Computing",
+    "Distributed Systems", "System Design", "Observability", "Site Reliability Engineering|SRE",
+    "DevOps", "MLOps", "DataOps", "Networking", "TCP/IP", "Load Balancing", "Caching",
+    # AI and data
+    "Machine Learning|ML", "Deep Learning", "Artificial Intelligence|AI", "Generative AI|Gen AI|GenAI",
+    "Large Language Models|LLM|LLMs", "Natural Language Processing|NLP", "Computer Vision",
+    "Reinforcement Learning", "Prompt Engineering", "RAG|Retrieval-Augmented Generation",
+    "Fine-tuning", "Data Science", "Data Engineering", "Data Analysis", "Data Visualization",
+    "Data Modeling", "Data Pipelines", "ETL|ELT", "Data Warehousing", "Statistics",
+    "A/B Testing", "Experimentation", "Predictive Modeling", "Feature Engineering",
+    "Tableau", "Power BI", "Looker", "Excel", "Jupyter",
+    # Practices and roles
+    "Agile", "Scrum", "Kanban", "Test-Driven Development|TDD", "Unit Testing",
+    "Integration Testing", "Test Automation", "Code Review", "Object-Oriented Programming|OOP",
+    "Functional Programming", "Design Patterns", "Algorithms", "Data Structures",
+    "API Design", "Backend", "Frontend", "Full Stack|Full-Stack", "Mobile Development", "iOS",
+    "Android", "Web Development", "Performance Optimization", "Scalability", "Security",
+    "Cybersecurity", "Application Security", "Penetration Testing", "IAM", "OAuth", "SSO",
+    "Encryption", "Compliance", "SOC 2", "HIPAA", "GDPR", "PCI DSS", "ISO 27001",
+    "Accessibility", "UX", "UI", "Figma", "Product Management", "Project Management",
+    "Stakeholder Management", "Technical Leadership", "Mentoring", "Communication",
+    "Problem Solving", "Cross-functional Collaboration", "Jira", "Confluence",
+    # Certifications
+    "AWS Certified", "PMP", "CISSP", "CKA", "Security+",
+]
+
+# Aliases that are also common English words (or single letters) only
+# match with the exact capitalization given above.
+_CASE_SENSITIVE = {"Go", "R", "Rust", "Swift", "Spring", "Express", "Node", "Beam", "Flink",
+                   "Oracle", "Rails", "Helm", "Lambda", "Excel", "Looker", "Security",
+                   "Backend", "Frontend", "Communication", "Caching", "Networking",
+                   "Compliance", "Accessibility", "Statistics", "Algorithms", "Mentoring",
+                   "Scalability", "Encryption", "Experimentation", "Observability", "UI",
+                   "UX", "IAM", "ML", "AI", "JS", "TS", "REST", "RAG", "ETL", "ELT", "SRE",
+                   "TDD", "OOP", "IaC", "CKA", "PMP", "S3", "ECS", "EKS", "EC2", "SSO"}
+
+# Upper-case tokens outside the lexicon (e.g. FedRAMP-style acronyms) are
+# candidates too, at a lower weight; these never are.
+_ACRONYM = re.compile(r"(?<![\w.])[A-Z][A-Z0-9]{1,5}(?![\w+#])")
+_ACRONYM_STOPWORDS = {"US", "USA", "EEO", "EOE", "OR", "AND", "THE", "WE", "OUR", "YOU", "TO",
+                      "IN", "OF", "FOR", "AT", "ON", "IS", "IT", "AN", "AS", "BE", "BY", "IF",
+                      "NO", "PTO", "HR", "CEO", "CTO", "LLC", "INC", "ID", "ET", "PST", "EST",
+                      "CST", "UTC", "USD", "FAQ", "OK", "II", "III", "IV", "NA", "TBD", "ETC",
+                      "UK", "EU", "NYC", "SF", "WFH", "DEI", "FTE", "OTE", "DOE", "ASAP"}
+_ACRONYM_WEIGHT = 0.5
+
+
+def _build_matcher(lexicon: Iterable[str]) -> Tuple["re.Pattern", Dict, Dict]:
+    """
+    Compile every alias into one alternation (longest first, so "Spring Boot"
+    wins over "Spring"). Returns the pattern, a case-folded alias map and the
+    exact-case aliases that must match as written; both map to
+    (canonical term, alias as spelled in the lexicon).
+    """
+    folded: Dict[str, Tuple[str, str]] = {}
+    exact: Dict[str, Tuple[str, str]] = {}
+    for entry in lexicon:
+        aliases = entry.split("|")
+        canonical = aliases[0]
+        for alias in aliases:
+            if alias in _CASE_SENSITIVE:
+                exact[alias] = (canonical, alias)
+            else:
+                folded[alias.lower()] = (canonical, alias)
+    surfaces = sorted(set(folded) | {alias.lower() for alias in exact}, key=len, reverse=True)
+    alternation = "|".join(re.escape(surface) for surface in surfaces)
+    pattern = re.compile(rf"(?<![\w.+#/-])(?:{alternation})(?![\w+#&]|\.\w)", re.IGNORECASE)
+    return pattern, folded, exact
+
+
+class LocalKeywordExtractor:
+    """
+    Deterministic keyword extraction without a model call.
+
+    Candidates are lexicon terms (plus unknown upper-case acronyms) found in
+    the job description; they are ranked by TF-IDF, with document
+    frequencies taken from the last `max_docs` distinct stored job
+    descriptions so that terms every posting mentions rank below the
+    distinctive ones.
+    """
+
+    def __init__(self, lexicon: Iterable[str], max_terms: int, max_docs: int):
+        self.max_terms = max_terms
+        self.max_docs = max(max_docs, 1)
+        self._pattern, self._folded, self._exact = _build_matcher(lexicon)
+        self._doc_freq: Counter = Counter()
+        # Content hash -> candidate terms of each counted description, oldest first
+        self._docs: "OrderedDict[str, Tuple[str, ...]]" = OrderedDict()
+
+    def _candidates(self, text: str) -> Tuple[Counter, Dict[str, int], Dict[str, float], Dict[str, str]]:
+        """
+        Count candidate terms by canonical name. Also returns each term's first
+        offset, its weight and the alias the text used first (terms are
+        reported in the text's own wording, which is what gets highlighted).
+        """
+        counts: Counter = Counter()
+        first_seen: Dict[str, int] = {}
+        weights: Dict[str, float] = {}
+        display: Dict[str, str] = {}
+        for match in self._pattern.finditer(text):
+            surface = match.group(0)
+            entry = self._exact.get(surface) or self._folded.get(surface.lower())
+            if entry is None:
+                continue
+            canonical, alias = entry
+            counts[canonical] += 1
+            first_seen.setdefault(canonical, match.start())
+            weights[canonical] = 1.0
+            display.setdefault(canonical, alias)
+        for match in _ACRONYM.finditer(text):
+            token = match.group(0)
+            if token in _ACRONYM_STOPWORDS or token in self._exact or token.lower() in self._folded:
+                continue
+            counts[token] += 1
+            first_seen.setdefault(token, match.start())
+            weights.setdefault(token, _ACRONYM_WEIGHT)
+            display.setdefault(token, token)
+        return counts, first_seen, weights, display
+
+    def add_document(self, text: str) -> bool:
+        """
+        Count a job description towards the document frequencies, once per
+        distinct text; beyond max_docs the oldest one stops counting.
+        Returns False if the text was already counted.
+        """
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        if digest in self._docs:
+            return False
+        terms = tuple(self._candidates(text)[0])
+        self._docs[digest] = terms
+        self._doc_freq.update(terms)
+        while len(self._docs) > self.max_docs:
+            _, dropped = self._docs.popitem(last=False)
+            self._doc_freq.subtract(dropped)
+            for term in dropped:
+                if self._doc_freq[term] <= 0:
+                    del self._doc_freq[term]
+        return True
+
+    def extract(self, text: str) -> List[str]:
+        counts, first_seen, weights, display = self._candidates(text)
+        total = len(self._docs)
+
+        def score(term: str) -> float:
+            idf = math.log((total + 1) / (self._doc_freq[term] + 1)) + 1
+            return (1 + math.log(counts[term])) * idf * weights[term]
+
+        ranked = sorted(counts, key=lambda term: (-score(term), first_seen[term]))
+        return [display[term] for term in ranked[:self.max_terms]]
+
+    def stats(self) -> dict:
+        return {"documents": len(self._docs), "terms": len(self._doc_freq)}
+
+    async def load_corpus(self) -> None:
+        """Seed document frequencies from the most recent stored job descriptions."""
+        async with AsyncSessionLocal() as db:
+            result = await db.stream(
+                select(Application.job_description)
+                .order_by(Application.id.desc())
+                .limit(self.max_docs)
+                .execution_options(yield_per=200)
+            )
+            async for job_description in result.scalars():
+                if job_description:
+                    self.add_document(job_description)
+        logger.info(f"Keyword corpus loaded ({len(self._docs)} job descriptions)")
+
+
+keyword_extractor = LocalKeywordExtractor(SKILLS_LEXICON, KEYWORD_MAX_TERMS, KEYWORD_CORPUS_MAX_DOCS)
+
+
+@event.listens_for(Application, "after_insert")
+def _count_saved_job_description(mapper, connection, target):
+    # Only saved applications count, so retries and repeated lookups of a
+    # posting do not skew the document frequencies
+    job_description = inspect(target).dict.get("job_description")
+    if job_description:
+        keyword_extractor.add_document(job_description)
+
+
+def _merge(primary: List[str], extra: List[str], limit: int) -> List[str]:
+    seen = {term.lower() for term in primary}
+    merged = list(primary)
+    for term in extra:
+        if term.lower() not in seen:
+            seen.add(term.lower())
+            merged.append(term)
+    return merged[:limit]
+
+
+async def extract_job_keywords(job_description: str) -> List[str]:
+    """Keywords to highlight for a job description, according to KEYWORD_EXTRACTION_MODE."""
+    if KEYWORD_EXTRACTION_MODE == "llm":
+        keywords = await extract_keywords_llm(job_description)
+        # The model call returns [] on failure; fall back instead of disabling highlighting
+        keywords = keywords or keyword_extractor.extract(job_description)
+    else:
+        keywords = keyword_extractor.extract(job_description)
+        if KEYWORD_EXTRACTION_MODE == "local-first" and len(keywords) < KEYWORD_LOCAL_MIN_TERMS:
+            refined = await extract_keywords_llm(job_description)
+            keywords = _merge(keywords, refined, KEYWORD_MAX_TERMS)
+    return keywords
@@ -0,0 +1,147 @@
+# backend/services/llm_cache.py
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "./llm_cache.db")
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000"))
+# Expired and over-limit entries are evicted once every this many writes
+LLM_CACHE_EVICT_EVERY = int(os.getenv("LLM_CACHE_EVICT_EVERY", "100"))
+
+
+def make_cache_key(namespace: str, version: str, model: str, temperature: float, **inputs) -> str:
+    """
+    Content-addressed key: a SHA-256 over the prompt template version,
+    model, temperature and every input that goes into the prompt.
+    """
+    payload = json.dumps(
+        {
+            "namespace": namespace,
+            "version": version,
+            "model": model,
+            "temperature": temperature,
+            "inputs": inputs,
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """
+    Persistent response cache on a local SQLite file.
+    Entries expire after `ttl_seconds`; every `evict_every` writes, expired
+    entries and the least recently used ones beyond `max_entries` are
+    evicted. The methods block on SQLite, so async code goes through
+    cache_get/cache_set, which run them in a worker thread.
+    """
+
+    def __init__(self, path: str, ttl_seconds: int, max_entries: int, evict_every: int = 100):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.evict_every = max(evict_every, 1)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # Losing the last writes on power failure only costs a few cache misses
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_llm_cache_accessed ON llm_cache (accessed_at)")
+        # Entry count as of the last eviction pass plus writes since (an upper bound)
+        self._entries = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        self._writes_since_evict = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl_seconds:
+                if row is not None:
+                    self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now, now),
+            )
+            self._entries += 1
+            self._writes_since_evict += 1
+            if self._writes_since_evict >= self.evict_every:
+                self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        self._writes_since_evict = 0
+        self._conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl_seconds,))
+        count = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        if count > self.max_entries:
+            self._conn.execute(
+                "DELETE FROM llm_cache WHERE key IN "
+                "(SELECT key FROM llm_cache ORDER BY accessed_at ASC LIMIT ?)",
+                (count - self.max_entries,),
+            )
+            count = self.max_entries
+        self._entries = count
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._entries = 0
+
+    def stats(self) -> dict:
+        # No query here: stats are read on the event loop (e.g. by /metrics)
+        entries = self._entries
+        total = self.hits + self.misses
+        return {
+            "enabled": LLM_CACHE_ENABLED,
+            "entries": entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+llm_cache = LLMCache(LLM_CACHE_PATH, LLM_CACHE_TTL_SECONDS, LLM_CACHE_MAX_ENTRIES, LLM_CACHE_EVICT_EVERY)
+
+
+async def cache_get(key: str) -> Optional[Any]:
+    """Look up a cached response (off the event loop); always a miss when caching is disabled."""
+    if not LLM_CACHE_ENABLED:
+        return None
+    return await asyncio.to_thread(llm_cache.get, key)
+
+
+async def cache_set(key: str, value: Any) -> None:
+    if LLM_CACHE_ENABLED:
+        await asyncio.to_thread(llm_cache.set, key, value)
@@ -0,0 +1,275 @@
+# backend/services/metrics.py
+
+import contextvars
+import logging
+import os
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, TypeVar
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+# Adds "[trace-id]" to log lines emitted while handling a request
+LOG_TRACE_IDS = os.getenv("LOG_TRACE_IDS", "true").lower() == "true"
+
+# Seconds; covers a cache hit (~1 ms) up to a long tailoring call
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+T = TypeVar("T")
+Labels = Tuple[str, ...]
+
+trace_id_var: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("trace_id", default=None)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"] + self._samples()
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        super().__init__(name, help_text, labels)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}" for key, value in items]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *label_values: str, amount: float = 1) -> None:
+        self.inc(*label_values, amount=-amount)
+
+    def set(self, *label_values: str, value: float) -> None:
+        with self._lock:
+            self._values[label_values] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [count per bucket (+Inf last)], sum
+        self._values: Dict[Labels, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(label_values)
+            if entry is None:
+                entry = self._values[label_values] = ([0] * (len(self.buckets) + 1), [0.0])
+            entry[0][index] += 1
+            entry[1][0] += value
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = [(key, list(counts), total[0]) for key, (counts, total) in self._values.items()]
+        lines = []
+        for key, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = 'le="+Inf"' if bound == float("inf") else f'le="{bound:g}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {cumulative}")
+        return lines
+
+
+# A collector returns (name, help, type, [(labels dict, value), ...]) read at scrape time
+Collector = Callable[[], Iterable[Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]]]
+
+
+class MetricsRegistry:
+    """Metrics rendered together in the Prometheus text exposition format."""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Collector] = []
+
+    def counter(self, name: str, help_text: str, labels: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help_text, labels))
+
+    def gauge(self, name: str, help_text: str, labels: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help_text, labels))
+
+    def histogram(self, name: str, help_text: str, labels: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help_text, labels, buckets))
+
+    def _register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Collector) -> None:
+        """Values that already live elsewhere (cache and pool stats) are read only when scraped."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            for name, help_text, kind, samples in collector():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    lines.append(f"{name}{_format_labels(list(labels), list(labels.values()))} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+http_requests_in_flight = registry.gauge(
+    "resume_http_requests_in_flight", "Requests currently being handled", ["route"]
+)
+http_request_seconds = registry.histogram(
+    "resume_http_request_duration_seconds", "Request latency until the response starts", ["method", "route", "status"]
+)
+stage_seconds = registry.histogram(
+    "resume_stage_duration_seconds", "Time spent in each stage of a pipeline", ["pipeline", "stage"]
+)
+openai_request_seconds = registry.histogram(
+    "resume_openai_request_duration_seconds", "OpenAI call latency, retries included", ["model", "purpose", "outcome"]
+)
+openai_tokens = registry.counter(
+    "resume_openai_tokens_total", "Tokens reported by the OpenAI API", ["model", "purpose", "kind"]
+)
+
+
+@contextmanager
+def stage(pipeline: str, name: str):
+    """Time a block as one stage of a pipeline."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if METRICS_ENABLED:
+            stage_seconds.observe(time.perf_counter() - started, pipeline, name)
+
+
+async def timed(pipeline: str, name: str, awaitable: Awaitable[T]) -> T:
+    """Await `awaitable` as one stage; for stages that run concurrently (asyncio.gather)."""
+    with stage(pipeline, name):
+        return await awaitable
+
+
+def record_openai_usage(model: str, purpose: str, usage) -> None:
+    if not METRICS_ENABLED or usage is None:
+        return
+    details = getattr(usage, "prompt_tokens_details", None)
+    openai_tokens.inc(model, purpose, "input", amount=usage.prompt_tokens)
+    openai_tokens.inc(model, purpose, "output", amount=usage.completion_tokens)
+    openai_tokens.inc(model, purpose, "cached", amount=getattr(details, "cached_tokens", None) or 0)
+
+
+class RequestMetrics:
+    """
+    ASGI middleware: in-flight gauge and latency histogram per route
+    template (so /api/jobs/{job_id} is one series), and a trace ID per
+    request, taken from X-Request-ID or generated, echoed in the response
+    and attached to log lines.
+    """
+
+    def __init__(self, app, skip_paths: Iterable[str] = ("/metrics",)):
+        self.app = app
+        self.skip_paths = set(skip_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.skip_paths:
+            await self.app(scope, receive, send)
+            return
+
+        trace_id = dict(scope["headers"]).get(b"x-request-id", b"").decode("latin-1")[:64] or uuid.uuid4().hex[:16]
+        token = trace_id_var.set(trace_id)
+        route = _route_template(scope)
+        started = time.perf_counter()
+        status = "500"
+
+        async def send_with_trace(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+                message["headers"] = list(message.get("headers", [])) + [(b"x-request-id", trace_id.encode("latin-1"))]
+                if METRICS_ENABLED:
+                    http_request_seconds.observe(time.perf_counter() - started, scope["method"], route, status)
+            await send(message)
+
+        if METRICS_ENABLED:
+            http_requests_in_flight.inc(route)
+        try:
+            await self.app(scope, receive, send_with_trace)
+        finally:
+            if METRICS_ENABLED:
+                http_requests_in_flight.dec(route)
+            trace_id_var.reset(token)
+
+
+def _route_template(scope) -> str:
+    """The matching route's path template; unknown paths share one series."""
+    app = scope.get("app")
+    router = getattr(app, "router", None)
+    for route in getattr(router, "routes", []):
+        path = getattr(route, "path", None)
+        param_regex = getattr(route, "path_regex", None)
+        if path and param_regex is not None and param_regex.match(scope["path"]):
+            return path
+    return "other"
+
+
+class TraceIdFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        trace_id = trace_id_var.get()
+        record.trace_id = f"[{trace_id}] " if trace_id else ""
+        return True
+
+
+def install_trace_logging() -> None:
+    """Prefix log lines emitted while handling a request with its trace ID."""
+    if not LOG_TRACE_IDS:
+        return
+    for handler in logging.getLogger().handlers:
+        handler.addFilter(TraceIdFilter())
+        handler.setFormatter(logging.Formatter("%(levelname)s:%(name)s:%(trace_id)s%(message)s"))
@@ -1,18 +1,265 @@
 # backend/services/openai_service.py
 
-from openai import OpenAI 
+# The OpenAI SDK is large; it is imported when the client is first needed
+# (see get_client), not when this module is imported.
+import asyncio
+import hashlib
+import logging
 import os
-import json
+import time
 from dotenv import load_dotenv
-from typing import List, Dict
+from pydantic import BaseModel
+from typing import TYPE_CHECKING, AsyncIterator, List, Dict, Optional, Type
+
+from services.llm_cache import make_cache_key, cache_get, cache_set
+from services.json_stream import StreamingJSONObjectParser
+from services.rate_limiter import openai_limiter
+from services.resilience import CircuitBreaker, CircuitOpenError, LatencyTracker, backoff_delay, hedged
+from services.prompt_builder import (
+    prepare_tailor_inputs, tailor_messages, section_messages, job_meta_messages, count_message_tokens
+)
+from services.resume_sections import ResumeSection
+from services.json_repair import parse_model_reply
+from services.metrics import METRICS_ENABLED, openai_request_seconds, record_openai_usage
+from models.schemas import KeywordsReply, TailoredResumeReply, TailoredSectionReply, JobMetaReply, EmailDraftReply
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
 
 load_dotenv()
+logger = logging.getLogger(__name__)
+
+MODEL = "gpt-4o-mini"
+
+# Bump a prompt's version whenever its template changes so stale cache
+# entries are no longer addressed.
+KEYWORDS_PROMPT_VERSION = "2"
+TAILOR_PROMPT_VERSION = "2"
+SECTION_PROMPT_VERSION = "1"
+JOB_META_PROMPT_VERSION = "1"
+EMAIL_PROMPT_VERSION = "1"
+
+# Shared async client. The underlying httpx pool keeps connections to the
+# API warm so concurrent requests don't each pay the TLS handshake.
+
+OPENAI_MAX_CONNECTIONS = int(os.getenv("OPENAI_MAX_CONNECTIONS", "100"))
+OPENAI_MAX_KEEPALIVE = int(os.getenv("OPENAI_MAX_KEEPALIVE", "20"))
+
+_client: Optional["AsyncOpenAI"] = None
+
+
+def get_client() -> "AsyncOpenAI":
+    """The shared client, created (and the SDK imported) on first use."""
+    global _client
+    if _client is None:
+        import httpx
+        from openai import AsyncOpenAI
+
+        _client = AsyncOpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=OPENAI_MAX_CONNECTIONS,
+                    max_keepalive_connections=OPENAI_MAX_KEEPALIVE,
+                ),
+                timeout=httpx.Timeout(600.0, connect=5.0),
+            ),
+            # Retries are handled by _create_chat_completion, within each call's deadline
+            max_retries=0,
+        )
+    return _client
+
+
+# Extra attempts after a 429, 5xx, timeout or connection error
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", os.getenv("OPENAI_RATE_LIMIT_RETRIES", "3")))
+OPENAI_BACKOFF_BASE = float(os.getenv("OPENAI_BACKOFF_BASE", "0.5"))
+OPENAI_BACKOFF_CAP = float(os.getenv("OPENAI_BACKOFF_CAP", "8"))
+# Overall deadline per kind of call, retries included
+OPENAI_DEADLINES = {
+    "keywords": float(os.getenv("OPENAI_DEADLINE_KEYWORDS", "20")),
+    "tailor": float(os.getenv("OPENAI_DEADLINE_TAILOR", "120")),
+    "section": float(os.getenv("OPENAI_DEADLINE_SECTION", "45")),
+    "job_meta": float(os.getenv("OPENAI_DEADLINE_JOB_META", "20")),
+    "email": float(os.getenv("OPENAI_DEADLINE_EMAIL", "20")),
+}
+# Hedging: when a call outlives the recent p95 latency for its kind, send
+# a duplicate and keep whichever answers first (costs extra tokens)
+OPENAI_HEDGE_ENABLED = os.getenv("OPENAI_HEDGE_ENABLED", "false").lower() == "true"
+OPENAI_HEDGE_PERCENTILE = float(os.getenv("OPENAI_HEDGE_PERCENTILE", "0.95"))
+OPENAI_HEDGE_MIN_SAMPLES = int(os.getenv("OPENAI_HEDGE_MIN_SAMPLES", "20"))
+OPENAI_HEDGE_MIN_DELAY = float(os.getenv("OPENAI_HEDGE_MIN_DELAY", "1.0"))
+OPENAI_BREAKER_THRESHOLD = int(os.getenv("OPENAI_BREAKER_THRESHOLD", "5"))
+OPENAI_BREAKER_RESET_SECONDS = float(os.getenv("OPENAI_BREAKER_RESET_SECONDS", "30"))
+
+openai_breaker = CircuitBreaker("OpenAI", OPENAI_BREAKER_THRESHOLD, OPENAI_BREAKER_RESET_SECONDS)
+_latencies = {purpose: LatencyTracker() for purpose in OPENAI_DEADLINES}
+# Constrain replies with JSON-schema structured outputs (disable for
+# models or proxies that do not support response_format json_schema)
+OPENAI_STRUCTURED_OUTPUTS = os.getenv("OPENAI_STRUCTURED_OUTPUTS", "true").lower() == "true"
+# Extra attempts, with the parse error fed back, when a reply is unusable
+OPENAI_PARSE_RETRIES = int(os.getenv("OPENAI_PARSE_RETRIES", "1"))
+
+
+async def close_client() -> None:
+    """Close the pooled HTTP connections (called on app shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
+
+
+def _log_usage(purpose: str, usage, estimated_input: Optional[int] = None) -> None:
+    """Log the token usage reported by the API (plus our own input estimate, if any)."""
+    if usage is None:
+        return
+    record_openai_usage(MODEL, purpose, usage)
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached = getattr(details, "cached_tokens", None) or 0
+    estimate = f", estimated {estimated_input}" if estimated_input is not None else ""
+    logger.info(
+        f"OpenAI {purpose}: {usage.prompt_tokens} input tokens ({cached} cached{estimate}), "
+        f"{usage.completion_tokens} output tokens"
+    )
+
+
+def _is_retryable(error: Exception) -> bool:
+    from openai import APIConnectionError, APIStatusError
+
+    if isinstance(error, APIConnectionError):  # includes timeouts
+        return True
+    return isinstance(error, APIStatusError) and (error.status_code == 429 or error.status_code >= 500)
+
+
+def _is_upstream_failure(error: Exception) -> bool:
+    """Errors that say the API itself is unhealthy (not our request, not rate limits)."""
+    from openai import APIConnectionError, APIStatusError
+
+    if isinstance(error, (APIConnectionError, asyncio.TimeoutError)):
+        return True
+    return isinstance(error, APIStatusError) and error.status_code >= 500
+
+
+def _hedge_delay(purpose: str) -> Optional[float]:
+    latencies = _latencies.get(purpose)
+    if not OPENAI_HEDGE_ENABLED or latencies is None or len(latencies) < OPENAI_HEDGE_MIN_SAMPLES:
+        return None
+    return max(latencies.percentile(OPENAI_HEDGE_PERCENTILE), OPENAI_HEDGE_MIN_DELAY)
+
+
+async def _send_chat_completion(kwargs: Dict):
+    """One request through the shared adaptive limiter, feeding it the rate-limit headers."""
+    from openai import RateLimitError
+
+    client = get_client()
+    async with openai_limiter:
+        try:
+            raw = await client.chat.completions.with_raw_response.create(**kwargs)
+        except RateLimitError as e:
+            openai_limiter.on_rate_limited(e.response.headers)
+            raise
+    openai_limiter.observe(raw.headers)
+    return raw.parse()
+
+
+async def _send_with_retries(purpose: str, kwargs: Dict):
+    for attempt in range(OPENAI_MAX_RETRIES + 1):
+        started = time.monotonic()
+        try:
+            response = await hedged(lambda: _send_chat_completion(kwargs), _hedge_delay(purpose))
+        except Exception as e:
+            if not _is_retryable(e) or attempt == OPENAI_MAX_RETRIES:
+                raise
+            delay = backoff_delay(attempt, OPENAI_BACKOFF_BASE, OPENAI_BACKOFF_CAP)
+            logger.warning(f"OpenAI {purpose} attempt {attempt + 1} failed ({type(e).__name__}), retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
+            continue
+        if purpose in _latencies:
+            _latencies[purpose].record(time.monotonic() - started)
+        return response
+
+
+def _observe_call(purpose: str, seconds: float, outcome: str) -> None:
+    if METRICS_ENABLED:
+        openai_request_seconds.observe(seconds, MODEL, purpose, outcome)
+
+
+async def _create_chat_completion(purpose: str, **kwargs):
+    """
+    Run one chat completion under the resilience policy: fail fast while
+    the circuit breaker is open, retry 429/5xx/connection errors with
+    jittered exponential backoff, optionally hedge slow attempts, and give
+    up once the per-purpose deadline (OPENAI_DEADLINES) has passed.
+    """
+    try:
+        openai_breaker.before_call()
+    except CircuitOpenError:
+        _observe_call(purpose, 0.0, "circuit_open")
+        raise
+    deadline = OPENAI_DEADLINES.get(purpose, max(OPENAI_DEADLINES.values()))
+    started = time.perf_counter()
+    try:
+        response = await asyncio.wait_for(_send_with_retries(purpose, kwargs), deadline)
+    except asyncio.CancelledError:
+        openai_breaker.abandon()
+        raise
+    except Exception as e:
+        if _is_upstream_failure(e):
+            openai_breaker.record_failure()
+        else:
+            openai_breaker.record_success()
+        if isinstance(e, asyncio.TimeoutError):
+            _observe_call(purpose, time.perf_counter() - started, "timeout")
+            raise TimeoutError(f"OpenAI {purpose} call exceeded its {deadline:g}s deadline")
+        _observe_call(purpose, time.perf_counter() - started, "error")
+        raise
+    openai_breaker.record_success()
+    _observe_call(purpose, time.perf_counter() - started, "ok")
+    return response
+
 
-# Initialize the client explicitly. 
+def _response_format(model: Type[BaseModel]) -> Dict:
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": model.__name__, "strict": True, "schema": model.model_json_schema()},
+    }
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
-def extract_keywords(job_description: str) -> List[str]:
+async def _create_json_completion(
+    purpose: str,
+    reply_model: Type[BaseModel],
+    messages: List[Dict[str, str]],
+    temperature: float,
+    estimated_input: Optional[int] = None
+) -> Dict:
+    """
+    Chat completion whose reply must match `reply_model`. Malformed replies
+    are repaired where possible; otherwise the request is retried (at most
+    OPENAI_PARSE_RETRIES times) with the parse error fed back to the model.
+    """
+    kwargs = {"model": MODEL, "messages": messages, "temperature": temperature}
+    if OPENAI_STRUCTURED_OUTPUTS:
+        kwargs["response_format"] = _response_format(reply_model)
+
+    for attempt in range(OPENAI_PARSE_RETRIES + 1):
+        response = await _create_chat_completion(purpose, **kwargs)
+        _log_usage(purpose, response.usage, estimated_input)
+        message = response.choices[0].message
+        if getattr(message, "refusal", None):
+            raise ValueError(f"model refused: {message.refusal}")
+        try:
+            return parse_model_reply(message.content, reply_model)
+        except ValueError as e:
+            if attempt == OPENAI_PARSE_RETRIES:
+                raise
+            logger.warning(f"OpenAI {purpose}: unusable reply, retrying: {str(e)}")
+            kwargs["messages"] = messages + [
+                {"role": "assistant", "content": message.content or ""},
+                {"role": "user", "content": f"That reply could not be used: {str(e)}. "
+                                            "Reply again with ONLY the JSON object."},
+            ]
+
+
+async def extract_keywords(job_description: str) -> List[str]:
     """
     Extract important keywords from job description for highlighting
     """
@@ -28,8 +275,8 @@ def extract_keywords(job_description: str) -> List[str]:
     3. Key qualifications (Machine Learning, Gen AI, Data Science, etc.)
     4. Important certifications or requirements
 
-    Return ONLY a JSON array of keywords (no explanations):
-    ["keyword1", "keyword2", "keyword3", ...]
+    Return ONLY a JSON object with the keywords (no explanations):
+    {{"keywords": ["keyword1", "keyword2", "keyword3", ...]}}
 
     Rules:
     - Each keyword should be 1-3 words max
@@ -37,18 +284,21 @@ def extract_keywords(job_description: str) -> List[str]:
     - Include variations if important (e.g., "AI", "Artificial Intelligence")
     """
 
+    cache_key = make_cache_key(
+        "keywords", KEYWORDS_PROMPT_VERSION, MODEL, 0.3,
+        job_description=job_description
+    )
+    cached = await cache_get(cache_key)
+    if cached is not None:
+        return cached
+
     try:
-        # Use client.chat.completions.create instead of openai.chat.completions.create
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.3
+        reply = await _create_json_completion(
+            "keywords", KeywordsReply, [{"role": "user", "content": prompt}], 0.3
         )
-        
-        content = response.choices[0].message.content
-        content = content.replace("```json", "").replace("```", "").strip()
-        
-        keywords = json.loads(content)
+        keywords = reply["keywords"]
+        # Failures return [] and are deliberately not cached
+        await cache_set(cache_key, keywords)
         return keywords
     
     except Exception as e:
@@ -56,94 +306,162 @@ def extract_keywords(job_description: str) -> List[str]:
         return []
 
 
-def tailor_resume_content(original_resume: str, job_description: str) -> Dict:
+def _tailor_cache_key(original_resume: str, job_description: str) -> str:
+    return make_cache_key(
+        "tailor", TAILOR_PROMPT_VERSION, MODEL, 0.7,
+        original_resume=original_resume, job_description=job_description
+    )
+
+
+async def tailor_resume_content(original_resume: str, job_description: str) -> Dict:
     """
     Use OpenAI to tailor resume based on job description
     Now includes keyword extraction
     """
-    
-    prompt = f"""You are an expert ATS optimization specialist and resume writer.
-
-Original Resume Content:
-{original_resume}
-
-Job Description:
-{job_description}
-
-Tasks:
-1. Extract the job title and company name from the job description
-2. Identify key skills, technologies, and keywords from the JD
-3. Rewrite the resume content to naturally incorporate these keywords
-4. Maintain professional tone and truthfulness
-5. Return the content in clean, semantic HTML format
-
-IMPORTANT HTML REQUIREMENTS:
-- Use ONLY simple HTML tags: <h1>, <h2>, <h3>, <p>, <ul>, <li>, <strong>, <em>
-- NO flexbox, NO grid, NO modern CSS
-- Use inline styles for ALL formatting
-- Structure: Name (h1) → Contact Info (p) → Sections (h2) → Content
-- Use <strong> for company names, job titles, and important terms
-- Use proper hierarchy: h1 for name, h2 for sections, h3 for job titles
-
-Return ONLY a JSON object with this exact structure:
-{{
-    "job_title": "extracted job title",
-    "company": "extracted company name",
-    "html_content": "complete HTML resume with proper structure and inline styles"
-}}
-
-Example HTML structure:
-<html>
-<body>
-<h1 style="font-size: 26pt; font-weight: 700; color: #000;">John Doe</h1>
-<p style="text-align: center; font-size: 10pt;">
-email@example.com | (123) 456-7890 | linkedin.com/in/johndoe
-</p>
-
-<h2 style="font-size: 13pt; font-weight: 700; color: #000; border-bottom: 2px solid #000; margin-top: 20px;">PROFESSIONAL SUMMARY</h2>
-<p>Senior Software Engineer with 5+ years of experience in <strong>Python</strong>, <strong>FastAPI</strong>, and <strong>Gen AI</strong>...</p>
-
-<h2 style="font-size: 13pt; font-weight: 700; color: #000; border-bottom: 2px solid #000; margin-top: 20px;">EXPERIENCE</h2>
-
-<div style="margin-bottom: 15px;">
-<div style="display: flex; justify-content: space-between;">
-<h3 style="font-size: 12pt; font-weight: 700; color: #000;">Senior Software Engineer</h3>
-<span style="font-size: 10pt; color: #444; font-style: italic;">Jan 2020 - Present</span>
-</div>
-<p style="font-weight: 600; color: #000;"><strong>Google Inc.</strong> - Mountain View, CA</p>
-<ul>
-<li>Led development of <strong>AI-powered</strong> features using <strong>Python</strong> and <strong>TensorFlow</strong></li>
-<li>Improved system performance by 40% through optimization</li>
-</ul>
-</div>
-
-<h2 style="font-size: 13pt; font-weight: 700; color: #000; border-bottom: 2px solid #000; margin-top: 20px;">SKILLS</h2>
-<p><strong>Languages:</strong> Python, JavaScript, SQL</p>
-<p><strong>Frameworks:</strong> FastAPI, React, Django</p>
-<p><strong>Tools:</strong> Docker, Kubernetes, AWS, Git</p>
-
-</body>
-</html>
-"""
+    resume, jd = prepare_tailor_inputs(original_resume, job_description)
+    cache_key = _tailor_cache_key(resume, jd)
+    cached = await cache_get(cache_key)
+    if cached is not None:
+        return cached
 
+    messages = tailor_messages(resume, jd)
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.7
+        result = await _create_json_completion(
+            "tailor", TailoredResumeReply, messages, 0.7, count_message_tokens(messages)
         )
-        
-        content = response.choices[0].message.content
-        content = content.replace("```json", "").replace("```", "").strip()
-        
-        result = json.loads(content)
+        await cache_set(cache_key, result)
         return result
     
+    except CircuitOpenError:
+        raise
+    except Exception as e:
+        raise ValueError(f"OpenAI API error: {str(e)}")
+
+
+async def tailor_section(section: ResumeSection, keywords: List[str]) -> str:
+    """
+    Tailored HTML body of one resume section. The prompt holds only the
+    section and its keywords, so the reply is cached by (section hash,
+    keyword-set hash) and reused across postings asking for the same skills.
+    """
+    keywords = sorted(set(keywords), key=str.casefold)
+    cache_key = make_cache_key(
+        "section", SECTION_PROMPT_VERSION, MODEL, 0.4,
+        section=section.digest, keywords=hashlib.sha256("\n".join(keywords).casefold().encode()).hexdigest()
+    )
+    cached = await cache_get(cache_key)
+    if cached is not None:
+        return cached
+
+    messages = section_messages(section.kind, section.title, section.text, keywords)
+    try:
+        reply = await _create_json_completion(
+            "section", TailoredSectionReply, messages, 0.4, count_message_tokens(messages)
+        )
+    except CircuitOpenError:
+        raise
+    except Exception as e:
+        raise ValueError(f"OpenAI API error: {str(e)}")
+    await cache_set(cache_key, reply["html_content"])
+    return reply["html_content"]
+
+
+async def extract_job_meta(job_description: str) -> Dict:
+    """Job title and company of a posting (read from its first few hundred tokens)."""
+    messages = job_meta_messages(job_description)
+    cache_key = make_cache_key(
+        "job_meta", JOB_META_PROMPT_VERSION, MODEL, 0.0,
+        job_description=messages[-1]["content"]
+    )
+    cached = await cache_get(cache_key)
+    if cached is not None:
+        return cached
+
+    try:
+        result = await _create_json_completion("job_meta", JobMetaReply, messages, 0.0)
+    except CircuitOpenError:
+        raise
+    except Exception as e:
+        raise ValueError(f"OpenAI API error: {str(e)}")
+    await cache_set(cache_key, result)
+    return result
+
+
+async def stream_tailor_resume_content(original_resume: str, job_description: str) -> AsyncIterator[Dict]:
+    """
+    Streaming variant of tailor_resume_content.
+    Yields {"type": "field"} events for job_title/company as soon as they are
+    parsed, {"type": "html"} events with html_content fragments as tokens
+    arrive, and finally one {"type": "result"} event with the full result.
+    """
+    resume, jd = prepare_tailor_inputs(original_resume, job_description)
+    cache_key = _tailor_cache_key(resume, jd)
+    cached = await cache_get(cache_key)
+    if cached is not None:
+        for name in ("job_title", "company"):
+            yield {"type": "field", "name": name, "value": cached[name]}
+        yield {"type": "html", "chunk": cached["html_content"]}
+        yield {"type": "result", "result": cached}
+        return
+
+    messages = tailor_messages(resume, jd)
+    options = {"response_format": _response_format(TailoredResumeReply)} if OPENAI_STRUCTURED_OUTPUTS else {}
+    parser = StreamingJSONObjectParser()
+    # Streams are not retried or hedged once started; the deadline bounds
+    # each wait for the next chunk rather than the whole stream
+    try:
+        openai_breaker.before_call()
+    except CircuitOpenError:
+        _observe_call("tailor stream", 0.0, "circuit_open")
+        raise
+    started = time.perf_counter()
+    try:
+        # The limiter slot is held for the whole stream, not just the request
+        async with openai_limiter:
+            raw = await get_client().chat.completions.with_raw_response.create(
+                model=MODEL,
+                messages=messages,
+                temperature=0.7,
+                stream=True,
+                stream_options={"include_usage": True},
+                timeout=OPENAI_DEADLINES["tailor"],
+                **options
+            )
+            openai_limiter.observe(raw.headers)
+            async for chunk in raw.parse():
+                if chunk.usage is not None:
+                    _log_usage("tailor stream", chunk.usage, count_message_tokens(messages))
+                if not chunk.choices or not chunk.choices[0].delta.content:
+                    continue
+                for key, fragment, complete in parser.feed(chunk.choices[0].delta.content):
+                    if key == "html_content":
+                        if fragment:
+                            yield {"type": "html", "chunk": fragment}
+                    elif complete and key in ("job_title", "company"):
+                        yield {"type": "field", "name": key, "value": parser.values[key]}
+    except (asyncio.CancelledError, GeneratorExit):
+        openai_breaker.abandon()
+        raise
     except Exception as e:
+        if _is_upstream_failure(e):
+            openai_breaker.record_failure()
+        else:
+            openai_breaker.record_success()
+        _observe_call("tailor stream", time.perf_counter() - started, "error")
         raise ValueError(f"OpenAI API error: {str(e)}")
+    openai_breaker.record_success()
+    _observe_call("tailor stream", time.perf_counter() - started, "ok")
+
+    result = parser.values
+    missing = [k for k in ("job_title", "company", "html_content") if k not in result]
+    if missing:
+        raise ValueError(f"OpenAI API error: incomplete response, missing {', '.join(missing)}")
 
+    await cache_set(cache_key, result)
+    yield {"type": "result", "result": result}
 
-def generate_email_draft(job_title: str, company: str, recipient_email: str = None) -> dict:
+
+async def generate_email_draft(job_title: str, company: str, recipient_email: str = None) -> dict:
     """
     Generate professional email draft
     """
@@ -167,19 +485,24 @@ Return ONLY a JSON object:
 }}
 """
 
+    # recipient_email is not part of the prompt, so it stays out of the key
+    cache_key = make_cache_key(
+        "email", EMAIL_PROMPT_VERSION, MODEL, 0.8,
+        job_title=job_title, company=company
+    )
+    cached = await cache_get(cache_key)
+    if cached is not None:
+        return {**cached, "recipient_email": recipient_email}
+
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.8
+        result = await _create_json_completion(
+            "email", EmailDraftReply, [{"role": "user", "content": prompt}], 0.8
         )
-        
-        content = response.choices[0].message.content
-        content = content.replace("```json", "").replace("```", "").strip()
-        
-        result = json.loads(content)
+        await cache_set(cache_key, result)
         result["recipient_email"] = recipient_email
         return result
     
+    except CircuitOpenError:
+        raise
     except Exception as e:
         raise ValueError(f"Failed to generate email: {str(e)}")
\ No newline at end of file
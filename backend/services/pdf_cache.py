@@ -0,0 +1,181 @@
+# backend/services/pdf_cache.py
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+PDF_CACHE_MAX_BYTES = int(os.getenv("PDF_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+# Optional on-disk spill for entries evicted from memory (disabled when unset)
+PDF_CACHE_DIR = os.getenv("PDF_CACHE_DIR")
+PDF_CACHE_DISK_MAX_BYTES = int(os.getenv("PDF_CACHE_DISK_MAX_BYTES", str(512 * 1024 * 1024)))
+
+
+def pdf_cache_key(html_content: str, keywords: Optional[List[str]]) -> str:
+    """Digest of the final HTML and the (order-independent) keyword set."""
+    digest = hashlib.sha256(html_content.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(json.dumps(sorted(set(keywords or []))).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class PDFCache:
+    """
+    LRU cache of rendered PDFs bounded by total bytes.
+    Entries pushed out of memory are spilled to `disk_dir` (when set), which
+    is itself bounded by `disk_max_bytes`. Concurrent requests for the same
+    key share a single render.
+    """
+
+    def __init__(self, max_bytes: int, disk_dir: Optional[str] = None, disk_max_bytes: int = 0):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = disk_max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        self._disk: "OrderedDict[str, int]" = OrderedDict()
+        self._disk_bytes = 0
+        self._pending: Dict[str, asyncio.Future] = {}
+
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+            entries = []
+            for name in os.listdir(disk_dir):
+                if name.endswith(".pdf"):
+                    stat = os.stat(os.path.join(disk_dir, name))
+                    entries.append((stat.st_mtime, name[:-4], stat.st_size))
+            for _, key, size in sorted(entries):
+                self._disk[key] = size
+                self._disk_bytes += size
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.pdf")
+
+    async def get(self, key: str) -> Optional[bytes]:
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return self._memory[key]
+
+        if key in self._disk:
+            try:
+                data = await asyncio.to_thread(self._read_file, key)
+            except OSError:
+                self._forget_on_disk(key)
+            else:
+                self.hits += 1
+                await self.put(key, data)
+                return data
+
+        self.misses += 1
+        return None
+
+    async def put(self, key: str, data: bytes) -> None:
+        await self._spill(self._put_in_memory(key, data))
+
+    def _put_in_memory(self, key: str, data: bytes) -> List[Tuple[str, bytes]]:
+        """Insert into the memory LRU; returns the entries pushed out, to be spilled."""
+        if key in self._memory:
+            self._memory_bytes -= len(self._memory.pop(key))
+        if len(data) > self.max_bytes:
+            return [(key, data)]
+        self._memory[key] = data
+        self._memory_bytes += len(data)
+        evicted = []
+        while self._memory_bytes > self.max_bytes:
+            old_key, old_data = self._memory.popitem(last=False)
+            self._memory_bytes -= len(old_data)
+            evicted.append((old_key, old_data))
+        return evicted
+
+    # File IO runs in worker threads (like rendering); the bookkeeping
+    # above and below stays on the event loop
+
+    def _read_file(self, key: str) -> bytes:
+        with open(self._disk_path(key), "rb") as f:
+            return f.read()
+
+    def _write_file(self, key: str, data: bytes) -> None:
+        with open(self._disk_path(key), "wb") as f:
+            f.write(data)
+
+    def _remove_files(self, keys: List[str]) -> None:
+        for key in keys:
+            try:
+                os.remove(self._disk_path(key))
+            except OSError:
+                pass
+
+    async def _spill(self, entries: List[Tuple[str, bytes]]) -> None:
+        for key, data in entries:
+            if not self.disk_dir or len(data) > self.disk_max_bytes or key in self._disk:
+                continue
+            try:
+                await asyncio.to_thread(self._write_file, key, data)
+            except OSError as e:
+                logger.warning(f"PDF cache spill failed: {str(e)}")
+                continue
+            self._disk[key] = len(data)
+            self._disk_bytes += len(data)
+            dropped = []
+            while self._disk_bytes > self.disk_max_bytes:
+                dropped.append(self._forget_on_disk(next(iter(self._disk))))
+            if dropped:
+                await asyncio.to_thread(self._remove_files, dropped)
+
+    def _forget_on_disk(self, key: str) -> str:
+        self._disk_bytes -= self._disk.pop(key, 0)
+        return key
+
+    async def get_or_render(self, key: str, render: Callable[[], Awaitable[bytes]]) -> bytes:
+        data = await self.get(key)
+        if data is not None:
+            return data
+
+        pending = self._pending.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            data = await render()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved in case nobody else was waiting
+            future.exception()
+            raise
+        finally:
+            self._pending.pop(key, None)
+        future.set_result(data)
+        # Waiters already have the PDF; storing it (and any spill) follows
+        await self.put(key, data)
+        return data
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory_bytes,
+            "disk_entries": len(self._disk),
+            "disk_bytes": self._disk_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+pdf_cache = PDFCache(PDF_CACHE_MAX_BYTES, PDF_CACHE_DIR, PDF_CACHE_DISK_MAX_BYTES)
@@ -0,0 +1,139 @@
+# backend/services/pdf_pool.py
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional
+
+from dotenv import load_dotenv
+
+from services.pdf_service import html_to_pdf, warm_up
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+# PDF_WORKERS=0 renders on a single background thread instead of a process pool
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", str(os.cpu_count() or 1)))
+PDF_MAX_PENDING = int(os.getenv("PDF_MAX_PENDING", str(max(PDF_WORKERS, 1) * 4)))
+PDF_JOB_TIMEOUT = float(os.getenv("PDF_JOB_TIMEOUT", "30"))
+PDF_POOL_START_METHOD = os.getenv("PDF_POOL_START_METHOD", "spawn")
+
+
+class PDFPoolSaturated(Exception):
+    """Raised when the render queue is full; the caller should retry later."""
+
+
+class PDFRenderTimeout(Exception):
+    """Raised when a render job does not finish within its deadline."""
+
+
+def _warm_worker() -> None:
+    """
+    Worker initializer: compile the resume stylesheet and do a warm-up render
+    so fonts and WeasyPrint's caches are loaded before the first job.
+    """
+    try:
+        warm_up()
+    except Exception as e:
+        # A failed warm-up must not break the pool; the first job will retry it
+        logger.warning(f"PDF worker warm-up failed: {str(e)}")
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+class PDFRenderPool:
+    """
+    Runs html_to_pdf off the event loop in a pool of warm worker processes.
+
+    At most `max_pending` jobs may be queued or running at once; beyond
+    that `render` raises PDFPoolSaturated immediately instead of queueing.
+    A job that times out frees the caller but keeps its slot until the
+    worker actually finishes, so the bound reflects real load.
+    """
+
+    def __init__(self, workers: int, max_pending: int, timeout: float, start_method: str):
+        self.workers = workers
+        self.max_pending = max(max_pending, workers, 1)
+        self.timeout = timeout
+        self.start_method = start_method
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+
+    def start(self) -> None:
+        if self._executor is not None:
+            return
+        if self.workers > 0:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context(self.start_method),
+                initializer=_warm_worker,
+            )
+        else:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1,
+                thread_name_prefix="pdf-render",
+                initializer=_warm_worker,
+            )
+
+    async def warm_up(self) -> None:
+        """Start every worker (and its warm-up render) up front so no request pays for it."""
+        self.start()
+        futures = [asyncio.wrap_future(self._executor.submit(_ping)) for _ in range(max(self.workers, 1))]
+        await asyncio.gather(*futures)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _release(self, _future: Future) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    async def render(self, html_content: str, keywords: List[str] = None) -> bytes:
+        with self._lock:
+            if self._in_flight >= self.max_pending:
+                raise PDFPoolSaturated("PDF renderer is busy, please retry shortly")
+            self._in_flight += 1
+
+        try:
+            self.start()
+            future = self._executor.submit(html_to_pdf, html_content, keywords)
+        except BaseException as e:
+            with self._lock:
+                self._in_flight -= 1
+            if isinstance(e, BrokenProcessPool):
+                self._restart()
+            raise
+        future.add_done_callback(self._release)
+
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+        except asyncio.TimeoutError:
+            raise PDFRenderTimeout(f"PDF generation timed out after {self.timeout:g}s")
+        except BrokenProcessPool:
+            self._restart()
+            raise ValueError("PDF generation failed: a render worker crashed")
+
+    def _restart(self) -> None:
+        """Replace a pool whose worker died (e.g. crashed inside cairo)."""
+        logger.error("PDF worker pool broken, restarting")
+        self.shutdown()
+        self.start()
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "in_flight": self._in_flight,
+            "max_pending": self.max_pending,
+        }
+
+
+pdf_pool = PDFRenderPool(PDF_WORKERS, PDF_MAX_PENDING, PDF_JOB_TIMEOUT, PDF_POOL_START_METHOD)
@@ -1,16 +1,109 @@
 # backend/services/pdf_service.py
 
 import re
-from typing import List
-from weasyprint import HTML
+from bisect import bisect_right
+from typing import TYPE_CHECKING, List, Optional
+
+if TYPE_CHECKING:
+    from weasyprint import CSS
+    from weasyprint.text.fonts import FontConfiguration
+
+# This CSS will be used for both the web preview and the PDF
+PROFESSIONAL_STYLE = """
+    <style>
+        @page {
+            size: letter;
+            margin: 0.75in;
+        }
+        
+        * {
+            margin: 0;
+            padding: 0;
+            box-sizing: border-box;
+        }
+        
+        body {
+            font-family: 'Georgia', 'Times New Roman', serif;
+            line-height: 1.5;
+            color: #1a1a1a;
+            font-size: 11pt;
+            max-width: 8.5in; /* Added for web preview centering */
+            margin: 0 auto;   /* Added for web preview centering */
+            background: white;
+        }
+        
+        h1 { font-size: 26pt; font-weight: 700; margin-bottom: 8px; color: #000; }
+        h2 { font-size: 14pt; font-weight: 700; margin-top: 22px; margin-bottom: 10px; border-bottom: 2px solid #000; padding-bottom: 4px; letter-spacing: 1px; text-transform: uppercase; color: #000; page-break-after: avoid; }
+        h3 { font-size: 12pt; font-weight: 600; margin-top: 12px; margin-bottom: 4px; color: #000; }
+        p { margin: 6px 0; }
+        ul { margin: 8px 0; padding-left: 24px; }
+        li { margin: 4px 0; }
+        strong, b { font-weight: 700 !important; color: #000 !important; }
+        
+        .job-entry { page-break-inside: avoid; margin-bottom: 16px; }
+        
+        /* Modern CSS for flexbox layout in job headers, supported by WeasyPrint */
+        .job-header { display: flex; justify-content: space-between; align-items: baseline; margin-bottom: 4px; }
+        .job-title { font-weight: 700; font-size: 11pt; color: #000; }
+        .date { font-size: 10pt; color: #444; font-style: italic; white-space: nowrap; }
+    </style>
+    """
+
+_STYLE_OPEN = "<style>"
+_STYLE_CLOSE = "</style>"
+# WeasyPrint applies the pre-parsed stylesheet at user origin, below every
+# author rule. Other stylesheets or !important declarations could then win
+# where the embedded copy (last in <head>, author origin) used to, so
+# documents that have them keep the embedded copy. Plain inline styles win
+# either way.
+_AUTHOR_STYLES = re.compile(r"<style|<link|!\s*important", re.IGNORECASE)
+
+# Compiled once per process (see warm_up) and shared by every render.
+# WeasyPrint itself (cairo, pango, fontconfig) is only imported here, so
+# processes that never render a PDF never load it.
+_font_config: Optional["FontConfiguration"] = None
+_resume_stylesheet: Optional["CSS"] = None
+
+
+def _get_resume_stylesheet() -> "CSS":
+    global _font_config, _resume_stylesheet
+    if _resume_stylesheet is None:
+        from weasyprint import CSS
+        from weasyprint.text.fonts import FontConfiguration
+
+        _font_config = FontConfiguration()
+        css_text = PROFESSIONAL_STYLE.strip()[len(_STYLE_OPEN):-len(_STYLE_CLOSE)]
+        _resume_stylesheet = CSS(string=css_text, font_config=_font_config)
+    return _resume_stylesheet
+
+
+def warm_up() -> None:
+    """
+    Parse the resume stylesheet and do one throwaway render, so font
+    discovery (fontconfig) and layout caches are paid before the first request.
+    """
+    html_to_pdf(generate_preview_html(
+        "<h1>Jane Doe</h1><h2>Experience</h2><p><strong>Python</strong> engineer</p>"
+    ))
+
 
 def html_to_pdf(html_content: str, keywords: List[str] = None) -> bytes:
     """
     Convert HTML to PDF using WeasyPrint.
     This is more reliable in server environments than browser-based tools.
+    HTML produced by generate_preview_html has its embedded stylesheet swapped
+    for the pre-parsed one instead of being parsed again on every call, when
+    it has no other styles that the swap would let win.
     """
     try:
-        return HTML(string=html_content).write_pdf()
+        from weasyprint import HTML
+
+        stylesheet = _get_resume_stylesheet()
+        if PROFESSIONAL_STYLE in html_content:
+            unstyled = html_content.replace(PROFESSIONAL_STYLE, "", 1)
+            if not _AUTHOR_STYLES.search(unstyled):
+                return HTML(string=unstyled).write_pdf(stylesheets=[stylesheet], font_config=_font_config)
+        return HTML(string=html_content).write_pdf(font_config=_font_config)
             
     except Exception as e:
         # Add more context to the error
@@ -33,33 +126,139 @@ def fix_colors(html: str) -> str:
     return html
 
 
+_STRONG_BLOCK = re.compile(r'(<strong[^>]*>.*?</strong>)', re.IGNORECASE | re.DOTALL)
+_HIGHLIGHT_OPEN = '<strong style="font-weight: 700; color: #000;">'
+_TRIE_END = ""
+
+
+def _fold(text: str) -> str:
+    """Lowercase without changing the string length, so indices stay aligned."""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    return "".join(c.lower() if len(c.lower()) == 1 else c for c in text)
+
+
+def _is_word(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+def _trie_pattern(node: dict) -> str:
+    """
+    Regex that matches wherever some keyword in the trie starts. Factoring
+    the alternation by shared prefixes keeps the scan fast for large
+    keyword sets, since `re` tries alternatives one by one.
+    """
+    if _TRIE_END in node:
+        return ""
+    branches = [re.escape(ch) + _trie_pattern(child) for ch, child in node.items()]
+    return branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+
+
+def _highlight_segment(part: str, hit_pattern: re.Pattern, trie: dict) -> str:
+    """
+    Highlight one text segment that sits outside any <strong> block.
+
+    All keyword occurrences are collected in a single pass: the compiled
+    trie pattern finds every word-boundary position where some keyword
+    starts, and a walk of the keyword trie from there lists each keyword
+    matching at it. The occurrences are then accepted in priority order
+    (longest keyword first, leftmost first), with the same boundary rules
+    as the old per-keyword regex loop, so the output is unchanged.
+    """
+    folded = _fold(part)
+    size = len(part)
+    candidates: dict = {}
+
+    # Mid-word positions only matter right after another occurrence, since a
+    # highlighted span counts as a boundary; queue those as they are found.
+    pending = [m.start() for m in hit_pattern.finditer(part)]
+    seen = set(pending)
+    while pending:
+        start = pending.pop()
+        node = trie
+        for j in range(start, size):
+            node = node.get(folded[j])
+            if node is None:
+                break
+            ranks = node.get(_TRIE_END)
+            if ranks:
+                end = j + 1
+                for rank in ranks:
+                    candidates.setdefault(rank, []).append((start, end))
+                if end < size and end not in seen and (part[j] == "<" or _is_word(part[j])):
+                    seen.add(end)
+                    pending.append(end)
+
+    if not candidates:
+        return part
+
+    starts: List[int] = []
+    ends: List[int] = []
+    for rank in sorted(candidates):
+        occurrences = sorted(candidates[rank])
+        accepted = []
+        cursor = 0
+        for start, end in occurrences:
+            if start < cursor:
+                continue
+            i = bisect_right(starts, start)
+            if (i and ends[i - 1] > start) or (i < len(starts) and starts[i] < end):
+                continue
+            # A previously highlighted span acts as a segment edge, which the
+            # lookbehind/lookahead of the old regex saw as start/end of string.
+            before_ok = start == 0 or (i and ends[i - 1] == start) or not (
+                part[start - 1] == "<" or _is_word(part[start - 1]))
+            after_ok = end == size or (i < len(starts) and starts[i] == end) or not (
+                part[end] == ">" or _is_word(part[end]))
+            if before_ok and after_ok:
+                accepted.append((start, end))
+                cursor = end
+        if accepted:
+            spans = sorted(list(zip(starts, ends)) + accepted)
+            starts = [s for s, _ in spans]
+            ends = [e for _, e in spans]
+
+    if not starts:
+        return part
+
+    out = []
+    pos = 0
+    for start, end in zip(starts, ends):
+        out.append(part[pos:start])
+        out.append(_HIGHLIGHT_OPEN)
+        out.append(part[start:end])
+        out.append("</strong>")
+        pos = end
+    out.append(part[pos:])
+    return "".join(out)
+
+
 def highlight_keywords(html: str, keywords: List[str]) -> str:
     """Make keywords bold throughout the resume."""
     if not keywords:
         return html
     
-    keywords = sorted(set(keywords), key=len, reverse=True)
-    
-    for keyword in keywords:
-        if not keyword or len(keyword) < 2:
+    keywords = [k for k in sorted(set(keywords), key=len, reverse=True) if k and len(k) >= 2]
+    if not keywords:
+        return html
+
+    trie: dict = {}
+    for rank, keyword in enumerate(keywords):
+        node = trie
+        for ch in _fold(keyword):
+            node = node.setdefault(ch, {})
+        node.setdefault(_TRIE_END, []).append(rank)
+
+    hit_pattern = re.compile(r'(?<![<\w])(?=' + _trie_pattern(trie) + ')', re.IGNORECASE)
+
+    parts = _STRONG_BLOCK.split(html)
+    for i, part in enumerate(parts):
+        if i % 2 == 1 or '<strong' in part.lower():
             continue
-        
-        escaped_keyword = re.escape(keyword)
-        pattern = re.compile(r'(?<![<\w])(' + escaped_keyword + r')(?![>\w])', re.IGNORECASE)
-        
-        parts = re.split(r'(<strong[^>]*>.*?</strong>)', html, flags=re.IGNORECASE | re.DOTALL)
-        
-        result_parts = []
-        for i, part in enumerate(parts):
-            if i % 2 == 1 or '<strong' in part.lower():
-                result_parts.append(part)
-            else:
-                modified = pattern.sub(r'<strong style="font-weight: 700; color: #000;">\1</strong>', part)
-                result_parts.append(modified)
-        
-        html = ''.join(result_parts)
-    
-    return html
+        parts[i] = _highlight_segment(part, hit_pattern, trie)
+
+    return ''.join(parts)
 
 
 def generate_preview_html(html_content: str, keywords: List[str] = None) -> str:
@@ -74,50 +273,9 @@ def generate_preview_html(html_content: str, keywords: List[str] = None) -> str:
     if keywords:
         html_content = highlight_keywords(html_content, keywords)
     
-    # This CSS will be used for both the web preview and the PDF
-    professional_css = """
-    <style>
-        @page {
-            size: letter;
-            margin: 0.75in;
-        }
-        
-        * {
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }
-        
-        body {
-            font-family: 'Georgia', 'Times New Roman', serif;
-            line-height: 1.5;
-            color: #1a1a1a;
-            font-size: 11pt;
-            max-width: 8.5in; /* Added for web preview centering */
-            margin: 0 auto;   /* Added for web preview centering */
-            background: white;
-        }
-        
-        h1 { font-size: 26pt; font-weight: 700; margin-bottom: 8px; color: #000; }
-        h2 { font-size: 14pt; font-weight: 700; margin-top: 22px; margin-bottom: 10px; border-bottom: 2px solid #000; padding-bottom: 4px; letter-spacing: 1px; text-transform: uppercase; color: #000; page-break-after: avoid; }
-        h3 { font-size: 12pt; font-weight: 600; margin-top: 12px; margin-bottom: 4px; color: #000; }
-        p { margin: 6px 0; }
-        ul { margin: 8px 0; padding-left: 24px; }
-        li { margin: 4px 0; }
-        strong, b { font-weight: 700 !important; color: #000 !important; }
-        
-        .job-entry { page-break-inside: avoid; margin-bottom: 16px; }
-        
-        /* Modern CSS for flexbox layout in job headers, supported by WeasyPrint */
-        .job-header { display: flex; justify-content: space-between; align-items: baseline; margin-bottom: 4px; }
-        .job-title { font-weight: 700; font-size: 11pt; color: #000; }
-        .date { font-size: 10pt; color: #444; font-style: italic; white-space: nowrap; }
-    </style>
-    """
-    
     if "<head>" in html_content:
-        return html_content.replace("</head>", f"{professional_css}</head>")
+        return html_content.replace("</head>", f"{PROFESSIONAL_STYLE}</head>")
     elif "<html>" in html_content:
-        return html_content.replace("<html>", f"<html><head>{professional_css}</head>")
+        return html_content.replace("<html>", f"<html><head>{PROFESSIONAL_STYLE}</head>")
     else:
-        return f"<!DOCTYPE html><html><head><meta charset='UTF-8'>{professional_css}</head><body>{html_content}</body></html>"
\ No newline at end of file
+        return f"<!DOCTYPE html><html><head><meta charset='UTF-8'>{PROFESSIONAL_STYLE}</head><body>{html_content}</body></html>"
\ No newline at end of file
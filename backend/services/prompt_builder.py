@@ -0,0 +1,230 @@
+# backend/services/prompt_builder.py
+
+import logging
+import os
+import re
+from typing import Dict, List, Tuple
+
+from dotenv import load_dotenv
+
+from services.resume_parser import normalize_resume_text
+from services.tokens import count_tokens, truncate_to_tokens
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+# Token budgets for the variable part of the tailoring prompt
+TAILOR_MAX_JD_TOKENS = int(os.getenv("TAILOR_MAX_JD_TOKENS", "3000"))
+TAILOR_MAX_RESUME_TOKENS = int(os.getenv("TAILOR_MAX_RESUME_TOKENS", "6000"))
+# The job title and company are nearly always near the top of a posting
+TAILOR_META_MAX_JD_TOKENS = int(os.getenv("TAILOR_META_MAX_JD_TOKENS", "500"))
+
+# Static part of the tailoring prompt. It is sent first (as the system
+# message) and never changes between calls, so the provider can serve it
+# from its prompt cache.
+TAILOR_INSTRUCTIONS = """You are an expert ATS optimization specialist and resume writer.
+The user message contains the original resume content and a job description.
+
+Tasks:
+1. Extract the job title and company name from the job description
+2. Identify key skills, technologies, and keywords from the JD
+3. Rewrite the resume content to naturally incorporate these keywords
+4. Maintain professional tone and truthfulness
+5. Return the content in clean, semantic HTML format
+
+IMPORTANT HTML REQUIREMENTS:
+- Use ONLY simple HTML tags: <h1>, <h2>, <h3>, <p>, <ul>, <li>, <strong>, <em>
+- NO flexbox, NO grid, NO modern CSS
+- Use inline styles for ALL formatting
+- Structure: Name (h1) → Contact Info (p) → Sections (h2) → Content
+- Use <strong> for company names, job titles, and important terms
+- Use proper hierarchy: h1 for name, h2 for sections, h3 for job titles
+
+Return ONLY a JSON object with this exact structure:
+{
+    "job_title": "extracted job title",
+    "company": "extracted company name",
+    "html_content": "complete HTML resume with proper structure and inline styles"
+}
+
+Example HTML structure:
+<html>
+<body>
+<h1 style="font-size: 26pt; font-weight: 700; color: #000;">John Doe</h1>
+<p style="text-align: center; font-size: 10pt;">
+email@example.com | (123) 456-7890 | linkedin.com/in/johndoe
+</p>
+
+<h2 style="font-size: 13pt; font-weight: 700; color: #000; border-bottom: 2px solid #000; margin-top: 20px;">PROFESSIONAL SUMMARY</h2>
+<p>Senior Software Engineer with 5+ years of experience in <strong>Python</strong>, <strong>FastAPI</strong>, and <strong>Gen AI</strong>...</p>
+
+<h2 style="font-size: 13pt; font-weight: 700; color: #000; border-bottom: 2px solid #000; margin-top: 20px;">EXPERIENCE</h2>
+
+<div style="margin-bottom: 15px;">
+<div style="display: flex; justify-content: space-between;">
+<h3 style="font-size: 12pt; font-weight: 700; color: #000;">Senior Software Engineer</h3>
+<span style="font-size: 10pt; color: #444; font-style: italic;">Jan 2020 - Present</span>
+</div>
+<p style="font-weight: 600; color: #000;"><strong>Google Inc.</strong> - Mountain View, CA</p>
+<ul>
+<li>Led development of <strong>AI-powered</strong> features using <strong>Python</strong> and <strong>TensorFlow</strong></li>
+<li>Improved system performance by 40% through optimization</li>
+</ul>
+</div>
+
+<h2 style="font-size: 13pt; font-weight: 700; color: #000; border-bottom: 2px solid #000; margin-top: 20px;">SKILLS</h2>
+<p><strong>Languages:</strong> Python, JavaScript, SQL</p>
+<p><strong>Frameworks:</strong> FastAPI, React, Django</p>
+<p><strong>Tools:</strong> Docker, Kubernetes, AWS, Git</p>
+
+</body>
+</html>
+"""
+
+# Static instructions for tailoring a single resume section. The prompt
+# depends only on the section and its keywords (never on the rest of the
+# job description), so the reply can be reused for any similar posting.
+SECTION_INSTRUCTIONS = """You are an expert ATS optimization specialist and resume writer.
+The user message contains ONE section of a resume and the job keywords that section already covers.
+
+Rewrite the section so those keywords stand out:
+- Lead with the most relevant points and phrase them with the exact keyword wording
+- Wrap each keyword occurrence in <strong>
+- Keep every fact: employers, titles, dates, degrees, numbers. Never invent experience or skills
+- Keep it about the same length as the original
+
+Return ONLY a JSON object: {"html_content": "..."} holding the section body as HTML.
+- Do NOT include the section heading, <html> or <body>
+- Use ONLY <p>, <ul>, <li>, <strong>, <em>, <h3>, <div>, <span>
+- An experience entry is ONE <div class="job-entry">: an <h3> with the title and company,
+  a <p> with dates and location if given, then a <ul> of achievements
+- A skills section lists skills in <p> lines, most relevant first
+"""
+
+JOB_META_INSTRUCTIONS = """Extract the job title and the hiring company's name from the job posting in the user message.
+Return ONLY a JSON object: {"job_title": "...", "company": "..."}. Use "Unknown" if a value is not stated.
+"""
+
+# Section headings whose content does not help tailoring
+_BOILERPLATE_HEADING = re.compile(
+    r"^(?:benefits|perks|perks (?:and|&) benefits|(?:our |the )?benefits(?: (?:and|&) perks)?|"
+    r"what we offer|what's in it for you|why (?:join|work)\b.*|compensation (?:and|&) benefits|"
+    r"about us|about the company|who we are|our (?:story|mission|values|culture)|life at\b.*|"
+    r"equal (?:employment )?opportunity.*|eeo.*|diversity.*|accommodations?|privacy.*|"
+    r"disclaimer|legal|e-verify.*)$",
+    re.IGNORECASE,
+)
+# Company descriptions often carry the company name in their first sentence
+_ABOUT_HEADING = re.compile(r"^(?:about us|about the company|who we are)$", re.IGNORECASE)
+# Headings that start a useful section again
+_CONTENT_HEADING = re.compile(
+    r"^(?:.*responsibilit.*|.*requirements?|.*qualifications?|what you'?ll (?:do|bring|need)|"
+    r"what we'?re looking for|about the (?:role|job|position|team)|the role|your role|role overview|"
+    r"job description|position summary|overview|.*skills.*|.*experience|nice to have|"
+    r"preferred.*|who you are|you have|you will|duties|tech(?:nology)? stack|must have)$",
+    re.IGNORECASE,
+)
+# Standalone legal paragraphs that show up without a heading
+_BOILERPLATE_PARAGRAPH = re.compile(
+    r"equal (?:employment )?opportunity employer|without regard to (?:race|age|sex)|"
+    r"reasonable accommodations?|e-verify|pay transparency|applicant privacy",
+    re.IGNORECASE,
+)
+_FIRST_SENTENCE = re.compile(r"^.*?[.!?](?=\s|$)")
+# Never trust compaction that throws away nearly everything
+_MIN_KEPT_FRACTION = 0.2
+
+
+def _heading_text(line: str):
+    """The heading text if the line looks like a section heading, else None."""
+    stripped = line.strip().strip("#*_").strip()
+    if not stripped or len(stripped) > 60 or stripped[-1] in ".!?,;":
+        return None
+    return stripped.rstrip(":").strip()
+
+
+def compact_job_description(job_description: str) -> str:
+    """
+    Drop sections that do not help tailoring (benefits, EEO and legal
+    statements, company background) and collapse whitespace. The first
+    sentence of an "About us" section is kept since it usually names the
+    company.
+    """
+    normalized = normalize_resume_text(job_description)
+    kept: List[str] = []
+    skipping = False
+    keep_first_sentence = False
+    for line in normalized.split("\n"):
+        heading = _heading_text(line)
+        if heading is not None and _BOILERPLATE_HEADING.match(heading):
+            skipping = True
+            keep_first_sentence = bool(_ABOUT_HEADING.match(heading))
+            continue
+        if skipping:
+            if heading is not None and (line.rstrip().endswith(":") or _CONTENT_HEADING.match(heading)):
+                skipping = False
+            elif keep_first_sentence and line.strip():
+                sentence = _FIRST_SENTENCE.match(line.strip())
+                kept.append(sentence.group(0) if sentence else line.strip())
+                keep_first_sentence = False
+                continue
+            else:
+                continue
+        if _BOILERPLATE_PARAGRAPH.search(line):
+            continue
+        kept.append(line)
+
+    compacted = normalize_resume_text("\n".join(kept))
+    if len(compacted) < len(normalized) * _MIN_KEPT_FRACTION:
+        return normalized
+    return compacted
+
+
+def prepare_tailor_inputs(original_resume: str, job_description: str) -> Tuple[str, str]:
+    """Compact the job description and fit both inputs into their token budgets."""
+    resume = normalize_resume_text(original_resume)
+    jd = compact_job_description(job_description)
+    jd_tokens = count_tokens(jd)
+    if jd_tokens > TAILOR_MAX_JD_TOKENS:
+        logger.warning(f"Job description truncated from {jd_tokens} to {TAILOR_MAX_JD_TOKENS} tokens")
+        jd = truncate_to_tokens(jd, TAILOR_MAX_JD_TOKENS)
+    resume_tokens = count_tokens(resume)
+    if resume_tokens > TAILOR_MAX_RESUME_TOKENS:
+        logger.warning(f"Resume truncated from {resume_tokens} to {TAILOR_MAX_RESUME_TOKENS} tokens")
+        resume = truncate_to_tokens(resume, TAILOR_MAX_RESUME_TOKENS)
+    return resume, jd
+
+
+def tailor_messages(resume: str, job_description: str) -> List[Dict[str, str]]:
+    """Chat messages for tailoring: the static instructions first, then the inputs."""
+    return [
+        {"role": "system", "content": TAILOR_INSTRUCTIONS},
+        {
+            "role": "user",
+            "content": f"Original Resume Content:\n{resume}\n\nJob Description:\n{job_description}"
+        },
+    ]
+
+
+def section_messages(kind: str, title: str, text: str, keywords: List[str]) -> List[Dict[str, str]]:
+    """Chat messages for tailoring one resume section towards `keywords`."""
+    return [
+        {"role": "system", "content": SECTION_INSTRUCTIONS},
+        {
+            "role": "user",
+            "content": f"Section: {title or kind} ({kind})\nKeywords: {', '.join(keywords)}\n\n{text}"
+        },
+    ]
+
+
+def job_meta_messages(job_description: str) -> List[Dict[str, str]]:
+    """Chat messages for reading the job title and company off the top of a posting."""
+    jd = truncate_to_tokens(compact_job_description(job_description), TAILOR_META_MAX_JD_TOKENS)
+    return [
+        {"role": "system", "content": JOB_META_INSTRUCTIONS},
+        {"role": "user", "content": jd},
+    ]
+
+
+def count_message_tokens(messages: List[Dict[str, str]]) -> int:
+    return sum(count_tokens(message["content"]) for message in messages)
@@ -0,0 +1,152 @@
+# backend/services/rate_limiter.py
+
+import asyncio
+import logging
+import os
+import re
+import time
+from collections import deque
+from typing import Deque, Mapping, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+OPENAI_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "32"))
+# Pause new calls when fewer tokens than this remain in the provider's window
+OPENAI_TOKEN_FLOOR = int(os.getenv("OPENAI_TOKEN_FLOOR", "8000"))
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_reset_duration(value: Optional[str]) -> Optional[float]:
+    """Parse OpenAI reset durations such as "1s", "6m0s" or "250ms" into seconds."""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+def _int_header(headers: Mapping[str, str], name: str) -> Optional[int]:
+    try:
+        return int(headers[name])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+class AdaptiveRateLimiter:
+    """
+    Concurrency gate for upstream LLM calls that adapts to the provider's
+    rate-limit feedback (additive increase, multiplicative decrease).
+
+    `observe` reads the x-ratelimit-* headers of each response and pauses
+    new calls until the window resets when requests or tokens run low;
+    `on_rate_limited` halves the concurrency limit after a 429.
+    """
+
+    def __init__(self, max_concurrency: int, token_floor: int = 0):
+        self.max_concurrency = max(max_concurrency, 1)
+        self.limit = self.max_concurrency
+        self.token_floor = token_floor
+        self._active = 0
+        self._successes = 0
+        self._paused_until = 0.0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    async def acquire(self) -> None:
+        while True:
+            delay = self._paused_until - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            elif self._active < self.limit:
+                self._active += 1
+                return
+            else:
+                waiter = asyncio.get_running_loop().create_future()
+                self._waiters.append(waiter)
+                try:
+                    await waiter
+                except asyncio.CancelledError:
+                    # Woken, then cancelled (e.g. by a deadline) before resuming:
+                    # pass the wakeup on, or the next waiter would sleep until its own deadline
+                    if waiter.done() and not waiter.cancelled():
+                        self._wake(1)
+                    raise
+                finally:
+                    if waiter in self._waiters:
+                        self._waiters.remove(waiter)
+
+    def release(self) -> None:
+        self._active -= 1
+        self._wake(self.limit - self._active)
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.release()
+
+    def _wake(self, count: int) -> None:
+        while count > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                count -= 1
+
+    def _pause(self, seconds: float) -> None:
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def observe(self, headers: Mapping[str, str]) -> None:
+        """Feed the headers of a successful response."""
+        remaining_requests = _int_header(headers, "x-ratelimit-remaining-requests")
+        if remaining_requests is not None and remaining_requests <= self._active:
+            reset = parse_reset_duration(headers.get("x-ratelimit-reset-requests"))
+            if reset:
+                self._pause(reset)
+
+        remaining_tokens = _int_header(headers, "x-ratelimit-remaining-tokens")
+        if remaining_tokens is not None and remaining_tokens < self.token_floor:
+            reset = parse_reset_duration(headers.get("x-ratelimit-reset-tokens"))
+            if reset:
+                self._pause(reset)
+
+        self._successes += 1
+        if self._successes >= self.limit and self.limit < self.max_concurrency:
+            self.limit += 1
+            self._successes = 0
+            self._wake(1)
+
+    def on_rate_limited(self, headers: Optional[Mapping[str, str]] = None) -> float:
+        """Back off after a 429; returns the pause applied in seconds."""
+        headers = headers or {}
+        retry_after = (
+            parse_reset_duration(headers.get("retry-after"))
+            or parse_reset_duration(headers.get("x-ratelimit-reset-requests"))
+            or 1.0
+        )
+        self.limit = max(1, self.limit // 2)
+        self._successes = 0
+        self._pause(retry_after)
+        logger.warning(f"OpenAI rate limited: concurrency now {self.limit}, pausing {retry_after:.1f}s")
+        return retry_after
+
+    def stats(self) -> dict:
+        return {
+            "limit": self.limit,
+            "max_concurrency": self.max_concurrency,
+            "active": self._active,
+            "waiting": len(self._waiters),
+            "paused_for": max(0.0, self._paused_until - time.monotonic()),
+        }
+
+
+openai_limiter = AdaptiveRateLimiter(OPENAI_MAX_CONCURRENCY, OPENAI_TOKEN_FLOOR)
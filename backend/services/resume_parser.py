@@ -1,38 +1,128 @@
 # File: backend/services/resume_parser.py
-from PyPDF2 import PdfReader
-from docx import Document
-from pathlib import Path
+# PyPDF2 and python-docx are imported inside the extractors, on first use
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, Iterator, List, Optional, Union
+from dotenv import load_dotenv
+import io
+import multiprocessing
+import os
 import re
 
-def extract_text_from_pdf(file_path: str) -> str:
-    """Extract text from PDF file"""
+load_dotenv()
+
+# A path, or an open binary file (e.g. the upload's spooled temp file)
+ResumeSource = Union[str, BinaryIO]
+
+# Documents with at least this many pages are split across a process pool
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "8"))
+# 0 or 1 disables parallel extraction
+PDF_PARSE_WORKERS = int(os.getenv("PDF_PARSE_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+_parse_pool: Optional[ProcessPoolExecutor] = None
+
+def _get_parse_pool() -> ProcessPoolExecutor:
+    global _parse_pool
+    if _parse_pool is None:
+        _parse_pool = ProcessPoolExecutor(
+            max_workers=PDF_PARSE_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _parse_pool
+
+def shutdown_parse_pool() -> None:
+    global _parse_pool
+    if _parse_pool is not None:
+        _parse_pool.shutdown(wait=False, cancel_futures=True)
+        _parse_pool = None
+
+def _extract_page_range(data: bytes, start: int, stop: int) -> List[str]:
+    """Worker: text of pages [start, stop) of the PDF in `data`"""
+    from PyPDF2 import PdfReader
+
+    reader = PdfReader(io.BytesIO(data))
+    return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+def _read_source(source: ResumeSource) -> bytes:
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            return f.read()
+    source.seek(0)
+    data = source.read()
+    source.seek(0)
+    return data
+
+def extract_text_from_pdf(source: ResumeSource, workers: int = None) -> str:
+    """
+    Extract text from PDF file.
+    Long documents are split into one contiguous page range per worker and
+    extracted in parallel; the text is reassembled in page order.
+    """
+    from PyPDF2 import PdfReader
+
+    workers = PDF_PARSE_WORKERS if workers is None else workers
     try:
-        reader = PdfReader(file_path)
-        text = ""
-        for page in reader.pages:
-            text += page.extract_text() + "\n"
-        return text.strip()
+        reader = PdfReader(source)
+        page_count = len(reader.pages)
+        if workers <= 1 or page_count < max(PDF_PARALLEL_MIN_PAGES, 2):
+            return "\n".join(page.extract_text() or "" for page in reader.pages).strip()
+
+        data = _read_source(source)
+        step = -(-page_count // workers)
+        ranges = [(start, min(start + step, page_count)) for start in range(0, page_count, step)]
+        pool = _get_parse_pool()
+        futures = [pool.submit(_extract_page_range, data, start, stop) for start, stop in ranges]
+        return "\n".join(text for future in futures for text in future.result()).strip()
     except Exception as e:
         raise ValueError(f"Failed to parse PDF: {str(e)}")
 
-def extract_text_from_docx(file_path: str) -> str:
-    """Extract text from DOCX file"""
+def _iter_docx_blocks(doc) -> Iterator[str]:
+    """Paragraph and table text in document order; table rows become "cell | cell" lines"""
+    from docx.table import Table
+    from docx.text.paragraph import Paragraph
+
+    for child in doc.element.body.iterchildren():
+        if child.tag.endswith("}p"):
+            yield Paragraph(child, doc).text
+        elif child.tag.endswith("}tbl"):
+            for row in Table(child, doc).rows:
+                cells, seen = [], set()
+                for cell in row.cells:
+                    # Merged cells are repeated for every grid column they span
+                    if id(cell._tc) in seen:
+                        continue
+                    seen.add(id(cell._tc))
+                    text = cell.text.strip()
+                    if text:
+                        cells.append(text)
+                if cells:
+                    yield " | ".join(cells)
+
+def extract_text_from_docx(source: ResumeSource) -> str:
+    """Extract text from DOCX file (paragraphs and tables)"""
+    from docx import Document
+
     try:
-        doc = Document(file_path)
-        text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
+        doc = Document(source)
+        text = "\n".join(_iter_docx_blocks(doc))
         return text.strip()
     except Exception as e:
         raise ValueError(f"Failed to parse DOCX: {str(e)}")
 
-def parse_resume(file_path: str, file_type: str) -> str:
-    """Main parser function"""
+def parse_resume(source: ResumeSource, file_type: str) -> str:
+    """Main parser function (accepts a path or an open binary file)"""
     if file_type == "pdf":
-        return extract_text_from_pdf(file_path)
+        return extract_text_from_pdf(source)
     elif file_type == "docx":
-        return extract_text_from_docx(file_path)
+        return extract_text_from_docx(source)
     else:
         raise ValueError("Unsupported file type")
 
+def normalize_resume_text(text: str) -> str:
+    """Compact whitespace: trim lines, collapse runs of spaces and blank lines"""
+    lines = [re.sub(r'[ \t\u00a0]+', ' ', line).strip() for line in text.splitlines()]
+    text = "\n".join(lines)
+    return re.sub(r'\n{3,}', '\n\n', text).strip()
+
 def extract_email_from_text(text: str) -> str:
     """Extract email address from text"""
     pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
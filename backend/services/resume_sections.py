@@ -0,0 +1,178 @@
+# backend/services/resume_sections.py
+
+import hashlib
+import html
+import re
+from typing import List, Optional
+
+from services.resume_parser import normalize_resume_text
+
+# Heading text (without punctuation, any case) -> kind of section
+_SECTION_HEADINGS = [
+    ("summary", r"(?:professional |career |executive )?(?:summary|profile|objective)|about me"),
+    ("experience", r"(?:professional |work |relevant |industry )?(?:experience|employment(?: history)?)|"
+                   r"work history|career history"),
+    ("skills", r"(?:technical |core |key )?(?:skills|competencies|technologies)(?: (?:and|&) \w+)?|tech stack"),
+    ("projects", r"(?:selected |personal |key |side )?projects"),
+    ("education", r"education(?: (?:and|&) training)?|academic background"),
+    ("other", r"certifications?|licenses?(?: (?:and|&) certifications)?|courses|publications|awards|"
+              r"honou?rs(?: (?:and|&) awards)?|languages|interests|volunteer(?:ing| experience)?|activities|references"),
+]
+_HEADING_PATTERNS = [(kind, re.compile(rf"^(?:{pattern})$", re.IGNORECASE)) for kind, pattern in _SECTION_HEADINGS]
+_BULLET = re.compile(r"^\s*[-*•·–▪●◦]\s*")
+
+# Kinds whose content is worth rewriting for a particular job
+TAILORABLE_KINDS = ("summary", "experience", "skills", "projects")
+
+
+class ResumeSection:
+    """
+    One block of a resume: the header (name and contact lines), a whole
+    section, or a single entry of the experience section.
+    """
+
+    def __init__(self, kind: str, title: Optional[str], lines: List[str], first_of_title: bool = True):
+        self.kind = kind
+        self.title = title
+        self.lines = lines
+        # Entries after the first one of a section do not repeat its heading
+        self.first_of_title = first_of_title
+
+    @property
+    def text(self) -> str:
+        return "\n".join(self.lines)
+
+    @property
+    def digest(self) -> str:
+        """Content hash; identical sections of different resumes share it."""
+        return hashlib.sha256(f"{self.kind}\n{self.title}\n{self.text}".encode("utf-8")).hexdigest()[:32]
+
+
+def _heading_kind(line: str) -> Optional[str]:
+    stripped = line.strip().strip("#*_=").strip().rstrip(":").strip()
+    if not stripped or len(stripped) > 40:
+        return None
+    for kind, pattern in _HEADING_PATTERNS:
+        if pattern.match(stripped):
+            return kind
+    return None
+
+
+def _split_entries(lines: List[str]) -> List[List[str]]:
+    """
+    Split an experience section into entries. A new entry starts at a
+    non-bullet line once the current entry has bullets and the line follows
+    a bullet or a blank line (a title line after the previous job's bullets).
+    """
+    entries: List[List[str]] = []
+    current: List[str] = []
+    has_bullets = False
+    previous = ""
+    for line in lines:
+        is_bullet = bool(_BULLET.match(line))
+        if line and not is_bullet and has_bullets and (not previous or _BULLET.match(previous)):
+            entries.append(current)
+            current, has_bullets = [], False
+        if line or current:
+            current.append(line)
+        has_bullets = has_bullets or is_bullet
+        previous = line
+    if current:
+        entries.append(current)
+    return [[line for line in entry if line] for entry in entries if any(entry)]
+
+
+def split_resume_sections(resume_text: str, min_sections: int = 2) -> List[ResumeSection]:
+    """
+    Split resume text into its header and sections, with one section per
+    experience entry. Returns [] when fewer than `min_sections` headings
+    are recognized, i.e. the resume has no structure to work with.
+    """
+    lines = normalize_resume_text(resume_text).split("\n")
+    header: List[str] = []
+    raw_sections: List[List] = []
+    for line in lines:
+        kind = _heading_kind(line)
+        if kind is not None:
+            raw_sections.append([kind, line.strip().strip("#*_=").strip().rstrip(":").strip(), []])
+        elif raw_sections:
+            raw_sections[-1][2].append(line)
+        else:
+            header.append(line)
+
+    if len(raw_sections) < min_sections:
+        return []
+
+    sections: List[ResumeSection] = []
+    header = [line for line in header if line]
+    if header:
+        sections.append(ResumeSection("header", None, header))
+    for kind, title, body in raw_sections:
+        if kind == "experience":
+            entries = _split_entries(body)
+            if not entries:
+                sections.append(ResumeSection(kind, title, []))
+            for i, entry in enumerate(entries):
+                sections.append(ResumeSection(kind, title, entry, first_of_title=i == 0))
+        else:
+            sections.append(ResumeSection(kind, title, [line for line in body if line]))
+    return sections
+
+
+def keywords_in(text: str, keywords: List[str]) -> List[str]:
+    """The keywords that occur in text as whole words (case-insensitive), in keyword order."""
+    found = []
+    for keyword in keywords:
+        if keyword and re.search(rf"(?<!\w){re.escape(keyword)}(?!\w)", text, re.IGNORECASE):
+            found.append(keyword)
+    return found
+
+
+def section_heading_html(section: ResumeSection) -> str:
+    if section.title is None or not section.first_of_title:
+        return ""
+    return f"<h2>{html.escape(section.title.upper())}</h2>"
+
+
+def render_section_html(section: ResumeSection) -> str:
+    """Untailored HTML for a section body: bullets become lists, other lines paragraphs."""
+    if section.kind == "header":
+        name, *contact = section.lines
+        return f"<h1>{html.escape(name)}</h1>" + "".join(f"<p>{html.escape(line)}</p>" for line in contact)
+
+    parts: List[str] = []
+    in_list = False
+    for i, line in enumerate(section.lines):
+        if _BULLET.match(line):
+            if not in_list:
+                parts.append("<ul>")
+                in_list = True
+            parts.append(f"<li>{html.escape(_BULLET.sub('', line))}</li>")
+            continue
+        if in_list:
+            parts.append("</ul>")
+            in_list = False
+        if section.kind == "experience" and i == 0:
+            parts.append(f'<h3>{html.escape(line)}</h3>')
+        else:
+            parts.append(f"<p>{html.escape(line)}</p>")
+    if in_list:
+        parts.append("</ul>")
+    body = "".join(parts)
+    if section.kind == "experience":
+        return f'<div class="job-entry">{body}</div>'
+    return body
+
+
+RESUME_HTML_OPEN = "<html><body>\n"
+RESUME_HTML_CLOSE = "</body></html>"
+
+
+def section_html(section: ResumeSection, body: str) -> str:
+    """One section's heading (if it starts a section) and body, as emitted into the resume."""
+    return f"{section_heading_html(section)}{body}\n"
+
+
+def assemble_resume_html(sections: List[ResumeSection], bodies: List[str]) -> str:
+    """The full resume document from each section's (tailored or rendered) body, in order."""
+    return RESUME_HTML_OPEN + "".join(section_html(s, b) for s, b in zip(sections, bodies)) + RESUME_HTML_CLOSE
@@ -0,0 +1,154 @@
+# backend/services/section_tailor.py
+
+import asyncio
+import logging
+import os
+from dotenv import load_dotenv
+from typing import AsyncIterator, Awaitable, Dict, List, Optional
+
+from services.openai_service import (
+    extract_job_meta,
+    stream_tailor_resume_content,
+    tailor_resume_content,
+    tailor_section,
+)
+from services.resilience import CircuitOpenError
+from services.resume_sections import (
+    RESUME_HTML_CLOSE,
+    RESUME_HTML_OPEN,
+    TAILORABLE_KINDS,
+    ResumeSection,
+    assemble_resume_html,
+    keywords_in,
+    render_section_html,
+    section_html,
+    split_resume_sections,
+)
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# "full" rewrites the whole resume in a single call. "sections" (opt-in)
+# tailors the sections that mention the job's keywords one call each and
+# keeps the others as written, falling back to "full" when the resume has
+# no recognizable sections or no section mentions a keyword
+TAILOR_MODE = os.getenv("TAILOR_MODE", "full")
+# A section is only sent to the model when it mentions this many of the job's keywords
+SECTION_TAILOR_MIN_KEYWORDS = int(os.getenv("SECTION_TAILOR_MIN_KEYWORDS", "1"))
+
+
+def plan_sections(sections: List[ResumeSection], keywords: List[str]) -> List[Optional[List[str]]]:
+    """For each section, the keywords to tailor it towards, or None to keep it as written."""
+    # The summary may highlight anything the rest of the resume backs up
+    resume_keywords = keywords_in("\n".join(section.text for section in sections), keywords)
+    plan: List[Optional[List[str]]] = []
+    for section in sections:
+        if section.kind not in TAILORABLE_KINDS or not section.lines:
+            plan.append(None)
+            continue
+        found = resume_keywords if section.kind == "summary" else keywords_in(section.text, keywords)
+        plan.append(found if found and len(found) >= SECTION_TAILOR_MIN_KEYWORDS else None)
+    return plan
+
+
+async def _section_body(section: ResumeSection, keywords: Optional[List[str]]) -> str:
+    if keywords is None:
+        return render_section_html(section)
+    try:
+        return await tailor_section(section, keywords)
+    except CircuitOpenError:
+        raise
+    except Exception as e:
+        # One failed section should not fail the whole resume
+        logger.warning(f"Keeping the {section.kind} section as written: {str(e)}")
+        return render_section_html(section)
+
+
+async def _start_sections(sections: List[ResumeSection], keywords: Awaitable[List[str]]) -> List[asyncio.Task]:
+    """Start tailoring each selected section; [] when no section mentions a keyword."""
+    plan = plan_sections(sections, await keywords)
+    selected = sum(k is not None for k in plan)
+    if not selected:
+        logger.info("No resume section mentions the job's keywords, tailoring the whole resume")
+        return []
+    logger.info(f"Tailoring {selected} of {len(sections)} resume sections")
+    return [asyncio.create_task(_section_body(s, k)) for s, k in zip(sections, plan)]
+
+
+def _cancel(tasks: List[asyncio.Task]) -> None:
+    for task in tasks:
+        if not task.done():
+            task.cancel()
+
+
+async def tailor_resume_sections(
+    original_resume: str, job_description: str, keywords: Awaitable[List[str]]
+) -> Dict:
+    """
+    Section-by-section variant of tailor_resume_content with the same result
+    shape. Only sections mentioning the job's keywords are rewritten, in
+    parallel, and each reply is cached on its own. `keywords` is awaited
+    here, so keyword extraction can run alongside the job title/company call.
+    """
+    sections = split_resume_sections(original_resume)
+    if not sections:
+        return await tailor_resume_content(original_resume, job_description)
+
+    # Does not depend on the keywords, so it starts right away
+    meta_task = asyncio.create_task(extract_job_meta(job_description))
+    body_tasks: List[asyncio.Task] = []
+    try:
+        body_tasks = await _start_sections(sections, keywords)
+        if not body_tasks:
+            return await tailor_resume_content(original_resume, job_description)
+        meta, *bodies = await asyncio.gather(meta_task, *body_tasks)
+    finally:
+        _cancel([meta_task, *body_tasks])
+    return {
+        "job_title": meta["job_title"],
+        "company": meta["company"],
+        "html_content": assemble_resume_html(sections, bodies),
+    }
+
+
+async def stream_tailor_sections(
+    original_resume: str, job_description: str, keywords: Awaitable[List[str]]
+) -> AsyncIterator[Dict]:
+    """
+    Streaming variant of tailor_resume_sections, with the events of
+    stream_tailor_resume_content: the job fields, then one html event per
+    section in document order as soon as it (and those before it) are
+    done, then the result.
+    """
+    sections = split_resume_sections(original_resume)
+    if not sections:
+        async for event in stream_tailor_resume_content(original_resume, job_description):
+            yield event
+        return
+
+    meta_task = asyncio.create_task(extract_job_meta(job_description))
+    body_tasks: List[asyncio.Task] = []
+    try:
+        body_tasks = await _start_sections(sections, keywords)
+        if not body_tasks:
+            async for event in stream_tailor_resume_content(original_resume, job_description):
+                yield event
+            return
+        meta = await meta_task
+        for name in ("job_title", "company"):
+            yield {"type": "field", "name": name, "value": meta[name]}
+        yield {"type": "html", "chunk": RESUME_HTML_OPEN}
+        bodies = []
+        for section, task in zip(sections, body_tasks):
+            bodies.append(await task)
+            yield {"type": "html", "chunk": section_html(section, bodies[-1])}
+        yield {"type": "html", "chunk": RESUME_HTML_CLOSE}
+    finally:
+        _cancel([meta_task, *body_tasks])
+
+    yield {"type": "result", "result": {
+        "job_title": meta["job_title"],
+        "company": meta["company"],
+        "html_content": assemble_resume_html(sections, bodies),
+    }}
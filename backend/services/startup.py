@@ -0,0 +1,130 @@
+# backend/services/startup.py
+
+import asyncio
+import importlib
+import logging
+import os
+import re
+import subprocess
+import sys
+import time
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+# false runs the warm-up inside startup, before the app accepts connections
+WARMUP_BACKGROUND = os.getenv("WARMUP_BACKGROUND", "true").lower() == "true"
+# Heavy modules that are only imported on first use
+DEFERRED_MODULES = ["openai", "weasyprint", "PyPDF2", "docx", "tiktoken"]
+
+_IMPORT_TIME = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)")
+
+
+def import_modules(names: Iterable[str]) -> None:
+    """Import modules ahead of first use; a module that fails to load is left for its caller."""
+    for name in names:
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            logger.warning(f"Warm-up import of {name} failed: {str(e)}")
+
+
+class BackgroundWarmUp:
+    """
+    Runs warm-up steps (imports, pools, caches) one after another in a
+    background task, so startup finishes and the app serves requests while
+    they run. A failed step is logged and skipped; the code it warms still
+    works, only the first request using it pays the cost.
+    """
+
+    def __init__(self):
+        self._steps: List[Tuple[str, Callable[[], Awaitable[None]]]] = []
+        self._task: Optional[asyncio.Task] = None
+        self._durations: Dict[str, float] = {}
+        self._errors: Dict[str, str] = {}
+        self._done = False
+
+    def add(self, name: str, step: Callable[[], Awaitable[None]]) -> None:
+        self._steps.append((name, step))
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def run(self) -> None:
+        started = time.perf_counter()
+        for name, step in self._steps:
+            step_started = time.perf_counter()
+            try:
+                await step()
+            except Exception as e:
+                logger.warning(f"Warm-up step {name} failed: {str(e)}")
+                self._errors[name] = str(e)
+            self._durations[name] = time.perf_counter() - step_started
+        self._done = True
+        logger.info(f"Warm-up finished in {time.perf_counter() - started:.2f}s")
+
+    @property
+    def ready(self) -> bool:
+        return self._done
+
+    def stats(self) -> dict:
+        return {
+            "ready": self._done,
+            "steps": {name: round(seconds, 3) for name, seconds in self._durations.items()},
+            "errors": dict(self._errors),
+        }
+
+
+def profile_imports(module: str = "main", top: int = 20) -> int:
+    """
+    Print where the import time of `module` goes, measured in a fresh
+    interpreter with -X importtime: total, the slowest packages by self
+    time, and whether the deferred heavy modules stayed unloaded.
+    Returns the interpreter's exit code.
+    """
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        capture_output=True,
+        text=True,
+    )
+    wall = time.perf_counter() - started
+
+    packages: Dict[str, int] = {}
+    loaded = set()
+    total_us = 0
+    for line in result.stderr.splitlines():
+        match = _IMPORT_TIME.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        loaded.add(name)
+        root = name.split(".")[0]
+        packages[root] = packages.get(root, 0) + int(self_us)
+        if name == module and not indent:
+            total_us = int(cumulative_us)
+
+    print(f"import {module}: {total_us / 1000:.0f} ms (interpreter wall time {wall * 1000:.0f} ms)")
+    print(f"{'package':<28} {'self ms':>9}")
+    for name, self_us in sorted(packages.items(), key=lambda item: -item[1])[:top]:
+        print(f"{name:<28} {self_us / 1000:>9.1f}")
+    print("deferred modules:", ", ".join(
+        f"{name} ({'LOADED' if name in loaded else 'not loaded'})" for name in DEFERRED_MODULES
+    ))
+    if result.returncode != 0:
+        print(result.stderr.splitlines()[-1] if result.stderr else "import failed")
+    return result.returncode
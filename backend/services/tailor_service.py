@@ -0,0 +1,58 @@
+# backend/services/tailor_service.py
+
+import asyncio
+import logging
+from typing import Dict, Tuple
+
+from database.models import Application
+from services.openai_service import tailor_resume_content
+from services.section_tailor import TAILOR_MODE, tailor_resume_sections
+from services.keyword_extractor import extract_job_keywords
+from services.pdf_service import generate_preview_html
+from services.resume_parser import extract_email_from_text
+from services.metrics import stage, timed
+
+logger = logging.getLogger(__name__)
+
+
+async def tailor_for_job(original_content: str, job_description: str) -> Tuple[Dict, Application]:
+    """
+    Run the tailoring pipeline for one job description.
+    Returns the API payload and an unsaved Application row.
+    """
+    # Extract email from JD
+    email_detected = extract_email_from_text(job_description)
+    
+    # Keyword extraction and tailoring run concurrently (section tailoring
+    # waits for the keywords only once its job title/company call is out)
+    logger.info("Extracting keywords and tailoring resume...")
+    keywords_task = asyncio.ensure_future(timed("tailor", "keywords", extract_job_keywords(job_description)))
+    if TAILOR_MODE == "sections":
+        tailoring = tailor_resume_sections(original_content, job_description, keywords_task)
+    else:
+        tailoring = tailor_resume_content(original_content, job_description)
+    try:
+        keywords, result = await asyncio.gather(keywords_task, timed("tailor", "llm_tailor", tailoring))
+    finally:
+        keywords_task.cancel()
+    logger.info(f"Extracted keywords: {keywords}")
+    
+    # Generate preview HTML (with keywords highlighted)
+    with stage("tailor", "highlight"):
+        preview_html = generate_preview_html(result["html_content"], keywords)
+    
+    application = Application(
+        company=result["company"],
+        job_title=result["job_title"],
+        job_description=job_description,
+        tailored_resume=result["html_content"],
+        status="Ready"
+    )
+    payload = {
+        "job_title": result["job_title"],
+        "company": result["company"],
+        "html_content": preview_html,
+        "email_detected": email_detected,
+        "keywords": keywords
+    }
+    return payload, application
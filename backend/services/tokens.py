@@ -0,0 +1,54 @@
+# backend/services/tokens.py
+
+import logging
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+TOKEN_ENCODING = os.getenv("TOKEN_ENCODING", "o200k_base")  # gpt-4o family
+
+_encoding = None
+_encoding_failed = False
+
+
+def _get_encoding():
+    global _encoding, _encoding_failed
+    if _encoding is None and not _encoding_failed:
+        try:
+            import tiktoken
+        except ImportError:  # optional: fall back to an estimate
+            _encoding_failed = True
+            return None
+        try:
+            _encoding = tiktoken.get_encoding(TOKEN_ENCODING)
+        except Exception as e:
+            # e.g. the BPE file cannot be downloaded in an offline container
+            logger.warning(f"Tokenizer unavailable, estimating token counts: {str(e)}")
+            _encoding_failed = True
+    return _encoding
+
+
+def count_tokens(text: str) -> int:
+    """Count tokens with tiktoken, or estimate (~4 characters per token) without it."""
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return max(1, (len(text) + 3) // 4)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut text down to at most max_tokens tokens (estimated the same way as count_tokens)."""
+    if not text or max_tokens <= 0:
+        return ""
+    encoding = _get_encoding()
+    if encoding is not None:
+        tokens = encoding.encode(text, disallowed_special=())
+        if len(tokens) <= max_tokens:
+            return text
+        return encoding.decode(tokens[:max_tokens])
+    return text[:max_tokens * 4]
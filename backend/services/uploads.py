@@ -0,0 +1,100 @@
+# backend/services/uploads.py
+
+import hashlib
+import os
+from typing import Tuple
+
+from dotenv import load_dotenv
+from fastapi import UploadFile
+from fastapi.responses import JSONResponse
+
+load_dotenv()
+
+RESUME_MAX_UPLOAD_BYTES = int(os.getenv("RESUME_MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(1024 * 1024)))
+# Room for the multipart boundaries and part headers around the file
+_MULTIPART_OVERHEAD = 16 * 1024
+
+
+class UploadTooLarge(ValueError):
+    """Raised when an uploaded file exceeds RESUME_MAX_UPLOAD_BYTES."""
+
+
+class UploadSizeLimit:
+    """
+    ASGI middleware capping upload bodies. A Content-Length over the limit is
+    rejected before any of the body is read; otherwise (e.g. chunked uploads)
+    the body is counted as it arrives and the request is cut off with a 413
+    as soon as it passes the limit, instead of being spooled in full first.
+    """
+
+    def __init__(self, app, paths, max_bytes: int = RESUME_MAX_UPLOAD_BYTES):
+        self.app = app
+        self.paths = set(paths)
+        self.max_bytes = max_bytes
+
+    async def _reject(self, scope, receive, send):
+        response = JSONResponse(
+            {"detail": f"File too large (max {self.max_bytes // (1024 * 1024)} MB)"},
+            status_code=413
+        )
+        await response(scope, receive, send)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+        limit = self.max_bytes + _MULTIPART_OVERHEAD
+        length = dict(scope["headers"]).get(b"content-length", b"")
+        if length.isdigit() and int(length) > limit:
+            await self._reject(scope, receive, send)
+            return
+
+        received = 0
+        started = False
+        rejected = False
+
+        async def limited_receive():
+            nonlocal received, rejected
+            if rejected:
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    if not started:
+                        await self._reject(scope, receive, send)
+                    rejected = True
+                    # The app stops reading as if the client had gone away
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def limited_send(message):
+            nonlocal started
+            if rejected and not started:
+                # The 413 went out already; drop the app's reply to the "disconnect"
+                return
+            if message["type"] == "http.response.start":
+                started = True
+            await send(message)
+
+        await self.app(scope, limited_receive, limited_send)
+
+
+async def hash_upload(file: UploadFile, max_bytes: int = RESUME_MAX_UPLOAD_BYTES) -> Tuple[str, int]:
+    """
+    SHA-256 and size of an upload, read in chunks from its spooled temp file
+    (kept in memory only while small). Rewinds the file for the parser.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    while True:
+        chunk = await file.read(UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > max_bytes:
+            raise UploadTooLarge(f"File too large (max {max_bytes // (1024 * 1024)} MB)")
+        digest.update(chunk)
+    await file.seek(0)
+    return digest.hexdigest(), size
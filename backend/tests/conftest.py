@@ -0,0 +1,8 @@
+import os
+import tempfile
+
+# database.db and the LLM cache read these when first imported, so the tests
+# get a throwaway directory before any test module imports them
+_directory = tempfile.mkdtemp(prefix="resume-tailor-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_directory, 'test.db')}"
+os.environ["LLM_CACHE_PATH"] = os.path.join(_directory, "llm_cache.db")
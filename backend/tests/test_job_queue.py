@@ -0,0 +1,178 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import delete
+
+from database.db import AsyncSessionLocal, close_db, init_db
+from database.models import Application, TailorJob, UserResume
+from services.job_queue import TailorJobQueue
+
+
+def run(coroutine):
+    async def wrapper():
+        try:
+            return await coroutine
+        finally:
+            # The engine's connections belong to this event loop
+            await close_db()
+    return asyncio.run(wrapper())
+
+
+@pytest.fixture(autouse=True)
+def empty_database():
+    async def reset():
+        await init_db()
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(TailorJob))
+            await db.execute(delete(Application))
+            await db.execute(delete(UserResume))
+            await db.commit()
+    run(reset())
+
+
+def make_queue(**options) -> TailorJobQueue:
+    settings = dict(workers=1, poll_interval=0.1, lease_seconds=60, max_attempts=3, retry_base=5, retry_cap=300)
+    settings.update(options)
+    return TailorJobQueue(**settings)
+
+
+async def submit(queue: TailorJobQueue) -> int:
+    async with AsyncSessionLocal() as db:
+        resume = UserResume(original_content="Jane Doe\nEngineer", file_type="html")
+        db.add(resume)
+        await db.flush()
+        job = await queue.submit(db, resume.id, "Python engineer")
+        return job.id
+
+
+async def load(job_id: int):
+    async with AsyncSessionLocal() as db:
+        job = await db.get(TailorJob, job_id)
+        application = await db.get(Application, job.application_id)
+        return job, application
+
+
+async def expire_lease(job_id: int, attempts: int) -> None:
+    async with AsyncSessionLocal() as db:
+        job = await db.get(TailorJob, job_id)
+        job.started_at = datetime.utcnow() - timedelta(minutes=5)
+        job.attempts = attempts
+        await db.commit()
+
+
+def test_claim_marks_job_and_application_running():
+    queue = make_queue()
+
+    async def scenario():
+        job_id = await submit(queue)
+        assert await queue._claim() == job_id
+        return await load(job_id)
+
+    job, application = run(scenario())
+    assert job.status == "Running"
+    assert job.attempts == 1
+    assert job.started_at is not None
+    assert application.status == "Running"
+
+
+def test_running_job_is_not_claimed_twice():
+    queue = make_queue()
+
+    async def scenario():
+        job_id = await submit(queue)
+        return await queue._claim(), await queue._claim(), job_id
+
+    first, second, job_id = run(scenario())
+    assert first == job_id
+    assert second is None
+
+
+def test_claims_oldest_job_first():
+    queue = make_queue()
+
+    async def scenario():
+        first = await submit(queue)
+        second = await submit(queue)
+        return [await queue._claim(), await queue._claim()], [first, second]
+
+    claimed, submitted = run(scenario())
+    assert claimed == submitted
+
+
+def test_retry_waits_for_backoff():
+    queue = make_queue(retry_base=60)
+
+    async def scenario():
+        job_id = await submit(queue)
+        await queue._claim()
+        await queue._finish_failed(job_id, "boom")
+        job, _ = await load(job_id)
+        return job, await queue._claim()
+
+    job, claimed = run(scenario())
+    assert job.status == "Pending"
+    assert job.error == "boom"
+    assert job.run_after > datetime.utcnow() + timedelta(seconds=25)
+    assert claimed is None
+
+
+def test_expired_lease_is_reclaimed():
+    queue = make_queue()
+
+    async def scenario():
+        job_id = await submit(queue)
+        await queue._claim()
+        await expire_lease(job_id, attempts=1)
+        return await queue._claim(), job_id, await load(job_id)
+
+    claimed, job_id, (job, application) = run(scenario())
+    assert claimed == job_id
+    assert job.status == "Running"
+    assert job.attempts == 2
+    assert application.status == "Running"
+
+
+def test_live_lease_is_not_reclaimed():
+    queue = make_queue(lease_seconds=600)
+
+    async def scenario():
+        job_id = await submit(queue)
+        await queue._claim()
+        await expire_lease(job_id, attempts=1)
+        return await queue._claim()
+
+    assert run(scenario()) is None
+
+
+def test_expired_lease_on_last_attempt_fails_the_job():
+    queue = make_queue(max_attempts=3)
+
+    async def scenario():
+        job_id = await submit(queue)
+        await queue._claim()
+        await expire_lease(job_id, attempts=3)
+        return await queue._claim(), await load(job_id)
+
+    claimed, (job, application) = run(scenario())
+    assert claimed is None
+    assert job.status == "Failed"
+    assert job.attempts == 3
+    assert job.error
+    assert job.finished_at is not None
+    assert application.status == "Failed"
+
+
+def test_failing_on_last_attempt_is_final():
+    queue = make_queue(max_attempts=1)
+
+    async def scenario():
+        job_id = await submit(queue)
+        await queue._claim()
+        await queue._finish_failed(job_id, "boom")
+        return await queue._claim(), await load(job_id)
+
+    claimed, (job, application) = run(scenario())
+    assert claimed is None
+    assert job.status == "Failed"
+    assert application.status == "Failed"
@@ -0,0 +1,39 @@
+import pytest
+
+from services.pdf_service import generate_preview_html, html_to_pdf
+
+try:
+    from weasyprint import HTML
+except (ImportError, OSError):  # OSError: pango/cairo are not installed
+    HTML = None
+
+pytestmark = pytest.mark.skipif(HTML is None, reason="WeasyPrint cannot be loaded")
+
+RESUME = (
+    "<h1>Jane Doe</h1><h2>Experience</h2>"
+    "<div class='job-entry'><div class='job-header'><span class='job-title'>Python Engineer</span>"
+    "<span class='date'>2020 - 2024</span></div>"
+    "<ul><li>Built Python and AWS services</li><li>Ran Kubernetes clusters</li></ul></div>"
+)
+
+
+def render_embedded(html: str) -> bytes:
+    """The document rendered as is, the house styles parsed from its <head>."""
+    return HTML(string=html).write_pdf()
+
+
+@pytest.mark.parametrize("keywords", [None, ["Python", "Kubernetes"]])
+def test_preparsed_stylesheet_matches_embedded(keywords):
+    html = generate_preview_html(RESUME, keywords)
+    assert html_to_pdf(html) == render_embedded(html)
+
+
+def test_author_styles_do_not_override_house_styles():
+    # A model-generated <style> that the house styles used to override
+    html = generate_preview_html("<style>h2 { font-size: 30pt; border: none; }</style>" + RESUME)
+    assert html_to_pdf(html) == render_embedded(html)
+
+
+def test_inline_important_does_not_override_house_styles():
+    html = generate_preview_html(RESUME.replace("<h1>", "<h1 style='font-size: 40pt !important'>"))
+    assert html_to_pdf(html) == render_embedded(html)
@@ -0,0 +1,87 @@
+import asyncio
+
+from fastapi import FastAPI, File, UploadFile
+from fastapi.testclient import TestClient
+
+from services.uploads import UploadSizeLimit, hash_upload
+
+MAX_BYTES = 64 * 1024
+CHUNK = b"x" * 8192
+
+
+def make_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/upload")
+    async def upload(file: UploadFile = File(...)):
+        content_hash, size = await hash_upload(file, MAX_BYTES)
+        return {"size": size}
+
+    app.add_middleware(UploadSizeLimit, paths=["/upload"], max_bytes=MAX_BYTES)
+    return app
+
+
+def multipart(size: int) -> bytes:
+    return (
+        b"--boundary\r\nContent-Disposition: form-data; name=\"file\"; filename=\"resume.pdf\"\r\n"
+        b"Content-Type: application/pdf\r\n\r\n" + b"x" * size + b"\r\n--boundary--\r\n"
+    )
+
+
+def test_content_length_over_limit_is_rejected():
+    response = TestClient(make_app()).post(
+        "/upload", content=multipart(MAX_BYTES * 2),
+        headers={"Content-Type": "multipart/form-data; boundary=boundary"}
+    )
+    assert response.status_code == 413
+
+
+def test_chunked_upload_over_limit_is_rejected():
+    body = multipart(MAX_BYTES * 2)
+    chunks = (body[i:i + len(CHUNK)] for i in range(0, len(body), len(CHUNK)))
+    response = TestClient(make_app()).post(
+        "/upload", content=chunks, headers={"Content-Type": "multipart/form-data; boundary=boundary"}
+    )
+    assert response.status_code == 413
+
+
+def test_upload_within_limit_passes():
+    response = TestClient(make_app()).post(
+        "/upload", files={"file": ("resume.pdf", b"x" * 1000, "application/pdf")}
+    )
+    assert response.status_code == 200
+    assert response.json() == {"size": 1000}
+
+
+def test_body_is_cut_off_once_over_limit():
+    total_chunks = 100
+    delivered = 0
+    sent = []
+
+    async def receive():
+        nonlocal delivered
+        delivered += 1
+        return {"type": "http.request", "body": CHUNK, "more_body": delivered < total_chunks}
+
+    async def send(message):
+        sent.append(message)
+
+    async def app(scope, receive, send):
+        # Reads the whole body, then answers, like a form parser would
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                await send({"type": "http.response.start", "status": 400, "headers": []})
+                await send({"type": "http.response.body", "body": b""})
+                return
+            if not message.get("more_body"):
+                break
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    middleware = UploadSizeLimit(app, paths=["/upload"], max_bytes=MAX_BYTES)
+    scope = {"type": "http", "path": "/upload", "headers": [(b"transfer-encoding", b"chunked")]}
+    asyncio.run(middleware(scope, receive, send))
+
+    assert [m["status"] for m in sent if m["type"] == "http.response.start"] == [413]
+    assert delivered < total_chunks
@@ -1,13 +1,23 @@
 // File: frontend/src/components/dashboard/StatusBoard.jsx
 
-import { Download, Mail, Trash2, Calendar } from 'lucide-react';
+import { Download, Mail, Trash2, Calendar, Search } from 'lucide-react';
 import { formatDate } from '../../utils/helpers';
 
-export default function StatusBoard({ applications = [], onDelete }) {
-  if (!applications || applications.length === 0) {
+export default function StatusBoard({
+  applications = [],
+  onDelete,
+  onLoadMore,
+  hasMore = false,
+  query = '',
+  onSearch,
+  searching = false
+}) {
+  if (!applications || (applications.length === 0 && !query)) {
     return null;
   }
 
+  const noun = searching ? 'result' : 'application';
+
   return (
     <div className="card p-6 animate-fade-in">
       <div className="flex items-center justify-between mb-6">
@@ -15,10 +25,29 @@ export default function StatusBoard({ applications = [], onDelete }) {
           Application History
         </h2>
         <span className="text-sm text-gray-500 dark:text-gray-400">
-          {applications.length} {applications.length === 1 ? 'application' : 'applications'}
+          {applications.length}{hasMore ? '+' : ''} {applications.length === 1 && !hasMore ? noun : `${noun}s`}
         </span>
       </div>
 
+      {onSearch && (
+        <div className="relative mb-6">
+          <Search className="absolute left-3 top-1/2 -translate-y-1/2 h-4 w-4 text-gray-400" />
+          <input
+            type="search"
+            value={query}
+            onChange={(e) => onSearch(e.target.value)}
+            placeholder="Search by company, role or job description"
+            className="w-full pl-10 pr-4 py-2 text-sm border border-gray-200 dark:border-dark-border rounded-lg bg-white dark:bg-dark-card text-gray-900 dark:text-white focus:outline-none focus:ring-2 focus:ring-primary"
+          />
+        </div>
+      )}
+
+      {searching && applications.length === 0 && (
+        <p className="text-sm text-gray-500 dark:text-gray-400 text-center py-6">
+          No applications match "{query}"
+        </p>
+      )}
+
       {/* Mobile View - Cards */}
       <div className="md:hidden space-y-4">
         {applications.map((app) => (
@@ -131,6 +160,17 @@ export default function StatusBoard({ applications = [], onDelete }) {
           </tbody>
         </table>
       </div>
+
+      {hasMore && onLoadMore && (
+        <div className="mt-6 text-center">
+          <button
+            onClick={onLoadMore}
+            className="px-4 py-2 text-sm font-medium text-gray-700 dark:text-gray-300 border border-gray-200 dark:border-dark-border rounded-lg hover:bg-gray-50 dark:hover:bg-dark-bg transition-colors"
+          >
+            Load more
+          </button>
+        </div>
+      )}
     </div>
   );
 }
\ No newline at end of file
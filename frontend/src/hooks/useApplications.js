@@ -1,20 +1,62 @@
 // useApplications.js
 
 import { useState, useEffect } from 'react';
-import { getApplications, deleteApplication as deleteAppAPI } from '../services/api';
+import { getApplications, searchApplications, deleteApplication as deleteAppAPI } from '../services/api';
+
+// Wait this long after the last keystroke before searching
+const SEARCH_DEBOUNCE_MS = 250;
 
 export const useApplications = () => {
   const [applications, setApplications] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState(null);
+  // Server-side search: results is null while the query is empty
+  const [query, setQuery] = useState('');
+  const [results, setResults] = useState(null);
+  const [nextOffset, setNextOffset] = useState(null);
 
   const fetchApplications = async () => {
     setLoading(true);
     setError(null);
     
     try {
-      const data = await getApplications();
-      setApplications(data);
+      const { items, nextCursor } = await getApplications();
+      setApplications(items);
+      setNextCursor(nextCursor);
+    } catch (err) {
+      setError(err.message);
+    } finally {
+      setLoading(false);
+    }
+  };
+
+  const loadMore = async () => {
+    if (loading) return;
+    if (results !== null) {
+      if (nextOffset === null) return;
+      setLoading(true);
+      setError(null);
+
+      try {
+        const page = await searchApplications(query.trim(), nextOffset);
+        setResults(prev => [...prev, ...page.items]);
+        setNextOffset(page.nextOffset);
+      } catch (err) {
+        setError(err.message);
+      } finally {
+        setLoading(false);
+      }
+      return;
+    }
+    if (!nextCursor) return;
+    setLoading(true);
+    setError(null);
+
+    try {
+      const page = await getApplications(nextCursor);
+      setApplications(prev => [...prev, ...page.items]);
+      setNextCursor(page.nextCursor);
     } catch (err) {
       setError(err.message);
     } finally {
@@ -26,6 +68,7 @@ export const useApplications = () => {
     try {
       await deleteAppAPI(appId);
       setApplications(prev => prev.filter(app => app.id !== appId));
+      setResults(prev => prev && prev.filter(app => app.id !== appId));
     } catch (err) {
       setError(err.message);
       throw err;
@@ -40,12 +83,52 @@ export const useApplications = () => {
     fetchApplications();
   }, []);
 
+  useEffect(() => {
+    const q = query.trim();
+    if (!q) {
+      setResults(null);
+      setNextOffset(null);
+      return;
+    }
+
+    let cancelled = false;
+    const timer = setTimeout(async () => {
+      setLoading(true);
+      setError(null);
+
+      try {
+        const page = await searchApplications(q);
+        if (!cancelled) {
+          setResults(page.items);
+          setNextOffset(page.nextOffset);
+        }
+      } catch (err) {
+        if (!cancelled) setError(err.message);
+      } finally {
+        if (!cancelled) setLoading(false);
+      }
+    }, SEARCH_DEBOUNCE_MS);
+
+    // A newer query supersedes this one
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
+  }, [query]);
+
+  const searching = results !== null;
+
   return { 
-    applications, 
+    applications: searching ? results : applications, 
     loading, 
     error, 
     fetchApplications,
+    loadMore,
+    hasMore: searching ? nextOffset !== null : Boolean(nextCursor),
     deleteApplication,
-    addApplication
+    addApplication,
+    query,
+    search: setQuery,
+    searching
   };
-};
\ No newline at end of file
+};
@@ -19,7 +19,16 @@ export default function DashboardPage() {
   const [keywords, setKeywords] = useState([]);
   
   const { tailor, loading, error } = useTailorResume();
-  const { applications, addApplication, deleteApplication } = useApplications();
+  const {
+    applications,
+    addApplication,
+    deleteApplication,
+    loadMore,
+    hasMore,
+    query,
+    search,
+    searching
+  } = useApplications();
 
   const handleResumeUpload = () => {
     setResumeUploaded(true);
@@ -191,10 +200,15 @@ export default function DashboardPage() {
               </>
             )}
 
-            {applications.length > 0 && (
+            {(applications.length > 0 || query) && (
               <StatusBoard
                 applications={applications}
                 onDelete={deleteApplication}
+                onLoadMore={loadMore}
+                hasMore={hasMore}
+                query={query}
+                onSearch={search}
+                searching={searching}
               />
             )}
           </div>
@@ -29,8 +29,14 @@ export const tailorResume = async (jobDescription, jobUrl = null) => {
   return response.data;
 };
 
+// Most recently rendered PDF, revalidated with the server's ETag
+const pdfCache = new Map();
+
 export const generatePDF = async (htmlContent, keywords = []) => {
   try {
+    const cacheKey = JSON.stringify([htmlContent, keywords]);
+    const cached = pdfCache.get(cacheKey);
+
     const response = await api.post('/api/generate-pdf', 
       { 
         html: htmlContent,
@@ -38,9 +44,20 @@ export const generatePDF = async (htmlContent, keywords = []) => {
       },
       { 
         responseType: 'blob',
-        timeout: 60000 // 1 minute for PDF generation
+        timeout: 60000, // 1 minute for PDF generation
+        headers: cached ? { 'If-None-Match': cached.etag } : {},
+        validateStatus: (status) => (status >= 200 && status < 300) || status === 304,
       }
     );
+
+    if (response.status === 304 && cached) {
+      return cached.blob;
+    }
+    const etag = response.headers.etag;
+    if (etag) {
+      pdfCache.clear();
+      pdfCache.set(cacheKey, { etag, blob: response.data });
+    }
     return response.data;
   } catch (error) {
     console.error('PDF Generation Error:', error);
@@ -57,9 +74,25 @@ export const generateEmailDraft = async (jobTitle, company, recipientEmail = nul
   return response.data;
 };
 
-export const getApplications = async () => {
-  const response = await api.get('/api/applications');
-  return response.data;
+export const getApplications = async (cursor = null) => {
+  const response = await api.get('/api/applications', {
+    params: cursor ? { cursor } : {},
+  });
+  return {
+    items: response.data,
+    nextCursor: response.headers['x-next-cursor'] || null,
+  };
+};
+
+export const searchApplications = async (query, offset = 0) => {
+  const response = await api.get('/api/applications/search', {
+    params: { q: query, offset },
+  });
+  const nextOffset = response.headers['x-next-offset'];
+  return {
+    items: response.data,
+    nextOffset: nextOffset ? Number(nextOffset) : null,
+  };
 };
 
 export const deleteApplication = async (appId) => {